@@ -0,0 +1,102 @@
+'''
+Benchmark of sequential CLI invocations with and without the local daemon.
+
+Run from PythonSDK_offers folder, the bundled mock API is started as a separate process by default:
+    python -m benchmarks.cli_daemon --calls 1000
+    python -m benchmarks.cli_daemon --base-url http://127.0.0.1:8000    # mock API started by you
+    python -m benchmarks.cli_daemon --real-api    # BASE_URL and REFRESH_TOKEN from .env or environment
+
+Each call runs "offers offers <product_id>" in a fresh interpreter, exactly as shell scripts do.
+'''
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from offers_sdk.mock_server import DEFAULT_REFRESH_TOKEN
+from benchmarks.process_batch import PROJECT_DIR, free_port, wait_for_port
+
+CLI = [sys.executable, "-m", "offers_cli_tool.offers_cli"]
+
+
+def run_cli(args: list, env: dict) -> str:
+    return subprocess.run(CLI + args, cwd=PROJECT_DIR, env=env, capture_output=True, text=True, check=True).stdout
+
+
+def time_calls(args: list, calls: int, env: dict) -> list:
+    durations = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        run_cli(args, env)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def report(label: str, durations: list):
+    durations = sorted(durations)
+    total = sum(durations)
+    print(f"{label:>16}: {len(durations)} calls in {total:.1f} s | "
+          f"mean {statistics.mean(durations) * 1000:.1f} ms | "
+          f"p50 {durations[len(durations) // 2] * 1000:.1f} ms | "
+          f"p99 {durations[int(len(durations) * 0.99) - 1] * 1000:.1f} ms")
+
+
+def run(args, env: dict):
+    socket_path = Path(tempfile.mkdtemp()) / "offers-bench.sock"
+    env["OFFERS_DAEMON_SOCKET"] = str(socket_path)
+
+    product_id = args.product_id
+    if product_id is None:
+        output = run_cli(["register", "--no-daemon", "--client", args.client], env)
+        product_id = re.search(r"ID: ([0-9a-f-]{36})", output).group(1)
+    command = ["offers", product_id, "--client", args.client]
+
+    report("without daemon", time_calls(command + ["--no-daemon"], args.calls, env))
+
+    daemon = subprocess.Popen(CLI + ["daemon"], cwd=PROJECT_DIR, env=env, stdout=subprocess.DEVNULL)
+    try:
+        while not socket_path.exists():
+            time.sleep(0.05)
+        run_cli(command, env)  # warm up - daemon imports backend, opens connection, gets token
+        report("with daemon", time_calls(command, args.calls, env))
+    finally:
+        run_cli(["daemon", "--stop"], env)
+        daemon.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--client", default="httpx", choices=["httpx", "aiohttp", "requests"])
+    parser.add_argument("--base-url", default=None, help="running mock API, default = start one")
+    parser.add_argument("--refresh-token", default=DEFAULT_REFRESH_TOKEN, help="refresh token of --base-url")
+    parser.add_argument("--real-api", action="store_true", help="use BASE_URL and REFRESH_TOKEN of .env / environment")
+    parser.add_argument("--product-id", default=None, help="existing product, registered automatically if missing")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    server = None
+    try:
+        if not args.real_api:
+            if args.base_url is None:
+                port = free_port()
+                server = subprocess.Popen([sys.executable, "-m", "offers_sdk.mock_server", "--port", str(port)],
+                                          cwd=PROJECT_DIR, stdout=subprocess.DEVNULL)
+                wait_for_port(port)
+                args.base_url = f"http://127.0.0.1:{port}"
+            env["BASE_URL"] = args.base_url
+            env["REFRESH_TOKEN"] = args.refresh_token  # matches the mock API, never sent to the real one
+            env["OFFERS_TOKEN_CACHE"] = str(Path(tempfile.mkdtemp()) / "token.json")  # keep real token cache intact
+        run(args, env)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
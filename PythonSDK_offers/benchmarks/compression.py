@@ -0,0 +1,96 @@
+'''
+Response compression - bytes on the wire vs. CPU cost of decompression, per codec.
+
+For every codec the mock API (separate process) compresses offers responses, the client asks for just that
+codec. Reported: response size, ratio, client time per get_offers (localhost, so network savings are not
+visible - multiply the saved bytes by your link speed) and pure decompression throughput in this process.
+br and zstd are measured only if their packages are installed (pip install python_offers_sdk[compression]).
+Run from PythonSDK_offers folder:
+    python -m benchmarks.compression --offers 20000 --client httpx
+'''
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from offers_sdk import compression
+from offers_sdk.client import OffersClient
+from offers_sdk.http_clients.registry import create_http_client
+from offers_sdk.metrics import MetricsRegistry
+from offers_sdk.mock_server import DEFAULT_REFRESH_TOKEN, MockOffersAPI
+from benchmarks.process_batch import PROJECT_DIR, free_port, wait_for_port
+
+
+def decompress_rate(payload: bytes, codec: str, rounds: int) -> float:
+    '''MB of decompressed data per second of CPU, streamed in 64 KiB chunks like the HTTP libraries do.'''
+    compressed = compression.compress(payload, codec)
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.process_time()
+        decompress = compression.decompressor(codec)
+        for i in range(0, len(compressed), 65536):
+            decompress(compressed[i:i + 65536])
+        best = min(best, time.process_time() - start)
+    return len(payload) / 2**20 / max(best, 1e-9)
+
+
+async def fetch(url: str, codec: str, args) -> dict:
+    metrics = MetricsRegistry()
+    client = OffersClient(base_url=url, refresh_token=DEFAULT_REFRESH_TOKEN, metrics=metrics,
+                          http_client=create_http_client(args.client, compression=[] if codec == "identity" else [codec]))
+    client._auth.set_token_cache_path(Path(tempfile.mkdtemp()) / "token.json")
+    try:
+        product = await client.register_product(name="Large", description="Many offers")
+        await client.get_offers(str(product.id))  # warm up connection and token
+        times = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            await client.get_offers(str(product.id))
+            times.append(time.perf_counter() - start)
+        return {"time": min(times), "bytes": metrics.endpoint("offers").bytes_in / (args.rounds + 1)}
+    finally:
+        await client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--offers", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--client", default="httpx", choices=["httpx", "aiohttp", "requests"])
+    args = parser.parse_args()
+
+    usable = set(compression.decodable(args.client))
+    codecs = ["identity"] + [codec for codec in reversed(compression.PREFERENCE)
+                             if codec in usable and compression.codec_available(codec)]
+    skipped = [codec for codec in compression.PREFERENCE if codec not in codecs]
+
+    api = MockOffersAPI(offers_per_product=args.offers)
+    payload = json.dumps(api.add_product("sample")).encode()  # same shape as served offers
+
+    port = free_port()
+    server = subprocess.Popen([sys.executable, "-m", "offers_sdk.mock_server", "--port", str(port),
+                               "--offers-per-product", str(args.offers), "--compress", ",".join(codecs[1:])],
+                              cwd=PROJECT_DIR, stdout=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        results = {codec: asyncio.run(fetch(f"http://127.0.0.1:{port}", codec, args)) for codec in codecs}
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    print(f"{args.offers} offers per product ({len(payload) / 2**20:.2f} MiB JSON), {args.client}, best of {args.rounds}")
+    for codec, result in results.items():
+        size = len(payload) if codec == "identity" else len(compression.compress(payload, codec))
+        rate = f"{decompress_rate(payload, codec, args.rounds):8.0f} MB/s" if codec != "identity" else "       - MB/s"
+        print(f"  {codec:<8} wire {size / 1024:9.1f} KiB | ratio {len(payload) / size:5.1f}x | "
+              f"get_offers {result['time'] * 1000:7.1f} ms | decompress {rate} | "
+              f"client bytes_in {result['bytes'] / 1024:9.1f} KiB")
+    if skipped:
+        print(f"  not measured (package missing or backend cannot decode): {', '.join(skipped)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+'''
+Refreshing unchanged offers - full GET vs. conditional GET (ETag / If-None-Match, 304 Not Modified).
+
+Products are registered once, then all of them are refreshed several rounds by get_offers, once by a plain
+client and once with ConditionalCache. The mock API runs as a separate process.
+Parsing time is summed over all requests of a round, so with concurrency it can exceed the round time.
+Run from PythonSDK_offers folder:
+    python -m benchmarks.conditional --products 200 --offers 2000
+'''
+import argparse
+import asyncio
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from offers_sdk.cache import ConditionalCache
+from offers_sdk.client import OffersClient
+from offers_sdk.metrics import MetricsRegistry
+from offers_sdk.mock_server import DEFAULT_REFRESH_TOKEN
+from benchmarks.process_batch import PROJECT_DIR, free_port, wait_for_port
+
+
+async def refresh(url: str, product_ids: list, conditional: bool, args) -> dict:
+    metrics = MetricsRegistry()
+    client = OffersClient(base_url=url, refresh_token=DEFAULT_REFRESH_TOKEN, http_client=args.client, metrics=metrics,
+                          conditional_cache=ConditionalCache() if conditional else None)
+    client._auth.set_token_cache_path(Path(tempfile.mkdtemp()) / "token.json")
+    try:
+        async for _ in client.get_offers_stream(product_ids, args.concurrency):
+            pass  # first round fills validators, not measured
+        offers = metrics.endpoint("offers")
+        bytes_before, parse_before = offers.bytes_in, offers.latency["parse"].sum
+        rounds = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            async for _, result in client.get_offers_stream(product_ids, args.concurrency):
+                if isinstance(result, Exception):
+                    raise result
+            rounds.append(time.perf_counter() - start)
+        return {"round": min(rounds),
+                "bytes": (offers.bytes_in - bytes_before) / args.rounds,
+                "parse": (offers.latency["parse"].sum - parse_before) / args.rounds}
+    finally:
+        await client.aclose()
+
+
+async def run(url: str, args) -> dict:
+    client = OffersClient(base_url=url, refresh_token=DEFAULT_REFRESH_TOKEN, http_client=args.client)
+    client._auth.set_token_cache_path(Path(tempfile.mkdtemp()) / "token.json")
+    try:
+        product_ids = [str((await client.register_product(name=f"P{i}", description="Benchmark")).id)
+                       for i in range(args.products)]
+    finally:
+        await client.aclose()
+    return {"full GET": await refresh(url, product_ids, False, args),
+            "conditional": await refresh(url, product_ids, True, args)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--offers", type=int, default=2000, help="offers per product")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--client", default="httpx", choices=["httpx", "aiohttp", "requests"])
+    args = parser.parse_args()
+
+    port = free_port()
+    server = subprocess.Popen([sys.executable, "-m", "offers_sdk.mock_server", "--port", str(port),
+                               "--offers-per-product", str(args.offers)], cwd=PROJECT_DIR, stdout=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        results = asyncio.run(run(f"http://127.0.0.1:{port}", args))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    print(f"{args.products} unchanged products x {args.offers} offers, {args.client}, "
+          f"concurrency {args.concurrency}, best of {args.rounds} refresh rounds")
+    for name, result in results.items():
+        print(f"  {name:<12} round {result['round'] * 1000:8.1f} ms | "
+              f"received {result['bytes'] / 2**20:8.2f} MiB | parsing {result['parse'] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+'''
+Batch registration and bulk offers throughput under asyncio and uvloop event loops (local mock API).
+
+Run from PythonSDK_offers folder (uvloop row is skipped if uvloop is not installed):
+    python -m benchmarks.event_loop --products 5000 --concurrency 50
+'''
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from offers_sdk import runtime
+from offers_sdk.client import OffersClient
+from offers_sdk.mock_server import MockOffersServer
+from offers_sdk.models import Product, uuid4
+
+
+async def workload(server: MockOffersServer, backend: str, products: int, concurrency: int) -> dict:
+    client = OffersClient(base_url=server.url, refresh_token=server.refresh_token, http_client=backend)
+    client._auth.set_token_cache_path(Path(tempfile.mkdtemp()) / "token.json")
+    batch = [Product(id=uuid4(), name=f"Loop benchmark {i}", description="Synthetic") for i in range(products)]
+    try:
+        await client._auth.get_access_token()
+        start = time.perf_counter()
+        # register_products_batch starts all calls at once, keep it bounded the same way for both loops
+        for offset in range(0, products, concurrency):
+            await client.register_products_batch(batch[offset:offset + concurrency])
+        register_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        async for _ in client.get_offers_stream((str(p.id) for p in batch), concurrency=concurrency):
+            pass
+        offers_time = time.perf_counter() - start
+    finally:
+        await client.aclose()
+    return {"register_per_s": products / register_time, "offers_per_s": products / offers_time}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--client", default="aiohttp", choices=["httpx", "aiohttp", "requests"])
+    args = parser.parse_args()
+
+    loops = {"asyncio": False}
+    if runtime.loop_factory(True) is not runtime.loop_factory(False):
+        loops["uvloop"] = True
+    else:
+        print("uvloop is not installed, measuring only asyncio loop")
+
+    # Mock server has its own thread and (asyncio) loop, only the client loop differs between rows
+    with MockOffersServer(seed=0).run_in_thread() as server:
+        for name, use_uvloop in loops.items():
+            result = runtime.run(workload(server, args.client, args.products, args.concurrency), use_uvloop=use_uvloop)
+            print(f"{name:>8}: register {result['register_per_s']:8.0f} calls/s | offers {result['offers_per_s']:8.0f} calls/s")
+
+
+if __name__ == "__main__":
+    main()
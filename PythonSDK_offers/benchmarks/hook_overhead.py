@@ -0,0 +1,123 @@
+'''
+Per-request overhead of hook dispatch.
+
+Requests go through HTTPXClient with an in-memory transport (no network), so the numbers show
+only what the SDK adds per call. Run from PythonSDK_offers folder:
+    python -m benchmarks.hook_overhead --requests 5000
+'''
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+import httpx
+from hooks.hooks import HookManager, log_request, log_response
+from hooks.structured_logging import StructuredLogHooks
+from offers_sdk.http_clients.httpx_client import HTTPXClient
+
+SLOW_HOOK_SECONDS = 0.001
+ROUNDS = 3
+
+
+async def noop_hook(*args):
+    pass
+
+
+async def slow_hook(*args):
+    await asyncio.sleep(SLOW_HOOK_SECONDS)  # e.g. hook writing to remote log collector
+
+
+def make_scenarios() -> dict:
+    '''Scenario name -> function creating HookManager.'''
+    def disabled():
+        hooks = HookManager(hooks_usage=False)
+        hooks.add_request_hook(noop_hook)
+        return hooks
+
+    def inline(hook, count=3, concurrent=False):
+        def factory():
+            hooks = HookManager(hooks_usage=True, concurrent=concurrent)
+            for _ in range(count):
+                hooks.add_request_hook(hook)
+                hooks.add_response_hook(hook)
+            return hooks
+        return factory
+
+    def background(hook, count=3):
+        def factory():
+            hooks = HookManager(hooks_usage=True, queue_size=100_000)
+            for _ in range(count):
+                hooks.add_request_hook(hook, background=True)
+                hooks.add_response_hook(hook, background=True)
+            return hooks
+        return factory
+
+    def structured(sample_rate=1):
+        def factory():
+            hooks = HookManager(hooks_usage=True)
+            StructuredLogHooks(stream=io.StringIO(), sample_rate=sample_rate, log_requests=True).install(hooks)
+            return hooks
+        return factory
+
+    def printing():
+        hooks = HookManager(hooks_usage=True)
+        hooks.add_request_hook(log_request)
+        hooks.add_response_hook(log_response)
+        return hooks
+
+    return {
+        "no hooks": lambda: HookManager(),
+        "hooks disabled": disabled,
+        "3 no-op inline": inline(noop_hook),
+        "3 slow inline": inline(slow_hook),
+        "3 slow concurrent": inline(slow_hook, concurrent=True),
+        "3 slow background": background(slow_hook),
+        "print logging": printing,
+        "structured logging": structured(),
+        "structured 1/100": structured(100),
+    }
+
+
+async def measure(hooks: HookManager, requests: int) -> float:
+    '''Mean seconds per request (best of ROUNDS).'''
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=[]))
+    client = HTTPXClient(hooks=hooks, client_config={"transport": transport})
+    await client.get("http://stub/warmup", headers={})
+
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get("http://stub/api/v1/products/x/offers", headers={"Bearer": "token"})
+        best = min(best, time.perf_counter() - start)
+
+    await hooks.aclose()
+    await client.aclose()
+    return best / requests
+
+
+async def run(requests: int) -> dict:
+    results = {}
+    for name, factory in make_scenarios().items():
+        count = requests if "slow" not in name or "background" in name else max(requests // 20, 50)
+        if name == "print logging":
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[name] = await measure(factory(), count)
+        else:
+            results[name] = await measure(factory(), count)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.requests))
+    baseline = results["no hooks"]
+    for name, seconds in results.items():
+        print(f"{name:>20}: {seconds * 1e6:9.1f} us/request  (+{(seconds - baseline) * 1e6:8.1f} us)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+'''
+Import-time benchmark of the SDK using "python -X importtime".
+
+Run from PythonSDK_offers folder:
+    python benchmarks/import_time.py --repeat 5 --max-ms 400
+
+Fails (exit code 1) if any heavy module (HTTP backends, dotenv) is imported by "import offers_sdk"
+or if the median import time exceeds --max-ms.
+'''
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent
+# Modules which must not be loaded just by importing the SDK
+FORBIDDEN_MODULES = ("httpx", "aiohttp", "requests", "dotenv", "tenacity")
+
+
+def measure_import(statement: str) -> tuple[float, dict]:
+    '''Run statement in fresh interpreter, return (total ms, {module: cumulative us}).'''
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        # Format: "import time:  self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # nested imports are indented, count only top level ones
+            total_us += int(cumulative)
+        modules[name.strip()] = int(cumulative)
+    return total_us / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--statement", default="import offers_sdk")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if median import time is higher")
+    parser.add_argument("--top", type=int, default=10, help="print N slowest modules")
+    args = parser.parse_args()
+
+    runs = [measure_import(args.statement) for _ in range(args.repeat)]
+    totals = [total for total, _ in runs]
+    modules = runs[-1][1]
+
+    median = statistics.median(totals)
+    print(f"'{args.statement}': median {median:.1f} ms, min {min(totals):.1f} ms ({args.repeat} runs)")
+    print("Slowest modules (cumulative):")
+    for name, us in sorted(modules.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    loaded = [name for name in FORBIDDEN_MODULES if name in modules]
+    if loaded:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(loaded)}")
+        failed = True
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"FAIL: median import time {median:.1f} ms exceeds {args.max_ms} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+'''
+Throughput cost of journaled batch registration and time of resuming a finished run.
+
+Products are registered by register_products_stream against local mock API, with and without BatchJournal,
+alternating rounds (best round counts). Run from PythonSDK_offers folder:
+    python -m benchmarks.journal --products 20000
+'''
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from offers_sdk.client import OffersClient
+from offers_sdk.journal import BatchJournal
+from offers_sdk.mock_server import MockOffersServer
+from offers_sdk.models import Product, uuid4
+
+ROUNDS = 3
+
+
+async def register(client: OffersClient, products, concurrency: int, journal=None) -> float:
+    start = time.perf_counter()
+    async for _ in client.register_products_stream(products, concurrency=concurrency, journal=journal):
+        pass
+    if journal is not None:
+        await journal.close()  # last fsync belongs to the run
+    return time.perf_counter() - start
+
+
+async def run(server: MockOffersServer, args) -> dict:
+    directory = Path(tempfile.mkdtemp())
+    client = OffersClient(base_url=server.url, refresh_token=server.refresh_token, http_client=args.client)
+    client._auth.set_token_cache_path(directory / "token.json")
+    plain, journaled = [], []
+    try:
+        for round_ in range(ROUNDS):
+            products = [Product(id=uuid4(), name=f"Bench {i}", description="Journal") for i in range(args.products)]
+            plain.append(await register(client, products, args.concurrency))
+
+            products = [Product(id=uuid4(), name=f"Bench {i}", description="Journal") for i in range(args.products)]
+            path = directory / f"round-{round_}.journal"
+            journaled.append(await register(client, products, args.concurrency, BatchJournal(path).open()))
+
+        # Restart of a finished run - everything is skipped from journal
+        start = time.perf_counter()
+        journal = BatchJournal(path).open()
+        load = time.perf_counter() - start
+        resume = await register(client, products, args.concurrency, journal)
+    finally:
+        await client.aclose()
+    return {"plain": min(plain), "journaled": min(journaled), "load": load, "resume": resume}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--client", default="aiohttp", choices=["httpx", "aiohttp", "requests"])
+    args = parser.parse_args()
+
+    with MockOffersServer().run_in_thread() as server:
+        result = asyncio.run(run(server, args))
+
+    overhead = result["journaled"] / result["plain"] - 1
+    print(f"{args.products} products, {args.client}, concurrency {args.concurrency} (best of {ROUNDS})")
+    print(f"  without journal: {args.products / result['plain']:9.0f} products/s")
+    print(f"  with journal:    {args.products / result['journaled']:9.0f} products/s | overhead {overhead:+.1%}")
+    print(f"  resume finished run: journal load {result['load'] * 1000:.1f} ms, "
+          f"skipping all {result['resume'] * 1000:.1f} ms (no requests)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+'''
+Scaling of ProcessPoolBatchRunner with the number of worker processes (registration against local mock API).
+
+Run from PythonSDK_offers folder:
+    python -m benchmarks.process_batch --products 50000 --server-workers 4
+
+The mock API runs as separate processes (--server-workers, sharing one port) so the server is not
+the bottleneck. Scaling is near-linear only while there are free cores for both client workers and server.
+'''
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from offers_sdk.mock_server import DEFAULT_REFRESH_TOKEN
+from offers_sdk.models import Product, uuid4
+from offers_sdk.process_batch import ProcessPoolBatchRunner
+
+PROJECT_DIR = Path(__file__).parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("Mock API did not start")
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, max(1, cores // 2), cores}))
+    parser.add_argument("--server-workers", type=int, default=max(1, cores // 2))
+    parser.add_argument("--concurrency", type=int, default=20, help="requests in flight per worker")
+    parser.add_argument("--client", default="aiohttp", choices=["httpx", "aiohttp", "requests"])
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    port = free_port()
+    server = subprocess.Popen([sys.executable, "-m", "offers_sdk.mock_server", "--port", str(port),
+                               "--workers", str(args.server_workers), "--latency-ms", str(args.latency_ms)],
+                              cwd=PROJECT_DIR, stdout=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        print(f"{cores} cores, mock API with {args.server_workers} process(es), {args.products} products per run")
+        baseline = None
+        for workers in args.workers:
+            runner = ProcessPoolBatchRunner(f"http://127.0.0.1:{port}", DEFAULT_REFRESH_TOKEN, workers=workers,
+                                            http_client=args.client, concurrency=args.concurrency,
+                                            token_cache_path=Path(tempfile.mkdtemp()) / "token.json")
+            # Products are generated lazily - the runner never holds the whole input
+            products = (Product(id=uuid4(), name=f"Bench {i}", description="Process batch") for i in range(args.products))
+            for _ in runner.register_products(products):
+                pass
+            stats = runner.stats()
+            baseline = baseline or stats["items_per_s"]
+            speedup = stats["items_per_s"] / baseline
+            print(f"{workers:>3} workers: {stats['items_per_s']:9.0f} items/s | speedup {speedup:4.2f}x "
+                  f"| efficiency {speedup / workers:4.0%} | failed {stats['failed']}")
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+'''
+Benchmark suite comparing backends, batch modes and parsers against the local mock API (no network).
+
+Run from PythonSDK_offers folder:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --quick --save-baseline benchmarks/baseline.json   # once, before your changes
+    python -m benchmarks.run --quick --baseline benchmarks/baseline.json        # exit code 1 on regression
+
+Measured for every backend (httpx, aiohttp, requests, retry = RetryingHTTPClient over httpx):
+    latency.<backend>.*        sequential get_offers calls (mean/p50/p99 ms)
+    batch.<backend>.c<N>.*     get_offers_stream throughput with concurrency N (calls per second)
+    token.<backend>.*          access token from refresh, file cache and memory (ms)
+    hooks.<scenario>.*         per-request overhead of hook dispatch (us, benchmarks.hook_overhead)
+    parse.<parser>.*           decoding of offers response body (us per response)
+
+Metric names ending with "_per_s" are better when higher, all others when lower.
+Results are machine dependent - compare only runs from the same machine. That is why no baseline is committed,
+benchmarks/baseline.json is git-ignored and has to be saved locally from the code you compare against.
+'''
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+from uuid import uuid4
+from benchmarks import hook_overhead
+from offers_sdk.client import OffersClient
+from offers_sdk.http_clients.registry import create_http_client
+from offers_sdk.http_clients.retry_client import RetryingHTTPClient
+from offers_sdk.mock_server import MockOffersServer, fixed
+from offers_sdk.models import Offer
+
+BACKENDS = ("httpx", "aiohttp", "requests", "retry")
+CONCURRENCIES = (1, 10, 50)
+NOISE_FLOOR = 0.01  # absolute differences below this are never reported as regressions
+
+
+def make_client(backend: str, server: MockOffersServer, token_dir: Path) -> OffersClient:
+    http = RetryingHTTPClient(create_http_client("httpx")) if backend == "retry" else create_http_client(backend)
+    client = OffersClient(base_url=server.url, refresh_token=server.refresh_token, http_client=http)
+    client._auth.set_token_cache_path(token_dir / f"token-{backend}.json")
+    return client
+
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def bench_latency(client: OffersClient, product_id: str, calls: int) -> Dict[str, float]:
+    durations = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await client.get_offers(product_id)
+        durations.append(time.perf_counter() - start)
+    return {"mean_ms": statistics.mean(durations) * 1000,
+            "p50_ms": percentile(durations, 0.5) * 1000,
+            "p99_ms": percentile(durations, 0.99) * 1000}
+
+
+async def bench_batch(client: OffersClient, product_ids: List[str], concurrency: int) -> Dict[str, float]:
+    start = time.perf_counter()
+    failed = 0
+    async for _, result in client.get_offers_stream(product_ids, concurrency=concurrency):
+        failed += isinstance(result, Exception)
+    elapsed = time.perf_counter() - start
+    return {"calls_per_s": len(product_ids) / elapsed, "failed": failed}
+
+
+async def bench_token(client: OffersClient, repeat: int) -> Dict[str, float]:
+    auth = client._auth
+
+    async def timed(prepare) -> float:
+        durations = []
+        for _ in range(repeat):
+            prepare()
+            start = time.perf_counter()
+            await auth.get_access_token()
+            durations.append(time.perf_counter() - start)
+        return statistics.median(durations) * 1000
+
+    def forget_memory():
+        auth._access_token = None
+
+    def forget_all():
+        forget_memory()
+        auth._token_cache_path.unlink(missing_ok=True)
+
+    return {"refresh_ms": await timed(forget_all),
+            "file_cache_ms": await timed(forget_memory),
+            "memory_ms": await timed(lambda: None)}
+
+
+def bench_parse(offers_count: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    '''Decoding of one offers response (JSON text -> List[Offer]) with different parsers.'''
+    from pydantic import TypeAdapter
+    body = json.dumps([{"id": str(uuid4()), "price": i, "items_in_stock": i} for i in range(offers_count)])
+    adapter = TypeAdapter(List[Offer])
+    parsers = {
+        "json": lambda: json.loads(body),
+        "json+models": lambda: [Offer(**item) for item in json.loads(body)],
+        "pydantic_validate_json": lambda: adapter.validate_json(body),
+    }
+    try:
+        import orjson
+        parsers["orjson"] = lambda: orjson.loads(body)
+        parsers["orjson+models"] = lambda: [Offer(**item) for item in orjson.loads(body)]
+    except ImportError:
+        pass
+
+    results = {}
+    for name, parse in parsers.items():
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                parse()
+            best = min(best, time.perf_counter() - start)
+        results[name] = {"us": best / repeat * 1e6}
+    return results
+
+
+async def bench_backends(server: MockOffersServer, args) -> Dict[str, Dict[str, float]]:
+    results = {}
+    product_ids = [str(uuid4()) for _ in range(args.products)]
+    for product_id in product_ids:
+        server.api.add_product(product_id)
+    token_dir = Path(tempfile.mkdtemp())
+
+    for backend in BACKENDS:
+        client = make_client(backend, server, token_dir)
+        try:
+            await client.get_offers(product_ids[0])  # warm up: token, connection
+            results[f"latency.{backend}"] = await bench_latency(client, product_ids[0], args.calls)
+            for concurrency in CONCURRENCIES:
+                results[f"batch.{backend}.c{concurrency}"] = await bench_batch(client, product_ids, concurrency)
+            results[f"token.{backend}"] = await bench_token(client, args.token_repeat)
+        finally:
+            await client.aclose()
+        print(f"  {backend} done", file=sys.stderr)
+    return results
+
+
+def flatten(results: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+    return {f"{group}.{name}": value for group, values in results.items() for name, value in values.items()}
+
+
+def compare(current: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    '''Names of metrics worse than baseline by more than tolerance (fraction).'''
+    regressions = []
+    for name, base in baseline.items():
+        value = current.get(name)
+        if value is None or not base or name.endswith(".failed"):
+            continue
+        if abs(value - base) < NOISE_FLOOR:
+            continue  # e.g. in-memory token 0.000 -> 0.001 ms
+        change = (base - value) / base if name.endswith("_per_s") else (value - base) / base
+        if change > tolerance:
+            regressions.append(f"{name}: {base:.3f} -> {value:.3f} ({change:+.0%} worse)")
+    return regressions
+
+
+async def run(args) -> Dict[str, float]:
+    results = {}
+    # Server has its own thread and event loop, so client and server do not share CPU time of one loop
+    with MockOffersServer(seed=0, latency=fixed(args.latency_ms / 1000)).run_in_thread() as server:
+        results.update(await bench_backends(server, args))
+
+    hooks = await hook_overhead.run(args.hook_requests)
+    for name, seconds in hooks.items():
+        results[f"hooks.{name.replace(' ', '_')}"] = {"us": seconds * 1e6}
+    results.update({f"parse.{name}": values for name, values in bench_parse(args.offers, args.parse_repeat).items()})
+    return flatten(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="fewer iterations (CI smoke run)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency of the mock server")
+    parser.add_argument("--output", type=Path, default=None, help="write JSON results")
+    parser.add_argument("--baseline", type=Path, default=None, help="compare with stored results")
+    parser.add_argument("--save-baseline", type=Path, default=None)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    args = parser.parse_args()
+    scale = 10 if args.quick else 1
+    args.calls = 500 // scale
+    args.products = 2000 // scale
+    args.token_repeat = 50 // scale
+    args.hook_requests = 2000 // scale
+    args.offers = 50
+    args.parse_repeat = 2000 // scale
+
+    metrics = asyncio.run(run(args))
+    document = {"meta": {"python": platform.python_version(), "platform": platform.platform(),
+                         "quick": args.quick, "latency_ms": args.latency_ms, "time": time.time()},
+                "metrics": metrics}
+    for name, value in metrics.items():
+        print(f"{name:>45}: {value:12.3f}")
+    for path in (args.output, args.save_baseline):
+        if path is not None:
+            path.write_text(json.dumps(document, indent=2))
+
+    if args.baseline is not None:
+        if not args.baseline.exists():
+            sys.exit(f"\nNo baseline at {args.baseline}, save one first on this machine with --save-baseline")
+        stored = json.loads(args.baseline.read_text())
+        if stored["meta"].get("quick") != args.quick:
+            print("\nWarning: baseline was recorded with different --quick setting")
+        if stored["meta"].get("platform") != document["meta"]["platform"]:
+            print(f"\nWarning: baseline was recorded on {stored['meta'].get('platform')}, results are not comparable")
+        regressions = compare(metrics, stored["metrics"], args.tolerance)
+        if regressions:
+            print(f"\nRegressions against {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
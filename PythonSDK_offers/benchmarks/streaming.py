@@ -0,0 +1,88 @@
+'''
+Peak memory and time to first offer - get_offers (whole body) vs iter_offers (streamed parsing).
+
+The mock API runs as a separate process, so the measured memory (tracemalloc) is only the client's.
+Times are measured in separate rounds without tracemalloc, it slows down allocation heavy code a lot.
+Run from PythonSDK_offers folder:
+    python -m benchmarks.streaming --offers 100000
+'''
+import argparse
+import asyncio
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from offers_sdk.client import OffersClient
+from offers_sdk.mock_server import DEFAULT_REFRESH_TOKEN
+from benchmarks.process_batch import PROJECT_DIR, free_port, wait_for_port
+
+
+async def measure(client: OffersClient, product_id: str, streamed: bool, memory: bool) -> dict:
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    count = 0
+    if streamed:
+        async for _ in client.iter_offers(product_id):
+            count += 1
+            if first is None:
+                first = time.perf_counter() - start
+    else:
+        for _ in await client.get_offers(product_id):
+            count += 1
+            if first is None:
+                first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    if not memory:
+        return {"offers": count, "first": first, "total": total}
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"offers": count, "peak": peak}
+
+
+async def run(url: str, args) -> dict:
+    client = OffersClient(base_url=url, refresh_token=DEFAULT_REFRESH_TOKEN, http_client=args.client)
+    client._auth.set_token_cache_path(Path(tempfile.mkdtemp()) / "token.json")
+    results = {"get_offers": {"time": [], "memory": []}, "iter_offers": {"time": [], "memory": []}}
+    try:
+        product = await client.register_product(name="Large", description="Many offers")
+        await client.get_offers(str(product.id))  # warm up connection and token
+        for _ in range(args.rounds):
+            for memory in (False, True):
+                kind = "memory" if memory else "time"
+                results["get_offers"][kind].append(await measure(client, str(product.id), False, memory))
+                results["iter_offers"][kind].append(await measure(client, str(product.id), True, memory))
+    finally:
+        await client.aclose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--offers", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--client", default="httpx", choices=["httpx", "aiohttp"])
+    args = parser.parse_args()
+
+    port = free_port()
+    server = subprocess.Popen([sys.executable, "-m", "offers_sdk.mock_server", "--port", str(port),
+                               "--offers-per-product", str(args.offers)], cwd=PROJECT_DIR, stdout=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        results = asyncio.run(run(f"http://127.0.0.1:{port}", args))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    print(f"{args.offers} offers per product, {args.client}, best of {args.rounds}")
+    for name, rounds in results.items():
+        print(f"  {name:<11} peak {min(r['peak'] for r in rounds['memory']) / 2**20:8.1f} MiB | "
+              f"first offer {min(r['first'] for r in rounds['time']) * 1000:8.1f} ms | "
+              f"all {min(r['total'] for r in rounds['time']) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
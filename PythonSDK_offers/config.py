@@ -1,9 +1,27 @@
-from dotenv import load_dotenv
 import os
 from pathlib import Path
 
-load_dotenv()
-BASE_URL = os.environ["BASE_URL"]
-REFRESH_TOKEN = os.environ["REFRESH_TOKEN"]
-TOKEN_CACHE_PATH = Path(".auth_token_cache.json")
-TOKEN_VALIDITY_SECONDS = 5 * 60  # token valid 5 min
\ No newline at end of file
+TOKEN_CACHE_PATH = Path(os.environ.get("OFFERS_TOKEN_CACHE") or ".auth_token_cache.json")  # relative to project folder
+TOKEN_VALIDITY_SECONDS = 5 * 60  # fallback when token carries no expiry - valid 5 min
+TOKEN_EXPIRY_MARGIN_SECONDS = 10  # refresh this many seconds before the token really expires
+
+# Values read from environment (.env file), loaded on first access - not at import time
+_ENV_SETTINGS = ("BASE_URL", "REFRESH_TOKEN")
+_dotenv_loaded = False
+
+
+def load_settings() -> dict:
+    '''Load .env file (only once) and return settings from environment.'''
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _dotenv_loaded = True
+    return {name: os.environ[name] for name in _ENV_SETTINGS}
+
+
+def __getattr__(name: str):
+    # Keeps "from config import BASE_URL, REFRESH_TOKEN" working
+    if name in _ENV_SETTINGS:
+        return load_settings()[name]
+    raise AttributeError(f"module 'config' has no attribute '{name}'")
\ No newline at end of file
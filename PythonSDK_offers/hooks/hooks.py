@@ -1,4 +1,5 @@
-from typing import Callable, Awaitable, Any, Literal
+import asyncio
+from typing import Callable, Awaitable, Any, Literal, Optional
 
 RequestHook = Callable[[str, str, dict, dict], Awaitable[None]]  # method, url, headers, payload
 ResponseHook = Callable[[str, str, Any], Awaitable[None]]        # method, url, response
@@ -6,50 +7,132 @@ ErrorHook = Callable[[str, str, Exception], Awaitable[None]]     # method, url,
 
 
 class HookManager:
-    def __init__(self, hooks_usage: bool = False):
+    '''
+    Keeps request/response/error hooks and runs them around every HTTP call.
+
+    Inline hooks are awaited on the request path (sequentially, or concurrently with concurrent=True).
+    Background hooks are put to a bounded queue and run by a worker task, so they never delay the request;
+    when the queue is full the call is dropped and counted in `dropped`.
+    Backends check `*_active` flags first, so with no hooks (or usage off) no coroutine is even created.
+    Flags are read from the hook lists on every call, hooks appended to the lists directly count as well.
+    '''
+    def __init__(self, hooks_usage: bool = False, concurrent: bool = False, queue_size: int = 1000):
         self.on_request: list[RequestHook] = []
         self.on_response: list[ResponseHook] = []
         self.on_error: list[ErrorHook] = []
+        self.background_request: list[RequestHook] = []
+        self.background_response: list[ResponseHook] = []
+        self.background_error: list[ErrorHook] = []
+        self.concurrent = concurrent
+        self.dropped: int = 0  # background hook calls dropped due to full queue
+        self.failed: int = 0   # background hook calls which raised an exception
+        self._queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self.usage: bool = hooks_usage
 
-    def add_request_hook(self, hook: RequestHook, update_option: Literal["add", "replace"] = "add"):
-        if update_option.startswith("r"):
-            self.on_request = hook
-            return
-        self.on_request.append(hook)
+    @property
+    def request_active(self) -> bool:
+        return bool(self.usage and (self.on_request or self.background_request))
 
-    def add_response_hook(self, hook: ResponseHook, update_option: Literal["add", "replace"] = "add"):
-        if update_option.startswith("r"):
-            self.on_response = hook
-            return
-        self.on_response.append(hook)
+    @property
+    def response_active(self) -> bool:
+        return bool(self.usage and (self.on_response or self.background_response))
+
+    @property
+    def error_active(self) -> bool:
+        return bool(self.usage and (self.on_error or self.background_error))
 
-    def add_error_hook(self, hook: ErrorHook, update_option: Literal["add", "replace"] = "add"):
+    def _add(self, inline: str, background_name: str, hook, update_option: str, background: bool):
+        name = background_name if background else inline
         if update_option.startswith("r"):
-            self.on_error = hook
-            return
-        self.on_error.append(hook)
+            setattr(self, name, [hook])
+        else:
+            getattr(self, name).append(hook)
+
+    def add_request_hook(self, hook: RequestHook, update_option: Literal["add", "replace"] = "add", background: bool = False):
+        self._add("on_request", "background_request", hook, update_option, background)
+
+    def add_response_hook(self, hook: ResponseHook, update_option: Literal["add", "replace"] = "add", background: bool = False):
+        self._add("on_response", "background_response", hook, update_option, background)
+
+    def add_error_hook(self, hook: ErrorHook, update_option: Literal["add", "replace"] = "add", background: bool = False):
+        self._add("on_error", "background_error", hook, update_option, background)
+
+    def _enqueue(self, hooks: list, args: tuple):
+        '''Hand hook calls over to background worker, never blocks.'''
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queue and worker belong to one event loop, create new ones for a new loop
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self._queue_size)
+            self._worker = loop.create_task(self._drain_queue())
+        for hook in hooks:
+            try:
+                self._queue.put_nowait((hook, args))
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+    async def _drain_queue(self):
+        while True:
+            hook, args = await self._queue.get()
+            try:
+                await hook(*args)
+            except Exception:
+                self.failed += 1
+            finally:
+                self._queue.task_done()
+
+    async def _run_inline(self, hooks: list, args: tuple):
+        if self.concurrent and len(hooks) > 1:
+            await asyncio.gather(*(hook(*args) for hook in hooks))
+        else:
+            for hook in hooks:
+                await hook(*args)
 
     async def run_request_hooks(self, method: str, url: str, headers: dict, json: dict):
-        if not self.usage:
+        if not self.request_active:
             return
-        for hook in self.on_request:
-            await hook(method, url, headers, json)
+        if self.background_request:
+            self._enqueue(self.background_request, (method, url, headers, json))
+        await self._run_inline(self.on_request, (method, url, headers, json))
 
     async def run_response_hooks(self, method: str, url: str, response: Any):
-        if not self.usage:
+        if not self.response_active:
             return
-        for hook in self.on_response:
-            await hook(method, url, response)
+        if self.background_response:
+            self._enqueue(self.background_response, (method, url, response))
+        await self._run_inline(self.on_response, (method, url, response))
 
     async def run_error_hooks(self, method: str, url: str, error: Exception):
-        if not self.usage:
+        if not self.error_active:
             return
-        for hook in self.on_error:
-            await hook(method, url, error)
+        if self.background_error:
+            self._enqueue(self.background_error, (method, url, error))
+        await self._run_inline(self.on_error, (method, url, error))
+
+    async def drain(self):
+        '''Wait until all queued background hooks are processed.'''
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    async def aclose(self):
+        '''Process remaining background hooks and stop the worker.'''
+        await self.drain()
+        if self._worker is not None and self._loop is asyncio.get_running_loop():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = self._queue = self._loop = None
+
+# Simple print based hooks (debugging), for production use hooks.structured_logging.StructuredLogHooks
 
 async def log_request(method, url, headers, payload):
-    print(f"1. [REQ] {method} \n2. {url} \n3. headers={headers} \n4. payload={payload}\n")
+    from hooks.structured_logging import redact_headers
+    print(f"1. [REQ] {method} \n2. {url} \n3. headers={redact_headers(headers)} \n4. payload={payload}\n")
 
 async def log_response(method, url, response):
     status = response.status if hasattr(response, "status") else response.status_code
@@ -0,0 +1,170 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional, TextIO
+from hooks.hooks import HookManager
+
+# Header values which are never written to logs (compared lowercase)
+SECRET_HEADERS = {"bearer", "authorization", "proxy-authorization", "cookie", "set-cookie", "x-api-key"}
+
+
+def redact_headers(headers: dict) -> dict:
+    return {key: "***" if key.lower() in SECRET_HEADERS else value for key, value in headers.items()}
+
+
+class JSONLinesBatchHandler(logging.Handler):
+    '''Formats records as JSON lines and writes them to stream in batches (one write per batch).'''
+    def __init__(self, stream: Optional[TextIO] = None, batch_size: int = 100):
+        super().__init__()
+        self.stream = stream or sys.stderr
+        self.batch_size = batch_size
+        self._buffer: list[str] = []
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({"ts": record.created,
+                           "level": record.levelname,
+                           "logger": record.name,
+                           "event": record.msg,
+                           **getattr(record, "fields", {})}, default=str)
+
+    def emit(self, record: logging.LogRecord):
+        self._buffer.append(self.format(record))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if self._buffer:
+                self.stream.write("\n".join(self._buffer) + "\n")
+                self.stream.flush()
+                self._buffer.clear()
+
+
+class _DroppingQueueHandler(QueueHandler):
+    '''Never blocks the event loop - record is dropped (and counted) if the queue is full.'''
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.queued = self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record  # records are built by hooks, no message formatting needed on the event loop
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        self.queued += 1
+
+
+class _FlushingQueueListener(QueueListener):
+    '''Flushes batching handlers when no record arrived for flush_interval seconds.'''
+    def __init__(self, log_queue: queue.Queue, *handlers, flush_interval: float = 1.0):
+        super().__init__(log_queue, *handlers)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block: bool):
+        while True:
+            try:
+                return self.queue.get(block, self.flush_interval)
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.flush()
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)  # waits for free slot, put_nowait of the base class fails on full queue
+
+
+class StructuredLogHooks:
+    '''
+    Structured logging hooks replacing print based log_request/log_response/log_error.
+
+    Hooks only build a record and put it to a queue (QueueHandler), records are written as JSON lines
+    by a QueueListener thread in batches. Secret headers are redacted. Successful responses
+    (and requests if log_requests=True) are sampled 1 in `sample_rate`, errors are always logged.
+    '''
+    def __init__(self, stream: Optional[TextIO] = None, handler: Optional[logging.Handler] = None,
+                 sample_rate: int = 1, log_requests: bool = False, batch_size: int = 100,
+                 flush_interval: float = 1.0, queue_size: int = 10_000, logger_name: str = "offers_sdk.http"):
+        self.sample_rate = max(1, sample_rate)
+        self.log_requests = log_requests
+        self._logger = logging.Logger(logger_name)  # private logger, records are not propagated to root
+        self._queue_handler = _DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        self._handler = handler or JSONLinesBatchHandler(stream, batch_size=batch_size)
+        self._listener = _FlushingQueueListener(self._queue_handler.queue, self._handler, flush_interval=flush_interval)
+        self._listener.start()
+        self._running = True
+        atexit.register(self.stop)
+        # Own overhead statistics
+        self._seen = {"request": 0, "response": 0}
+        self.sampled_out = 0
+        self.hook_time_ns = 0
+        self.hook_calls = 0
+
+    def install(self, hooks: HookManager, update_option: str = "add"):
+        if self.log_requests:
+            hooks.add_request_hook(self.on_request, update_option=update_option)
+        hooks.add_response_hook(self.on_response, update_option=update_option)
+        hooks.add_error_hook(self.on_error, update_option=update_option)
+
+    def _sampled(self, kind: str) -> bool:
+        self._seen[kind] += 1
+        if self._seen[kind] % self.sample_rate == 1 % self.sample_rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+    def _emit(self, level: int, event: str, fields: dict):
+        record = self._logger.makeRecord(self._logger.name, level, "(hooks)", 0, event, None, None,
+                                         extra={"fields": fields})
+        self._queue_handler.handle(record)
+
+    async def on_request(self, method: str, url: str, headers: dict, payload: dict):
+        start = time.perf_counter_ns()
+        if self._sampled("request"):
+            self._emit(logging.DEBUG, "request", {"method": method, "url": url, "headers": redact_headers(headers)})
+        self.hook_time_ns += time.perf_counter_ns() - start
+        self.hook_calls += 1
+
+    async def on_response(self, method: str, url: str, response: Any):
+        start = time.perf_counter_ns()
+        status = response.status if hasattr(response, "status") else response.status_code
+        if status >= 400:
+            self._emit(logging.WARNING, "response", {"method": method, "url": url, "status": status})
+        elif self._sampled("response"):
+            self._emit(logging.INFO, "response", {"method": method, "url": url, "status": status})
+        self.hook_time_ns += time.perf_counter_ns() - start
+        self.hook_calls += 1
+
+    async def on_error(self, method: str, url: str, error: Exception):
+        start = time.perf_counter_ns()
+        self._emit(logging.ERROR, "error", {"method": method, "url": url,
+                                            "error_type": type(error).__name__, "error": str(error)})
+        self.hook_time_ns += time.perf_counter_ns() - start
+        self.hook_calls += 1
+
+    @property
+    def emitted(self) -> int:
+        '''Records queued for writing, dropped ones (full queue) are not counted.'''
+        return self._queue_handler.queued
+
+    def stats(self) -> dict:
+        return {"emitted": self.emitted,
+                "sampled_out": self.sampled_out,
+                "dropped": self._queue_handler.dropped,
+                "hook_calls": self.hook_calls,
+                "mean_hook_ns": self.hook_time_ns / self.hook_calls if self.hook_calls else 0.0}
+
+    def stop(self):
+        '''Write remaining records and stop listener thread.'''
+        if not self._running:
+            return
+        self._running = False
+        self._listener.stop()
+        self._handler.flush()
+        atexit.unregister(self.stop)
@@ -0,0 +1,106 @@
+'''
+Bulk CLI commands - records are streamed from CSV/JSONL input through one OffersClient.
+
+Results are written to output as JSON lines in order of completion, summary goes to stderr.
+'''
+import asyncio
+import csv
+import json
+import sys
+import time
+from collections import Counter
+from typing import AsyncIterator, Iterator, TextIO
+
+_END = object()
+
+
+def detect_format(stream: TextIO, fmt: str) -> str:
+    '''Resolve "auto" format by file extension, stdin defaults to JSONL.'''
+    if fmt != "auto":
+        return fmt
+    name = getattr(stream, "name", "")
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith(".txt"):
+        return "lines"
+    return "jsonl"
+
+
+def read_records(stream: TextIO, fmt: str) -> Iterator:
+    '''Lazily read records - dicts for CSV, raw lines for JSONL and plain lines (parsed later per record).'''
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
+
+
+async def aiter_records(stream: TextIO, fmt: str) -> AsyncIterator:
+    '''Read input in worker thread so slow stdin does not block the event loop.'''
+    records = read_records(stream, fmt)
+    # One record per thread hop - waiting for a chunk would hold back records of slow input (tail -f | ...)
+    while (record := await asyncio.to_thread(next, records, _END)) is not _END:
+        yield record
+
+
+def parse_record(record, fmt: str) -> dict:
+    if fmt == "jsonl":
+        return json.loads(record)
+    if fmt == "lines":
+        return {"id": record}
+    return record
+
+
+def error_to_dict(error: Exception) -> dict:
+    return {"type": type(error).__name__,
+            "status_code": getattr(error, "status_code", None),
+            "message": str(error)}
+
+
+async def run_bulk(client, operation: str, source: TextIO, fmt: str = "auto", concurrency: int = 20,
+                   out: TextIO = sys.stdout, err: TextIO = sys.stderr) -> Counter:
+    '''
+    Run "register" or "offers" for every input record, write JSON line per result as soon as it completes.
+
+    Returns counter of outcomes ("ok" and error type names).
+    '''
+    from offers_sdk.batching import map_unordered
+    from offers_sdk.models import UUID
+    fmt = detect_format(source, fmt)
+
+    async def register(record) -> dict:
+        data = parse_record(record, fmt)
+        product_id = UUID(data["id"]) if data.get("id") else None
+        product = await client.register_product(name=data["name"], description=data.get("description", ""), id=product_id)
+        return {"product": product.model_dump(mode="json")}
+
+    async def offers(record) -> dict:
+        data = parse_record(record, fmt)
+        product_id = data.get("product_id") or data["id"]
+        offers = await client.get_offers(product_id=product_id)
+        return {"product_id": product_id, "offers": [offer.model_dump(mode="json") for offer in offers]}
+
+    handler = {"register": register, "offers": offers}[operation]
+    outcomes = Counter()
+    start = time.perf_counter()
+    async for index, result in map_unordered(handler, aiter_records(source, fmt), concurrency):
+        if isinstance(result, Exception):
+            outcomes[type(result).__name__] += 1
+            line = {"index": index, "ok": False, "error": error_to_dict(result)}
+        else:
+            outcomes["ok"] += 1
+            line = {"index": index, "ok": True, **result}
+        out.write(json.dumps(line) + "\n")
+        out.flush()
+
+    elapsed = time.perf_counter() - start
+    total = sum(outcomes.values())
+    errors = total - outcomes["ok"]
+    err.write(f"{operation}: {total} records in {elapsed:.2f} s ({total / elapsed if elapsed else 0:.1f} records/s), "
+              f"{outcomes['ok']} ok, {errors} errors\n")
+    for name, count in outcomes.most_common():
+        if name != "ok":
+            err.write(f"  {name}: {count}\n")
+    return outcomes
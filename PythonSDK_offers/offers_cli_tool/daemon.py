@@ -0,0 +1,138 @@
+'''
+Optional local daemon for the CLI.
+
+Daemon keeps warm OffersClient instances (open connection pool, access token in memory) behind
+a Unix domain socket. CLI commands send one JSON line request and receive one JSON line response,
+so repeated CLI calls do not pay for SDK imports, TLS handshakes and token file reads.
+
+This module must stay cheap to import - it is used by every CLI invocation.
+'''
+import asyncio
+import json
+import os
+import socket
+import stat
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+_uid = os.getuid() if hasattr(os, "getuid") else "user"
+DEFAULT_SOCKET_PATH = Path(os.environ.get("OFFERS_DAEMON_SOCKET") or Path(tempfile.gettempdir()) / f"offers-sdk-{_uid}.sock")
+DAEMON_SUPPORTED = hasattr(socket, "AF_UNIX")
+
+
+def _owned_socket(path: str) -> bool:
+    '''Default path is predictable in shared temp dir - talk only to our own socket nobody else can open.'''
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(info.st_mode) and info.st_uid == os.getuid() and not info.st_mode & 0o077
+
+
+def daemon_request(payload: dict, socket_path: Optional[Path] = None, timeout: float = 60.0) -> Optional[dict]:
+    '''Send request to running daemon. Returns None if daemon is not running (or not usable).'''
+    if not DAEMON_SUPPORTED:
+        return None
+    path = str(socket_path or DEFAULT_SOCKET_PATH)
+    if not _owned_socket(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path)
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+        return json.loads(data) if data else None
+    except (OSError, ValueError):
+        return None  # hung, dead or broken daemon - CLI runs the command itself
+    finally:
+        sock.close()
+
+
+class OffersDaemon:
+    '''Serves CLI requests using one warm OffersClient per HTTP backend.'''
+
+    def __init__(self, base_url: str, refresh_token: str, socket_path: Optional[Path] = None):
+        self._base_url = base_url
+        self._refresh_token = refresh_token
+        self._socket_path = Path(socket_path or DEFAULT_SOCKET_PATH)
+        self._clients = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stopped = asyncio.Event()
+
+    def _get_client(self, backend: str):
+        '''Clients are created lazily, first request for a backend pays for import and connection.'''
+        if backend not in self._clients:
+            from offers_sdk.client import OffersClient
+            self._clients[backend] = OffersClient(base_url=self._base_url,
+                                                  refresh_token=self._refresh_token,
+                                                  http_client=backend)
+        return self._clients[backend]
+
+    async def _dispatch(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True}
+        if op == "shutdown":
+            self._stopped.set()
+            return {"ok": True}
+
+        client = self._get_client(request.get("client", "httpx"))
+        if op == "register":
+            from offers_sdk.models import UUID
+            product_id = UUID(request["id"]) if request.get("id") else None
+            product = await client.register_product(name=request["name"],
+                                                    description=request["description"],
+                                                    id=product_id)
+            return {"ok": True,
+                    "result": product.model_dump(mode="json"),
+                    "lines": [f"Registered product:\n {product}"]}
+        if op == "offers":
+            offers = await client.get_offers(product_id=request["product_id"])
+            return {"ok": True,
+                    "result": [offer.model_dump(mode="json") for offer in offers],
+                    "lines": [f"Received offer: {offer}" for offer in offers]}
+        return {"ok": False, "error": {"type": "ValueError", "message": f"Unknown operation '{op}'"}}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self._dispatch(json.loads(line))
+                except Exception as e:
+                    response = {"ok": False, "error": {"type": type(e).__name__,
+                                                       "status_code": getattr(e, "status_code", None),
+                                                       "detail": getattr(e, "detail", None),
+                                                       "message": str(e)}}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+                if self._stopped.is_set():
+                    break
+        finally:
+            writer.close()
+
+    async def serve(self):
+        '''Serve until shutdown request (or cancellation), then close all clients.'''
+        if daemon_request({"op": "ping"}, self._socket_path, timeout=1.0) is not None:
+            raise RuntimeError(f"Daemon already running on {self._socket_path}")
+        self._socket_path.unlink(missing_ok=True)  # stale socket after killed daemon
+
+        umask = os.umask(0o077)  # socket usable only by owner, see _owned_socket
+        try:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=str(self._socket_path))
+        finally:
+            os.umask(umask)
+        try:
+            await self._stopped.wait()
+        finally:
+            self._server.close()
+            await self._server.wait_closed()
+            for client in self._clients.values():
+                await client.aclose()
+            self._socket_path.unlink(missing_ok=True)
@@ -1,18 +1,41 @@
-import asyncio
 import click
 import os
-from dotenv import load_dotenv
-from offers_sdk.client import OffersClient, Product, UUID
-from offers_sdk.http_clients.requests_client import RequestsClient
+from offers_cli_tool.daemon import daemon_request, DAEMON_SUPPORTED, DEFAULT_SOCKET_PATH
+
+# SDK, HTTP backends and .env are loaded only when a command really runs - keeps CLI start fast
+
+
+def load_env():
+    '''Load .env file and return (base_url, refresh_token).'''
+    from dotenv import load_dotenv
+    load_dotenv()
+    return os.environ.get("BASE_URL"), os.environ.get("REFRESH_TOKEN")
+
+
+def run_in_daemon(payload: dict) -> bool:
+    '''Run command in daemon if it is running, returns False if command has to run locally.'''
+    response = daemon_request(payload)
+    if response is None:
+        return False
+    if not response["ok"]:
+        raise click.ClickException(response["error"]["message"])
+    for line in response["lines"]:
+        click.echo(line)
+    return True
+
+def run_async(coro):
+    '''asyncio.run() on uvloop when installed (see offers_sdk.runtime).'''
+    from offers_sdk import runtime
+    return runtime.run(coro)
 
-load_dotenv()
-refresh_token = os.environ.get("REFRESH_TOKEN")
-base_url = os.environ.get("BASE_URL")
 
 @click.group()
-def cli():
+@click.option('--uvloop/--no-uvloop', 'use_uvloop', default=None,
+              help="Use uvloop event loop if installed (default), same as OFFERS_SDK_UVLOOP=1/0.")
+def cli(use_uvloop):
     """CLI tool for Offers SDK"""
-    pass
+    if use_uvloop is not None:
+        os.environ["OFFERS_SDK_UVLOOP"] = "1" if use_uvloop else "0"  # SDK is not imported yet, read on first run
 
 @cli.command()
 @click.option('--name', required=False, help="Product name", default="Virtual product")
@@ -20,8 +43,16 @@ def cli():
 @click.option('--id', required=False, help="Product ID (UUID). Optional.")
 @click.option('--client', type=click.Choice(['httpx', 'aiohttp', 'requests']), default='httpx')
 @click.option('--hooks_usage', required=False, default=False)
-def register(name, description, id, client, hooks_usage):
+@click.option('--no-daemon', is_flag=True, help="Do not use running daemon, run command in this process.")
+def register(name, description, id, client, hooks_usage, no_daemon):
     """Register a new product (optionally with custom ID)"""
+    if not (no_daemon or hooks_usage) and run_in_daemon(
+            {"op": "register", "name": name, "description": description, "id": id, "client": client}):
+        return
+
+    from offers_sdk.client import OffersClient, UUID
+    base_url, refresh_token = load_env()
+
     async def run():
         http_client = resolve_http_client(client)
         sdk = OffersClient(base_url=base_url, 
@@ -30,42 +61,158 @@ def register(name, description, id, client, hooks_usage):
                            hooks_usage=hooks_usage)
 
         product_id = UUID(id) if id else None
-        product = await sdk.register_product(name=name, description=description, id=product_id)
+        try:
+            product = await sdk.register_product(name=name, description=description, id=product_id)
+        finally:
+            await sdk.aclose()
 
         click.echo(f"Registered product:\n {product}")
 
-    asyncio.run(run())
+    run_async(run())
 
 
 def resolve_http_client(name: str):
-    if name == "httpx":
-        from offers_sdk.http_clients.httpx_client import HTTPXClient
-        return HTTPXClient()
-    elif name == "aiohttp":
-        from offers_sdk.http_clients.aiohttp_client import AioHTTPClient
-        return AioHTTPClient()
-    else:
-        from offers_sdk.http_clients.requests_client import RequestsClient
-        return RequestsClient()
+    from offers_sdk.http_clients.registry import create_http_client
+    return create_http_client(name)
 
 
 @cli.command()
 @click.argument('product_id')
 @click.option('--client', type=click.Choice(['httpx', 'aiohttp', 'requests']), default='httpx')
 @click.option('--hooks_usage', required=False, default=False)
-def offers(product_id, client, hooks_usage):
+@click.option('--no-daemon', is_flag=True, help="Do not use running daemon, run command in this process.")
+def offers(product_id, client, hooks_usage, no_daemon):
     """Get offers for a product"""
+    if not (no_daemon or hooks_usage) and run_in_daemon(
+            {"op": "offers", "product_id": product_id, "client": client}):
+        return
+
+    from offers_sdk.client import OffersClient
+    base_url, refresh_token = load_env()
+
     async def run():
         http_client = resolve_http_client(client)
         sdk = OffersClient(base_url=base_url, 
                            refresh_token=refresh_token, 
                            http_client=http_client,
                            hooks_usage=hooks_usage)
-        offers = await sdk.get_offers(product_id=product_id)
+        try:
+            offers = await sdk.get_offers(product_id=product_id)
+        finally:
+            await sdk.aclose()
         for offer in offers:
             click.echo(f"Received offer: {offer}")
 
-    asyncio.run(run())
+    run_async(run())
+
+
+def bulk_command(operation: str, source, fmt: str, concurrency: int, client: str):
+    from offers_sdk.client import OffersClient
+    from offers_cli_tool.bulk import run_bulk
+    base_url, refresh_token = load_env()
+
+    async def run():
+        sdk = OffersClient(base_url=base_url, refresh_token=refresh_token, http_client=resolve_http_client(client))
+        try:
+            await run_bulk(sdk, operation, source, fmt=fmt, concurrency=concurrency)
+        finally:
+            await sdk.aclose()
+
+    run_async(run())
+
+
+bulk_options = [
+    click.argument('source', type=click.File('r'), default='-'),
+    click.option('--format', 'fmt', type=click.Choice(['auto', 'csv', 'jsonl', 'lines']), default='auto',
+                 help="Input format, 'auto' detects by file extension (stdin is JSONL)."),
+    click.option('--concurrency', type=click.IntRange(min=1), default=20, help="Maximum requests in flight."),
+    click.option('--client', type=click.Choice(['httpx', 'aiohttp', 'requests']), default='httpx'),
+]
+
+
+def with_bulk_options(command):
+    for option in reversed(bulk_options):
+        command = option(command)
+    return command
+
+
+@cli.command('register-bulk')
+@with_bulk_options
+def register_bulk(source, fmt, concurrency, client):
+    """Register products from CSV/JSONL file or stdin (fields: name, description, optional id)"""
+    bulk_command("register", source, fmt, concurrency, client)
+
+
+@cli.command('offers-bulk')
+@with_bulk_options
+def offers_bulk(source, fmt, concurrency, client):
+    """Get offers for product IDs from CSV/JSONL/lines file or stdin (field: product_id or id)"""
+    bulk_command("offers", source, fmt, concurrency, client)
+
+
+@cli.command()
+@click.option('--calls', type=click.IntRange(min=1), default=500, help="Products registered and then queried for offers.")
+@click.option('--concurrency', type=click.IntRange(min=1), default=10, help="Maximum requests in flight.")
+@click.option('--sample-every', type=click.IntRange(min=1), default=1, help="Profile 1 in N calls.")
+@click.option('--mode', type=click.Choice(['cprofile', 'tracemalloc']), default='cprofile')
+@click.option('--client', type=click.Choice(['httpx', 'aiohttp', 'requests']), default='httpx')
+@click.option('--latency-ms', type=float, default=1.0, help="Latency of the local stub API.")
+@click.option('--top', type=int, default=15, help="Number of hotspots printed.")
+@click.option('--report', type=click.Path(dir_okay=False), default=None, help="Also write report to file.")
+def profile(calls, concurrency, sample_every, mode, client, latency_ms, top, report):
+    """Profile SDK with synthetic workload against local stub API and print hotspots"""
+    import tempfile
+    from pathlib import Path
+    from offers_sdk.client import OffersClient
+    from offers_sdk.mock_server import MockOffersServer, fixed
+    from offers_sdk.models import Product, uuid4
+    from offers_sdk.profiling import CallProfiler
+
+    profiler = CallProfiler(sample_every=sample_every, mode=mode, report_path=report, top=top)
+
+    async def run(server: MockOffersServer):
+        sdk = OffersClient(base_url=server.url, refresh_token=server.refresh_token,
+                           http_client=resolve_http_client(client), profiler=profiler)
+        sdk._auth.set_token_cache_path(Path(tempfile.mkdtemp()) / "token.json")  # keep real token cache intact
+        products = [Product(id=uuid4(), name=f"Profiled product {i}", description="Synthetic") for i in range(calls)]
+        try:
+            async for _ in sdk.register_products_stream(products, concurrency=concurrency):
+                pass
+            async for _ in sdk.get_offers_stream((str(p.id) for p in products), concurrency=concurrency):
+                pass
+        finally:
+            await sdk.aclose()
+
+    # Stub runs in its own thread, so cProfile (per thread) does not capture the server side
+    with MockOffersServer(latency=fixed(latency_ms / 1000)).run_in_thread() as server:
+        run_async(run(server))
+    click.echo(profiler.report())
+
+
+@cli.command()
+@click.option('--socket', 'socket_path', type=click.Path(), default=str(DEFAULT_SOCKET_PATH), help="Unix socket path.")
+@click.option('--stop', is_flag=True, help="Stop running daemon.")
+def daemon(socket_path, stop):
+    """Run local daemon keeping warm SDK client, used automatically by other commands"""
+    if not DAEMON_SUPPORTED:
+        raise click.ClickException("Daemon requires Unix domain sockets, not supported on this platform.")
+    if stop:
+        if daemon_request({"op": "shutdown"}, socket_path) is None:
+            raise click.ClickException(f"No daemon running on {socket_path}")
+        click.echo("Daemon stopped.")
+        return
+
+    if daemon_request({"op": "ping"}, socket_path, timeout=1.0) is not None:
+        raise click.ClickException(f"Daemon already running on {socket_path}")
+
+    from offers_cli_tool.daemon import OffersDaemon
+    base_url, refresh_token = load_env()
+    server = OffersDaemon(base_url=base_url, refresh_token=refresh_token, socket_path=socket_path)
+    click.echo(f"Offers daemon listening on {socket_path} (stop by Ctrl+C or 'offers daemon --stop')")
+    try:
+        run_async(server.serve())
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == '__main__':
@@ -1,102 +1,220 @@
-from .http_clients.httpx_client import HTTPXClient
 from .http_clients.base import AsyncHTTPClient
+from .http_clients.registry import create_http_client
 from .exceptions import *  # import of all exceptions
+from . import tracing
 # import httpx
 import json
+import base64
+import time
 from typing import Optional
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 import asyncio
-
-from config import TOKEN_CACHE_PATH, TOKEN_VALIDITY_SECONDS
+import os
+from contextlib import asynccontextmanager
+try:
+    import fcntl
+except ImportError:  # Windows - no cross-process locking
+    fcntl = None
+
+from config import TOKEN_CACHE_PATH, TOKEN_VALIDITY_SECONDS, TOKEN_EXPIRY_MARGIN_SECONDS
 TOKEN_CACHE_FILE = Path(__file__).parent.parent / TOKEN_CACHE_PATH
 
+
+def _decode_token_expiry(token: str) -> Optional[float]:
+    '''Read expiry (unix timestamp) from JWT payload without verifying signature.'''
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        # Standard claim is "exp", Offers API uses "expires"
+        expiry = claims.get("exp", claims.get("expires"))
+        return float(expiry) if expiry is not None else None
+    except Exception:
+        return None  # not a JWT, expiry unknown
+
+
+def _response_expiry(body: dict) -> Optional[float]:
+    '''Expiry (unix timestamp) given by auth response itself, if any.'''
+    try:
+        if "expires_at" in body:
+            return float(body["expires_at"])
+        if "expires_in" in body:
+            return time.time() + float(body["expires_in"])
+    except (TypeError, ValueError):
+        pass  # e.g. ISO-8601 date, JWT claim or default validity is used instead
+    return None
+
+
+def _acquire_file_lock(path: Path) -> Optional[int]:
+    '''Blocking exclusive lock of path (created if missing), returns descriptor for _release_file_lock.'''
+    if fcntl is None:
+        return None
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    return fd
+
+
+def _release_file_lock(fd: Optional[int]):
+    if fd is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def _release_acquired(future: asyncio.Future):
+    if not future.cancelled() and future.exception() is None:
+        _release_file_lock(future.result())
+
+
 class AuthManager:
     '''
     AuthManager is created with purpose of checking given refresh token which will be used to create an active access token.
 
-    Access token is active for a five minutes.
-    Automatically solves the problem with already generated token which is still active via token caching.
+    Token expiry is taken from the auth response or from the token itself (JWT claim),
+    if none of them is known the token is considered valid for five minutes.
+    Token is kept in memory (checked against monotonic clock) and cached in file for other processes.
     '''
-    def __init__(self, auth_url: str, refresh_token: str, http_client: Optional[AsyncHTTPClient] = None, token_cache_path: Optional[Path] = None):
+    def __init__(self, auth_url: str, refresh_token: str, http_client: Optional[AsyncHTTPClient] = None, token_cache_path: Optional[Path] = None,
+                 expiry_margin: float = TOKEN_EXPIRY_MARGIN_SECONDS, metrics=None, shared: bool = False):
         self._refresh_token = refresh_token
         self._auth_url = auth_url
         self._access_token: Optional[str] = None
-        self._client = http_client or HTTPXClient()
+        self._expires_monotonic: float = 0.0  # in-memory deadline, immune to wall clock changes
+        self._expiry_margin = expiry_margin
+        self._client = http_client or create_http_client("httpx")
         self._token_cache_path = token_cache_path or TOKEN_CACHE_FILE
+        self._refresh_lock = asyncio.Lock()  # concurrent callers wait for one refresh
+        self.metrics = metrics  # optional offers_sdk.metrics.MetricsRegistry, refreshes recorded as "auth"
+        # Token cache used by several processes - file lock makes sure only one of them refreshes
+        self.shared = shared
 
     def set_token_cache_path(self, path: Path):
         self._token_cache_path = path
 
+    def _set_token(self, token: str, expires_at: float):
+        '''Keep token in memory, expires_at is unix timestamp converted to monotonic deadline.'''
+        self._access_token = token
+        self._expires_monotonic = time.monotonic() + (expires_at - time.time())
+
+    def _is_token_fresh(self) -> bool:
+        return self._access_token is not None and time.monotonic() < self._expires_monotonic - self._expiry_margin
+
     async def get_access_token(self) -> str:
-        '''Try loading token from cache or access a new one'''
-        token_data = self._load_token_cache()
-        if token_data:
-            self._access_token = token_data["access_token"]
+        '''Return token from memory, try loading token from cache or access a new one'''
+        if self._is_token_fresh():
             return self._access_token
 
-        # Otherwise fetch new one
-        await self.refresh_access_token()
-        return self._access_token
+        async with self._refresh_lock:
+            if self._is_token_fresh():
+                return self._access_token  # refreshed by other caller meanwhile
+
+            async with self._cross_process_lock():
+                token_data = self._load_token_cache()
+                if token_data:
+                    self._set_token(token_data["access_token"], token_data["expires"])
+                    return self._access_token
+
+                # Otherwise fetch new one
+                await self.refresh_access_token()
+                return self._access_token
+
+    @asynccontextmanager
+    async def _cross_process_lock(self):
+        if not self.shared:
+            yield
+            return
+        lock_path = self._token_cache_path.with_name(self._token_cache_path.name + ".lock")
+        # Waiting must not block the loop. The thread cannot be cancelled, if we are cancelled meanwhile
+        # the lock it takes later is released right away, otherwise other processes would wait forever
+        acquiring = asyncio.ensure_future(asyncio.to_thread(_acquire_file_lock, lock_path))
+        try:
+            fd = await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            acquiring.add_done_callback(_release_acquired)
+            raise
+        try:
+            yield
+        finally:
+            _release_file_lock(fd)
 
 
     async def refresh_access_token(self):
-        '''Refresh a new valid token for a next five minutes.'''
-        headers = {
-            "accept": "application/json",
-            "Bearer": self._refresh_token
-        }
-
-        response = await self._client.post(self._auth_url, headers=headers, json={})
-        status = response.status if hasattr(response, "status") else response.status_code
-        if hasattr(response, "json_data"):
-            body = response.json_data
-        else:
-            maybe_coro = response.json()
-            if asyncio.iscoroutine(maybe_coro):
-                body = await maybe_coro
+        '''Refresh a new valid token, expiry given by server or five minutes.'''
+        with tracing.span("offers_sdk.refresh_token") as span:
+            headers = {
+                "accept": "application/json",
+                "Bearer": self._refresh_token
+            }
+
+            start = time.perf_counter()
+            try:
+                # Refresh token must not reach user hooks (logging...), auth is sent without them
+                post = getattr(self._client, "post_without_hooks", self._client.post)
+                response = await post(self._auth_url, headers=headers, json={})
+            except Exception as e:
+                if self.metrics is not None:
+                    self.metrics.record_error("auth", e, time.perf_counter() - start)
+                raise
+            if self.metrics is not None:
+                self.metrics.record_response("auth", response, time.perf_counter() - start)
+            status = response.status if hasattr(response, "status") else response.status_code
+            span.set_attribute("http.response.status_code", status)
+            if hasattr(response, "json_data"):
+                body = response.json_data
             else:
-                body = maybe_coro
-        
-        error_map = {
-            400: BadRequestError,
-            401: AuthenticationError,
-            422: ValidationError,
-        }
-
-        if status == 201:
-            self._access_token = body["access_token"]
-            self._save_token_cache(self._access_token)
-        else:
-            detail = body.get("detail", str(body)) if isinstance(body, dict) else str(body)
-            exception_class = error_map.get(status, OffersAPIError)
-            raise exception_class(status, detail)
+                maybe_coro = response.json()
+                if asyncio.iscoroutine(maybe_coro):
+                    body = await maybe_coro
+                else:
+                    body = maybe_coro
+
+            error_map = {
+                400: BadRequestError,
+                401: AuthenticationError,
+                422: ValidationError,
+            }
+
+            if status == 201:
+                token = body["access_token"]
+                expires_at = _response_expiry(body) or _decode_token_expiry(token) or time.time() + TOKEN_VALIDITY_SECONDS
+                self._set_token(token, expires_at)
+                self._save_token_cache(token, expires_at)
+            else:
+                detail = body.get("detail", str(body)) if isinstance(body, dict) else str(body)
+                exception_class = error_map.get(status, OffersAPIError)
+                raise exception_class(status, detail)
 
 
     def _load_token_cache(self) -> Optional[dict]:
-        '''Checker for loading of access token if generated recently.'''
+        '''Checker for loading of access token if still valid, adds "expires" unix timestamp.'''
         if not self._token_cache_path.exists():
             return None
 
         try:
             with open(self._token_cache_path, "r") as f:
                 data = json.load(f)
-            created_at = datetime.fromisoformat(data["created"])
-            if datetime.now() - created_at < timedelta(seconds=TOKEN_VALIDITY_SECONDS):
+            expires_at = data.get("expires") or _decode_token_expiry(data["access_token"])
+            if expires_at is None:
+                # Older cache format without any expiry info
+                created_at = datetime.fromisoformat(data["created"])
+                expires_at = created_at.timestamp() + TOKEN_VALIDITY_SECONDS
+            if time.time() < expires_at - self._expiry_margin:
+                data["expires"] = expires_at
                 return data
-            
+
         except Exception:
             pass  # corrupted or expired, generate a new one
 
         return None
 
-    def _save_token_cache(self, token: str):
+    def _save_token_cache(self, token: str, expires_at: float):
         '''Stores access token in project folder'''
-        with open(self._token_cache_path, "w") as f:
+        # Written to temporary file and renamed, other processes never read half written cache
+        tmp_path = self._token_cache_path.with_name(f"{self._token_cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
             json.dump({
                 "access_token": token,
-                "created": datetime.now().isoformat()
+                "created": datetime.now().isoformat(),
+                "expires": expires_at
             }, f)
-
-
-            
+        os.replace(tmp_path, self._token_cache_path)
@@ -0,0 +1,90 @@
+import asyncio
+from contextlib import aclosing
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def map_unordered(func: Callable[[T], Awaitable[R]],
+                        items: Union[Iterable[T], AsyncIterable[T]],
+                        concurrency: int = 10) -> AsyncIterator[Tuple[int, Union[R, Exception]]]:
+    '''
+    Run func for every item with at most `concurrency` calls in flight.
+
+    Yields (input index, result) as soon as each call completes - order is not preserved.
+    Exceptions raised by func are yielded as results, so one failure does not stop the stream.
+    Items are pulled lazily, input may be a (possibly endless) generator or async generator.
+    '''
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    async def call(index: int, item: T) -> Tuple[int, Any]:
+        try:
+            return index, await func(item)
+        except Exception as e:
+            return index, e
+
+    if not hasattr(items, "__aiter__"):
+        async with aclosing(_map_iterable(call, items, concurrency)) as results:
+            async for result in results:
+                yield result
+        return
+
+    # Slow async input (e.g. piped stdin) - wait for the next item and for calls at the same time,
+    # so finished results are not held back until more input arrives
+    iterator = items.__aiter__()
+    pending = set()
+    next_item = None
+    exhausted = False
+    index = 0
+    try:
+        while not exhausted or pending:
+            if not exhausted and next_item is None and len(pending) < concurrency:
+                next_item = asyncio.ensure_future(_anext(iterator))
+            done, _ = await asyncio.wait(pending | {next_item} - {None}, return_when=asyncio.FIRST_COMPLETED)
+            if next_item in done:
+                done.discard(next_item)
+                try:
+                    item = next_item.result()
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    pending.add(asyncio.ensure_future(call(index, item)))
+                    index += 1
+                next_item = None
+            pending -= done
+            for task in done:
+                yield task.result()
+    finally:
+        # Consumer stopped iterating early - do not leave calls running
+        for task in pending | {next_item} - {None}:
+            task.cancel()
+
+
+async def _anext(iterator: AsyncIterator[T]) -> T:
+    return await iterator.__anext__()
+
+
+async def _map_iterable(call: Callable[[int, T], Awaitable[Tuple[int, Any]]], items: Iterable[T],
+                        concurrency: int) -> AsyncIterator[Tuple[int, Any]]:
+    '''Plain iterable is never waited for, results are collected whenever a call is started.'''
+    pending = set()
+    try:
+        for index, item in enumerate(items):
+            pending.add(asyncio.ensure_future(call(index, item)))
+            if len(pending) >= concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            else:
+                done = {task for task in pending if task.done()}
+                pending -= done
+            for task in done:
+                yield task.result()
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
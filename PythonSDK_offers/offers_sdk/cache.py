@@ -0,0 +1,355 @@
+'''
+Persistent cache of offers, so restarted workers start warm instead of re-fetching everything.
+
+    cache = SQLiteOffersCache("offers_cache.db", ttl=60, serve_stale=True)
+    client = OffersClient(cache=cache)
+    await client.get_offers(product_id)    # fresh entry = no request, API unavailable = last known offers
+    await client.aclose()
+    cache.close()                          # owned by the caller, may be shared by several clients
+
+SQLite runs in WAL mode, so several processes can read while one of them writes. Reads are single
+primary key lookups run in a thread by OffersClient (aget), writes are queued and committed in batches
+by a background thread, so the event loop never waits for disk.
+
+NegativeCache remembers product IDs answered by 404 for a short time (see OffersClient(negative_cache=...)).
+ConditionalCache keeps ETag / Last-Modified with parsed offers, get_offers sends conditional requests
+and 304 Not Modified is answered from memory (see OffersClient(conditional_cache=...)).
+'''
+import asyncio
+import json
+import logging
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+from uuid import UUID
+from .exceptions import OffersAPIError
+from .models import Offer
+
+logger = logging.getLogger("offers_sdk.cache")
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS offers (
+    product_id TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+)
+'''
+_DELETE = object()  # queued instead of offers to remove entry
+
+
+class CachedOffers(NamedTuple):
+    offers: List[Offer]
+    fetched_at: float  # wall clock (time.time()), comparable across processes and restarts
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class OffersCache(ABC):
+    '''
+    Last known offers per product.
+
+    ttl - entries younger than ttl seconds are returned without request
+    serve_stale - return older entry when API is unavailable (connection error, 429, 5xx)
+    max_stale - oldest entry served as stale (seconds), None = any age
+    '''
+    def __init__(self, ttl: float = 60.0, serve_stale: bool = True, max_stale: Optional[float] = None):
+        self.ttl = ttl
+        self.serve_stale = serve_stale
+        self.max_stale = max_stale
+        self.hits = self.stale_hits = self.misses = 0
+
+    @abstractmethod
+    def get(self, product_id: str) -> Optional[CachedOffers]:
+        ...
+
+    async def aget(self, product_id: str) -> Optional[CachedOffers]:
+        '''get as used by OffersClient on the event loop, override when get blocks (disk, network).'''
+        return self.get(product_id)
+
+    @abstractmethod
+    def put(self, product_id: str, offers: List[Offer], fetched_at: Optional[float] = None):
+        ...
+
+    @abstractmethod
+    def delete(self, product_id: str):
+        ...
+
+    def close(self):
+        pass
+
+    def is_fresh(self, entry: CachedOffers) -> bool:
+        return entry.age < self.ttl
+
+    def can_serve_stale(self, entry: CachedOffers, error: Exception) -> bool:
+        '''Stale entry replaces error only when API is unavailable, not when it answered (404, 401...).'''
+        if not self.serve_stale or (self.max_stale is not None and entry.age >= self.max_stale):
+            return False
+        if isinstance(error, OffersAPIError):
+            return error.status_code == 429 or error.status_code >= 500 or error.status_code == 0
+        return _is_transport_error(error)  # bugs and validation errors are not hidden behind stale data
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses}
+
+
+class SQLiteOffersCache(OffersCache):
+    '''
+    OffersCache in SQLite database file shared by processes.
+
+    flush_interval - how long the writer waits to collect more writes into one transaction
+    batch_size - most writes committed in one transaction
+    '''
+    def __init__(self, path: Union[str, Path] = "offers_cache.db", ttl: float = 60.0, serve_stale: bool = True,
+                 max_stale: Optional[float] = None, flush_interval: float = 0.05, batch_size: int = 500):
+        super().__init__(ttl=ttl, serve_stale=serve_stale, max_stale=max_stale)
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._local = threading.local()  # read connection per thread, sqlite3 connections are not shared
+        # Written but not yet committed entries, reads see their own writes
+        self._pending: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self.writes = 0
+        self._closed = False
+
+        connection = self._connect()
+        connection.execute("PRAGMA journal_mode=WAL")  # persistent setting of the database file
+        connection.execute(_SCHEMA)
+        connection.commit()
+        self._local.connection = connection
+        self._writer = threading.Thread(target=self._write_loop, name="offers-cache-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+        connection.execute("PRAGMA synchronous=NORMAL")  # durable enough for a cache, much faster commits in WAL
+        return connection
+
+    def _read_connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def get(self, product_id: str) -> Optional[CachedOffers]:
+        product_id = _key(product_id)
+        found, entry = self._get_pending(product_id)
+        return entry if found else self._read(product_id)
+
+    async def aget(self, product_id: str) -> Optional[CachedOffers]:
+        '''Own writes are answered from memory, database read and JSON parsing run in a thread.'''
+        product_id = _key(product_id)
+        found, entry = self._get_pending(product_id)
+        return entry if found else await asyncio.to_thread(self._read, product_id)
+
+    def _get_pending(self, product_id: str) -> Tuple[bool, Optional[CachedOffers]]:
+        with self._lock:
+            pending = self._pending.get(product_id)
+        if pending is _DELETE:
+            return True, None
+        return pending is not None, pending
+
+    def _read(self, product_id: str) -> Optional[CachedOffers]:
+        row = self._read_connection().execute(
+            "SELECT body, fetched_at FROM offers WHERE product_id = ?", (product_id,)).fetchone()
+        if row is None:
+            return None
+        return CachedOffers([Offer(**item) for item in json.loads(row[0])], row[1])
+
+    def put(self, product_id: str, offers: List[Offer], fetched_at: Optional[float] = None):
+        entry = CachedOffers(list(offers), fetched_at if fetched_at is not None else time.time())
+        self._enqueue(_key(product_id), entry)
+
+    def delete(self, product_id: str):
+        self._enqueue(_key(product_id), _DELETE)
+
+    def _enqueue(self, product_id: str, entry):
+        if self._closed:
+            raise RuntimeError("Offers cache is closed")
+        with self._lock:
+            self._pending[product_id] = entry
+        self._queue.put(product_id)
+
+    def flush(self):
+        '''Block until everything written so far is committed (use asyncio.to_thread(cache.flush) from a loop).'''
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def _write_loop(self):
+        connection = self._connect()
+        running = True
+        while running:
+            keys = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(keys) < self.batch_size and not isinstance(keys[-1], threading.Event) and keys[-1] is not None:
+                try:
+                    keys.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            running = keys[-1] is not None
+            try:
+                self._commit(connection, [key for key in keys if isinstance(key, str)])
+            except sqlite3.Error:
+                logger.exception("Writing offers cache failed")
+            if isinstance(keys[-1], threading.Event):
+                keys[-1].set()
+        connection.close()
+
+    def _commit(self, connection: sqlite3.Connection, keys: List[str]):
+        with self._lock:
+            entries = {key: self._pending[key] for key in keys if key in self._pending}
+        if not entries:
+            return
+        upserts = [(key, json.dumps([offer.model_dump(mode="json") for offer in entry.offers]), entry.fetched_at)
+                   for key, entry in entries.items() if entry is not _DELETE]
+        deletes = [(key,) for key, entry in entries.items() if entry is _DELETE]
+        with connection:  # one transaction for the whole batch
+            connection.executemany("INSERT OR REPLACE INTO offers (product_id, body, fetched_at) VALUES (?, ?, ?)", upserts)
+            connection.executemany("DELETE FROM offers WHERE product_id = ?", deletes)
+        with self._lock:
+            for key, entry in entries.items():
+                if self._pending.get(key) is entry:  # not overwritten meanwhile
+                    del self._pending[key]
+        self.writes += len(entries)
+
+    def close(self):
+        '''Commit queued writes and stop writer thread.'''
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def stats(self) -> Dict[str, int]:
+        return {**super().stats(), "writes": self.writes, "pending": len(self._pending)}
+
+
+class NegativeCache:
+    '''
+    Product IDs recently answered by 404, get_offers raises ProductNotFoundError for them without request.
+
+    Bounded LRU with TTL - at most max_size IDs, each for ttl seconds. Entry is dropped when the product
+    is registered through the same client.
+    '''
+    def __init__(self, ttl: float = 30.0, max_size: int = 100_000, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._expires: "OrderedDict[str, float]" = OrderedDict()  # product ID -> expiry, oldest first
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def __contains__(self, product_id: str) -> bool:
+        '''Known as missing (counts hit or miss).'''
+        product_id = _key(product_id)
+        expires = self._expires.get(product_id)
+        if expires is not None and expires > self._clock():
+            self.hits += 1
+            return True
+        if expires is not None:
+            del self._expires[product_id]
+        self.misses += 1
+        return False
+
+    def add(self, product_id: str):
+        product_id = _key(product_id)
+        self._expires.pop(product_id, None)
+        self._expires[product_id] = self._clock() + self.ttl  # all entries share ttl, so order = expiry order
+        while len(self._expires) > self.max_size:
+            self._expires.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, product_id: str):
+        self._expires.pop(_key(product_id), None)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._expires), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class Validated(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    offers: List[Offer]
+
+
+class ConditionalCache:
+    '''
+    Validators (ETag / Last-Modified) and parsed offers of last 200 response per product.
+
+    get_offers sends If-None-Match / If-Modified-Since, on 304 Not Modified the stored offers are returned
+    without reading or parsing a body. Bounded LRU of at most max_size products, no TTL - the server decides.
+    '''
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Validated]" = OrderedDict()  # least recently used first
+        self.not_modified = self.modified = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, product_id: str) -> Optional[Validated]:
+        product_id = _key(product_id)
+        entry = self._entries.get(product_id)
+        if entry is not None:
+            self._entries.move_to_end(product_id)
+        return entry
+
+    def put(self, product_id: str, etag: Optional[str], last_modified: Optional[str], offers: List[Offer]):
+        '''Store response, without any validator there is nothing to ask with - entry is dropped.'''
+        product_id = _key(product_id)
+        self._entries.pop(product_id, None)
+        if etag is None and last_modified is None:
+            return
+        self._entries[product_id] = Validated(etag, last_modified, list(offers))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, product_id: str):
+        self._entries.pop(_key(product_id), None)
+
+    @staticmethod
+    def request_headers(entry: Validated) -> Dict[str, str]:
+        # If-None-Match wins on the server when both are sent (RFC 9110), Last-Modified is for servers without ETags
+        if entry.etag is not None:
+            return {"If-None-Match": entry.etag}
+        return {"If-Modified-Since": entry.last_modified}
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "not_modified": self.not_modified, "modified": self.modified,
+                "evictions": self.evictions}
+
+
+def _key(product_id: Union[UUID, str]) -> str:
+    '''Canonical form, so uppercase or braced ID given to get_offers matches the one from register_product.'''
+    try:
+        return str(UUID(str(product_id)))
+    except ValueError:
+        return str(product_id)  # not a UUID at all, kept as given
+
+
+def _is_transport_error(error: Exception) -> bool:
+    '''Connection refused, reset, timeout... of any backend, checked without importing the backends.'''
+    if isinstance(error, (OSError, TimeoutError, asyncio.TimeoutError)):  # requests errors are OSError too
+        return True
+    httpx = sys.modules.get("httpx")
+    if httpx is not None and isinstance(error, httpx.TransportError):
+        return True
+    aiohttp = sys.modules.get("aiohttp")
+    return aiohttp is not None and isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
@@ -1,45 +1,137 @@
 from .exceptions import *  # import of all exceptions
 # import httpx
 from .http_clients.base import AsyncHTTPClient
-from .http_clients.httpx_client import HTTPXClient  # default backend
-from .http_clients.aiohttp_client import AioHTTPClient
-from .http_clients.requests_client import RequestsClient
+from .http_clients.registry import create_http_client, get_backend
 from .auth import AuthManager
 from .models import Product, Offer, UUID, uuid4
-from typing import List, Optional, Union, Literal
+from .batching import map_unordered
+from .streaming import iter_json_array
+from . import tracing
+from typing import TYPE_CHECKING, AsyncIterable, AsyncIterator, Iterable, List, Optional, Tuple, Union, Literal
 import asyncio
-from hooks.hooks import HookManager, log_error, log_request, log_response
+import functools
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from hooks.hooks import HookManager
+
+if TYPE_CHECKING:
+    from .metrics import MetricsRegistry  # http.server import not needed when metrics are unused
+    from .cache import ConditionalCache, NegativeCache, OffersCache
+    from .diffing import OfferChange, OffersDiffer
+    from .journal import BatchJournal
+    from .known_products import KnownProductsIndex
+    from .monitoring import LoopWatchdog
+    from .profiling import CallProfiler  # cProfile, pstats and tracemalloc only when profiling is used
+
+# Backends are imported lazily, only the used one is loaded
+_LAZY_BACKENDS = {"HTTPXClient": "httpx", "AioHTTPClient": "aiohttp", "RequestsClient": "requests"}
+
+
+def __getattr__(name: str):
+    # Keeps "from offers_sdk.client import HTTPXClient" working without importing all backends
+    if name in _LAZY_BACKENDS:
+        return get_backend(_LAZY_BACKENDS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def profiled(operation: str):
+    '''Decorator of OffersClient methods, captures sampled calls by client.profiler (if set).'''
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            profiler = self.profiler
+            if profiler is None or not profiler.should_sample():
+                return await method(self, *args, **kwargs)
+            with profiler.capture(operation):
+                return await method(self, *args, **kwargs)
+        return wrapper
+    return decorator
 
 
 class OffersClient:
-    def __init__(self, base_url: str, refresh_token: str, 
-                 http_client: Optional[AsyncHTTPClient] = None, 
+    def __init__(self, base_url: Optional[str] = None, refresh_token: Optional[str] = None, 
+                 http_client: Optional[Union[AsyncHTTPClient, str]] = None, 
                  update_option: Literal["add", "replace"] = "add",
-                 hooks_usage: bool = False):
-        self._auth = AuthManager(auth_url=f"{base_url}/api/v1/auth", refresh_token=refresh_token)
+                 hooks_usage: bool = False,
+                 metrics: Optional["MetricsRegistry"] = None,
+                 profiler: Optional["CallProfiler"] = None,
+                 cache: Optional["OffersCache"] = None,
+                 known_products: Optional["KnownProductsIndex"] = None,
+                 negative_cache: Optional["NegativeCache"] = None,
+                 conditional_cache: Optional["ConditionalCache"] = None,
+                 token_cache_path: Optional[Union[str, Path]] = None,
+                 shared_token: bool = False):
+        if base_url is None or refresh_token is None:
+            # Configuration (.env) is loaded only when really needed
+            from config import load_settings
+            settings = load_settings()
+            base_url = base_url or settings["BASE_URL"]
+            refresh_token = refresh_token or settings["REFRESH_TOKEN"]
         self._base_url = base_url
         
-        self._http = http_client or HTTPXClient()  # defaultly using httpx
+        if http_client is None or isinstance(http_client, str):
+            # Backend given by name (e.g. "aiohttp"), defaultly using httpx
+            http_client = create_http_client(http_client or "httpx")
+        self._http = http_client
+        # Auth shares HTTP client (connection pool) with API calls
+        # shared_token - token cache file used by several processes at once, refresh guarded by file lock
+        self._auth = AuthManager(auth_url=f"{base_url}/api/v1/auth", refresh_token=refresh_token, http_client=self._http,
+                                 token_cache_path=Path(token_cache_path) if token_cache_path else None,
+                                 metrics=metrics, shared=shared_token)
+        # Optional per-endpoint metrics (offers_sdk.metrics.MetricsRegistry), None = no recording at all
+        self.metrics = metrics
+        # Optional sampling profiler (offers_sdk.profiling.CallProfiler) of register_product/get_offers calls
+        self.profiler = profiler
+        # Optional persistent cache of offers (offers_sdk.cache.SQLiteOffersCache), used by get_offers
+        self.cache = cache
+        # Optional local index of registered IDs (offers_sdk.known_products.KnownProductsIndex), known ones get 409 locally
+        self.known_products = known_products
+        # Optional short-lived memory of 404 product IDs (offers_sdk.cache.NegativeCache)
+        self.negative_cache = negative_cache
+        # Optional ETag / Last-Modified memory (offers_sdk.cache.ConditionalCache), unchanged offers come as 304
+        self.conditional_cache = conditional_cache
+        self._watchdog: Optional["LoopWatchdog"] = None
+        self._log_hooks = None
         if hooks_usage:
             if self._http.hooks is None:
                 self._http.hooks = HookManager()
 
-            if not len(self._http.hooks.on_request):
-                # If hooks are empty, include default one - set update_option (add - default)
-                self._http.hooks.add_request_hook(log_request, update_option=update_option)
+            if not len(self._http.hooks.on_response) or not len(self._http.hooks.on_error):
+                # If hooks are empty, include default structured logging (JSON lines to stderr, secrets redacted)
+                from hooks.structured_logging import StructuredLogHooks
+                self._log_hooks = StructuredLogHooks()
 
             if not len(self._http.hooks.on_response):    
-                self._http.hooks.add_response_hook(log_response, update_option=update_option)
+                self._http.hooks.add_response_hook(self._log_hooks.on_response, update_option=update_option)
             
             if not len(self._http.hooks.on_error):
-                self._http.hooks.add_error_hook(log_error, update_option=update_option)
+                self._http.hooks.add_error_hook(self._log_hooks.on_error, update_option=update_option)
 
             self._http.hooks.usage = hooks_usage
 
+    def start_watchdog(self, **kwargs) -> "LoopWatchdog":
+        '''Start monitoring of loop lag and connection pool of this client (see monitoring.LoopWatchdog), stopped by aclose().'''
+        from .monitoring import LoopWatchdog
+        if self._watchdog is None:
+            self._watchdog = LoopWatchdog(http_client=self._http, metrics=self.metrics, **kwargs)
+        return self._watchdog.start()
+
     async def aclose(self):
-        '''Close HTTP client if used HTTPXClient.'''
-        if self._http and isinstance(self._http, HTTPXClient):
-            await self._http.aclose()
+        '''Finish background hooks and close HTTP client if it supports closing (e.g. HTTPXClient).'''
+        if self._watchdog is not None:
+            await self._watchdog.stop()
+        hooks = getattr(self._http, "hooks", None)
+        if isinstance(hooks, HookManager):
+            await hooks.aclose()
+        if self._log_hooks is not None:
+            self._log_hooks.stop()
+        if self.profiler is not None:
+            self.profiler.close()  # writes report if report path is set
+        # cache and known_products may be shared with other clients, closing / saving them is up to the caller
+        aclose = getattr(self._http, "aclose", None)
+        if aclose is not None:
+            await aclose()
         
     async def _get_headers(self) -> dict:
         '''Private method preparing the dict with relevant headers for a client.'''
@@ -50,64 +142,307 @@ class OffersClient:
             "Content-Type": "application/json",
             "Bearer": access_token
         }
+
+    async def _send(self, endpoint: str, method: str, url: str, json: Optional[dict] = None,
+                    extra_headers: Optional[dict] = None):
+        '''Get headers and send request, returns (response, start time, token time) for metrics.'''
+        start = time.perf_counter()
+        headers = await self._get_headers()
+        if extra_headers:
+            headers.update(extra_headers)
+        token_time = time.perf_counter() - start
+        try:
+            if method == "POST":
+                response = await self._http.post(url, headers=headers, json=json)
+            else:
+                response = await self._http.get(url, headers=headers)
+        except Exception as e:
+            if self.metrics is not None:
+                self.metrics.record_error(endpoint, e, time.perf_counter() - start)
+            raise
+        return response, start, token_time
+
+    def _record(self, endpoint: str, response, start: float, token_time: float, parse_start: Optional[float] = None):
+        if self.metrics is not None:
+            end = time.perf_counter()
+            parse = end - parse_start if parse_start is not None else 0.0
+            self.metrics.record_response(endpoint, response, end - start, token=token_time, parse=parse)
     
-    async def register_products_batch(self, products: List[Product]) -> List[Union[Product, OffersAPIError]]:
+    async def _register_journaled(self, p: Product, journal: Optional["BatchJournal"]) -> Product:
+        '''Register product, with journal skip products completed by previous runs and record outcome.'''
+        if journal is None:
+            return await self.register_product(name=p.name, description=p.description, id=p.id)
+        status = journal.completed_status(p.id)
+        if status == 201:
+            return p
+        if status is not None:
+            # Same outcome as in the run which recorded it, not a success
+            exception_class = {409: ProductDuplicityError, 422: BadRequestError}.get(status, OffersAPIError)
+            raise exception_class(status, "Product completed with this status by previous run (journal)")
+        try:
+            registered = await self.register_product(name=p.name, description=p.description, id=p.id)
+        except OffersAPIError as e:
+            journal.record(p.id, e.status_code)
+            raise
+        journal.record(p.id, 201)
+        return registered
+
+    async def register_products_batch(self, products: List[Product],
+                                      journal: Optional["BatchJournal"] = None) -> List[Union[Product, OffersAPIError]]:
         """Batch implementation using either sequential or parallel calls"""
 
-        async def try_register(p: Product):
+        async def try_register(p: Product, previous: Optional[asyncio.Future]):
+            if previous is not None:
+                # Same ID earlier in this batch - once that one is registered (or 409) the API would answer 409,
+                # if it failed otherwise this one is sent
+                outcome = await asyncio.shield(previous)
+                if isinstance(outcome, (Product, ProductDuplicityError)):
+                    return ProductDuplicityError(409, "Product ID repeated in batch")
             try:
-                return await self.register_product(name=p.name, description=p.description, id=p.id)
+                return await self._register_journaled(p, journal)
             except OffersAPIError as e:
                 return e
 
-        return await asyncio.gather(*(try_register(p) for p in products))
+        with tracing.span("offers_sdk.register_products_batch", {"offers_sdk.batch_size": len(products)}):
+            latest = {}  # product ID -> its last call so far, repeated IDs wait for it
+            calls = []
+            for p in products:
+                call = latest[p.id] = asyncio.ensure_future(try_register(p, latest.get(p.id)))
+                calls.append(call)
+            return await asyncio.gather(*calls)
+
+    async def register_products_stream(self, products: Union[Iterable[Product], AsyncIterable[Product]],
+                                       concurrency: int = 10, journal: Optional["BatchJournal"] = None
+                                       ) -> AsyncIterator[Tuple[int, Union[Product, Exception]]]:
+        '''
+        Register (possibly endless) stream of products with bounded concurrency.
+
+        Yields (input index, registered product or exception) in order of completion.
+        With journal (offers_sdk.journal.BatchJournal) products completed by previous runs are yielded without request.
+        '''
+        async def register(p: Product) -> Product:
+            with tracing.use_span(stream_span):
+                return await self._register_journaled(p, journal)
+
+        # Span is not made current in generator itself, it would leak to the consumer between yields
+        stream_span = tracing.start_span("offers_sdk.register_products_stream", {"offers_sdk.concurrency": concurrency})
+        try:
+            async for index, result in map_unordered(register, products, concurrency):
+                yield index, result
+        finally:
+            stream_span.end()
+
+    async def get_offers_stream(self, product_ids: Union[Iterable[str], AsyncIterable[str]],
+                                concurrency: int = 10) -> AsyncIterator[Tuple[int, Union[List[Offer], Exception]]]:
+        '''Get offers for stream of product IDs, yields (input index, offers or exception) in order of completion.'''
+        async def get(product_id: str) -> List[Offer]:
+            with tracing.use_span(stream_span):
+                return await self.get_offers(product_id)
+
+        stream_span = tracing.start_span("offers_sdk.get_offers_stream", {"offers_sdk.concurrency": concurrency})
+        try:
+            async for index, result in map_unordered(get, product_ids, concurrency):
+                yield index, result
+        finally:
+            stream_span.end()
+
+    async def watch_offers(self, product_ids: Iterable[str], interval: float = 30.0, concurrency: int = 10,
+                           differ: Optional["OffersDiffer"] = None,
+                           rounds: Optional[int] = None) -> AsyncIterator["OfferChange"]:
+        '''
+        Poll offers of products every interval seconds and yield only added/removed/changed offers.
+
+        Failed fetch keeps previous snapshot of the product, unregistered product (404) yields its offers as removed.
+        rounds - number of polls, None = forever
+        '''
+        from .diffing import OffersDiffer
+        differ = differ or OffersDiffer()
+        product_ids = [str(product_id) for product_id in product_ids]
+        done = 0
+        while rounds is None or done < rounds:
+            started = time.monotonic()
+            async for index, result in self.get_offers_stream(product_ids, concurrency):
+                if isinstance(result, ProductNotFoundError):
+                    changes = differ.forget(product_ids[index])
+                elif isinstance(result, Exception):
+                    continue  # temporary failure, compared again in next round
+                else:
+                    changes = differ.diff(product_ids[index], result)
+                for change in changes:
+                    yield change
+            done += 1
+            if rounds is None or done < rounds:
+                await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
     
 
+    @profiled("register_product")
     async def register_product(self, name: str, description: str, id: Optional[UUID] = None) -> Product:
         '''Method to register a single product.'''
         product = Product(id=id or uuid4(), name=name, description=description)  # generates ID automatically if not provided
-        headers = await self._get_headers()
-        response = await self._http.post(
-            f"{self._base_url}/api/v1/products/register",
-            headers=headers,
-            json=product.model_dump(mode="json")
-        )
+        with tracing.span("offers_sdk.register_product", {"offers_sdk.product_id": str(product.id)}) as span:
+            if self.known_products is not None and id is not None and product.id in self.known_products:
+                self.known_products.skipped += 1
+                span.set_attribute("offers_sdk.known_product", True)
+                raise ProductDuplicityError(409, "Product ID already registered (known locally)")
+            response, start, token_time = await self._send(
+                "register", "POST",
+                f"{self._base_url}/api/v1/products/register",
+                json=product.model_dump(mode="json")
+            )
 
-        status = response.status if hasattr(response, "status") else response.status_code
-        body = response.json_data
-        # Eliminated this logic due to generalizing the common output structure
-        '''if hasattr(response, "json_data"):
+            status = response.status if hasattr(response, "status") else response.status_code
+            span.set_attribute("http.response.status_code", status)
+            if self.known_products is not None and status in (201, 409):
+                self.known_products.add(product.id, merge=False)
+                if self.known_products.needs_merge:
+                    await self.known_products.merge_in_thread()  # large array, keep the loop responsive
+            if self.negative_cache is not None and status in (201, 409):
+                self.negative_cache.invalidate(product.id)  # exists now, 404 is no longer true
             body = response.json_data
-        else:
-            maybe_coro = response.json()
-            if asyncio.iscoroutine(maybe_coro):
-                body = await maybe_coro
+            # Eliminated this logic due to generalizing the common output structure
+            '''if hasattr(response, "json_data"):
+                body = response.json_data
             else:
-                body = maybe_coro'''
+                maybe_coro = response.json()
+                if asyncio.iscoroutine(maybe_coro):
+                    body = await maybe_coro
+                else:
+                    body = maybe_coro'''
 
-        error_map = {
-            401: AuthenticationError,
-            409: ProductDuplicityError,
-            422: BadRequestError,
-        }
+            error_map = {
+                401: AuthenticationError,
+                409: ProductDuplicityError,
+                422: BadRequestError,
+            }
 
-        if status != 201:
-            detail = body.get("detail", str(body)) if isinstance(body, dict) else str(body)
-            exception_class = error_map.get(status, OffersAPIError)
-            raise exception_class(status, detail)
+            if status != 201:
+                self._record("register", response, start, token_time)
+                detail = body.get("detail", str(body)) if isinstance(body, dict) else str(body)
+                exception_class = error_map.get(status, OffersAPIError)
+                raise exception_class(status, detail)
 
-        return Product(id=UUID(body["id"]), name=name, description=description)
+            parse_start = time.perf_counter()
+            registered = Product(id=UUID(body["id"]), name=name, description=description)
+            self._record("register", response, start, token_time, parse_start)
+            return registered
 
 
+    @profiled("get_offers")
     async def get_offers(self, product_id: str) -> List[Offer]:
         '''Method to return all offers related to product with defined ID.'''
+        with tracing.span("offers_sdk.get_offers", {"offers_sdk.product_id": str(product_id)}) as span:
+            if self.negative_cache is not None:
+                return await self._get_offers_negative_cached(product_id, span)
+            return await self._get_offers_cached(product_id, span)
+
+    async def _get_offers_negative_cached(self, product_id: str, span) -> List[Offer]:
+        '''get_offers through the negative cache, recent 404 is answered without request.'''
+        negative = self.negative_cache
+        known_missing = product_id in negative
+        if self.metrics is not None:
+            self.metrics.set_gauge("negative_cache_hits", negative.hits)
+            self.metrics.set_gauge("negative_cache_misses", negative.misses)
+        if known_missing:
+            span.set_attribute("offers_sdk.cache", "negative_hit")
+            raise ProductNotFoundError(404, "Product ID has not been registered (cached)")
+        try:
+            return await self._get_offers_cached(product_id, span)
+        except ProductNotFoundError:
+            negative.add(product_id)
+            raise
+
+    async def _get_offers_cached(self, product_id: str, span) -> List[Offer]:
+        '''get_offers through the optional offers cache.'''
+        if self.cache is None:
+            return await self._fetch_offers(product_id, span)
+
+        cached = await self.cache.aget(product_id)  # SQLite read off the event loop
+        if cached is not None and self.cache.is_fresh(cached):
+            self.cache.hits += 1
+            span.set_attribute("offers_sdk.cache", "hit")
+            return cached.offers
+
+        self.cache.misses += 1
+        try:
+            offers = await self._fetch_offers(product_id, span)
+        except Exception as e:
+            if cached is not None and self.cache.can_serve_stale(cached, e):
+                # API unavailable - last known offers are better than nothing
+                self.cache.stale_hits += 1
+                span.set_attribute("offers_sdk.cache", "stale")
+                return cached.offers
+            if cached is not None and isinstance(e, ProductNotFoundError):
+                self.cache.delete(product_id)
+            raise
+        span.set_attribute("offers_sdk.cache", "miss")
+        self.cache.put(product_id, offers)
+        return offers
+
+    async def iter_offers(self, product_id: str) -> AsyncIterator[Offer]:
+        '''
+        Offers of product yielded as the response body is received and parsed, memory does not grow with
+        the number of offers. Backends without streaming (requests) read the whole body first.
+        Caches of the client are not used.
+        '''
+        url = f"{self._base_url}/api/v1/products/{product_id}/offers"
+        start = time.perf_counter()
         headers = await self._get_headers()
-        response = await self._http.get(
+        token_time = time.perf_counter() - start
+        # Span is not made current in generator itself, it would leak to the consumer between yields
+        span = tracing.start_span("offers_sdk.iter_offers", {"offers_sdk.product_id": str(product_id)})
+        count = 0
+        try:
+            async with AsyncExitStack() as stack:
+                with tracing.use_span(span):
+                    response = await stack.enter_async_context(self._http.stream_get(url, headers))
+                span.set_attribute("http.response.status_code", response.status)
+                if response.status != 200:
+                    body = await response.read_json()
+                elif response.chunks is None:
+                    for item in response.json_data:
+                        count += 1
+                        yield Offer(**item)
+                else:
+                    async for item in iter_json_array(response.chunks):
+                        count += 1
+                        yield Offer(**item)
+        except Exception as e:
+            if self.metrics is not None:
+                self.metrics.record_error("offers", e, time.perf_counter() - start)
+            raise
+        finally:
+            span.set_attribute("offers_sdk.offers_count", count)
+            span.end()
+
+        self._record("offers", response, start, token_time)
+        error_map = {
+            401: AuthenticationError,
+            404: ProductNotFoundError,
+            422: BadRequestError,
+        }
+        if response.status != 200:
+            detail = body.get("detail", str(body)) if isinstance(body, dict) else str(body)
+            exception_class = error_map.get(response.status, OffersAPIError)
+            raise exception_class(response.status, detail)
+
+    async def _fetch_offers(self, product_id: str, span) -> List[Offer]:
+        '''Request offers from API, conditionally when validators of previous response are known.'''
+        conditional = self.conditional_cache
+        validated = conditional.get(product_id) if conditional is not None else None
+        response, start, token_time = await self._send(
+            "offers", "GET",
             f"{self._base_url}/api/v1/products/{product_id}/offers",
-            headers=headers
+            extra_headers=conditional.request_headers(validated) if validated is not None else None
         )
 
         status = response.status if hasattr(response, "status") else response.status_code
+        span.set_attribute("http.response.status_code", status)
+        if status == 304 and validated is not None:
+            # Not modified - no body to read, offers from the previous response
+            conditional.not_modified += 1
+            span.set_attribute("offers_sdk.conditional", "not_modified")
+            self._record("offers", response, start, token_time)
+            return list(validated.offers)
         if hasattr(response, "json_data"):
             body = response.json_data
         else:
@@ -123,8 +458,19 @@ class OffersClient:
             422: BadRequestError,
         }
         if status != 200:
+            self._record("offers", response, start, token_time)
+            if conditional is not None and status == 404:
+                conditional.invalidate(product_id)
             detail = body.get("detail", str(body)) if isinstance(body, dict) else str(body)
             exception_class = error_map.get(status, OffersAPIError)
             raise exception_class(status, detail)
 
-        return [Offer(**item) for item in body]
+        parse_start = time.perf_counter()
+        offers = [Offer(**item) for item in body]
+        span.set_attribute("offers_sdk.offers_count", len(offers))
+        if conditional is not None:
+            if validated is not None:
+                conditional.modified += 1
+            conditional.put(product_id, response.headers.get("ETag"), response.headers.get("Last-Modified"), offers)
+        self._record("offers", response, start, token_time, parse_start)
+        return offers
@@ -0,0 +1,138 @@
+'''
+Negotiation of response compression (Accept-Encoding) for HTTP backends.
+
+    HTTPXClient(compression="auto")           # best codecs the backend can decode: zstd, br, gzip, deflate
+    AioHTTPClient(compression=["br", "gzip"]) # own preference order
+    RequestsClient(compression=None)          # library default header (default)
+    HTTPXClient(compression=[])               # no compression (identity)
+
+Codecs br and zstd need optional packages (pip install python_offers_sdk[compression]). Each backend
+advertises only codecs its library can decode, decoding is done by the library while the body is read
+(streamed, also for iter_offers). compress/decompressor are used by the mock API and benchmarks.
+'''
+import zlib
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+PREFERENCE = ("zstd", "br", "gzip", "deflate")  # typical ratio / speed order for JSON
+
+Compression = Union[None, str, Sequence[str]]
+
+
+def _import_brotli():
+    try:
+        import brotli
+    except ImportError:
+        import brotlicffi as brotli
+    return brotli
+
+
+def _import_zstd():
+    import zstandard
+    return zstandard
+
+
+def codec_available(codec: str) -> bool:
+    '''Codec can be used by this module (compress / decompressor).'''
+    try:
+        if codec == "br":
+            _import_brotli()
+        elif codec == "zstd":
+            _import_zstd()
+        elif codec not in ("gzip", "deflate"):
+            return False
+    except ImportError:
+        return False
+    return True
+
+
+def decodable(backend: str) -> List[str]:
+    '''Codecs the HTTP library of a built-in backend decodes in this environment.'''
+    if backend == "httpx":
+        # httpx decodes br / zstd when their packages are importable, same check as its decoders do
+        codecs = {"gzip", "deflate"}
+        codecs |= {"br"} if codec_available("br") else set()
+        codecs |= {"zstd"} if codec_available("zstd") else set()
+    elif backend == "aiohttp":
+        from aiohttp import compression_utils
+        codecs = {"gzip", "deflate"}
+        codecs |= {"br"} if getattr(compression_utils, "HAS_BROTLI", False) else set()
+        codecs |= {"zstd"} if getattr(compression_utils, "HAS_ZSTD", False) else set()
+    elif backend == "requests":
+        from urllib3.util.request import ACCEPT_ENCODING
+        codecs = {codec.strip() for codec in ACCEPT_ENCODING.split(",")}
+    else:
+        raise ValueError(f"Unknown backend '{backend}'")
+    return [codec for codec in PREFERENCE if codec in codecs]
+
+
+def accept_encoding(compression: Compression, backend: str) -> Optional[str]:
+    '''
+    Accept-Encoding header value for the backend, None = keep library default.
+
+    "auto" - all decodable codecs in PREFERENCE order; list - given codecs in given order
+    (ValueError for codecs the backend cannot decode); empty list - "identity".
+    '''
+    if compression is None:
+        return None
+    supported = decodable(backend)
+    if compression == "auto":
+        codecs = supported
+    else:
+        codecs = [compression] if isinstance(compression, str) else list(compression)
+        missing = [codec for codec in codecs if codec not in supported]
+        if missing:
+            raise ValueError(f"{backend} backend cannot decode {', '.join(missing)} here "
+                             f"(supported: {', '.join(supported)}), install python_offers_sdk[compression]")
+    if not codecs:
+        return "identity"
+    # Decreasing q-values keep our preference order, servers are free to ignore it anyway
+    return ", ".join(codec if i == 0 else f"{codec};q={max(0.1, 1 - i / 10):.1f}" for i, codec in enumerate(codecs))
+
+
+def parse_accept_encoding(header: str) -> List[str]:
+    '''Codecs from Accept-Encoding header ordered by q-value (q=0 dropped).'''
+    weighted = []
+    for position, part in enumerate(header.split(",")):
+        codec, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if codec and quality > 0:
+            weighted.append((-quality, position, codec.strip().lower()))
+    return [codec for _, _, codec in sorted(weighted)]
+
+
+def compress(data: bytes, codec: str, level: Optional[int] = None) -> bytes:
+    if codec == "gzip":
+        compressor = zlib.compressobj(level if level is not None else 6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+    if codec == "deflate":
+        return zlib.compress(data, level if level is not None else 6)
+    if codec == "br":
+        return _import_brotli().compress(data, quality=level if level is not None else 4)
+    if codec == "zstd":
+        return _import_zstd().ZstdCompressor(level=level if level is not None else 3).compress(data)
+    raise ValueError(f"Unknown codec '{codec}'")
+
+
+def decompressor(codec: str) -> Callable[[bytes], bytes]:
+    '''Streaming decompression - returned function takes compressed chunks, returns decompressed data so far.'''
+    if codec == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+    if codec == "deflate":
+        return zlib.decompressobj().decompress
+    if codec == "br":
+        return _import_brotli().Decompressor().process
+    if codec == "zstd":
+        return _import_zstd().ZstdDecompressor().decompressobj().decompress
+    raise ValueError(f"Unknown codec '{codec}'")
+
+
+def with_accept_encoding(headers: Dict[str, str], value: Optional[str]) -> Dict[str, str]:
+    '''Request headers with negotiated Accept-Encoding (unchanged if value is None or caller set one).'''
+    if value is None or any(key.lower() == "accept-encoding" for key in headers):
+        return headers
+    return {**headers, "Accept-Encoding": value}
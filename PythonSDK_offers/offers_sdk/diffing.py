@@ -0,0 +1,72 @@
+'''
+Change detection between successive offer lists of a product.
+
+    differ = OffersDiffer()
+    for change in differ.diff(product_id, await client.get_offers(product_id)):
+        print(change.kind, change.offer_id, change.offer)
+
+Previous snapshot is kept as one small integer per offer (keyed by offer UUID), not as Offer models,
+so memory stays low for many products. Removed offers therefore carry only their ID.
+'''
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from uuid import UUID
+from .models import Offer
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+
+class OfferChange(NamedTuple):
+    product_id: str
+    kind: str                # ADDED, REMOVED or CHANGED
+    offer_id: UUID
+    offer: Optional[Offer]   # current offer, None for REMOVED
+
+
+def offer_hash(offer: Offer) -> int:
+    '''Fingerprint of watched fields, hash of ints is stable across processes.'''
+    return hash((offer.price, offer.items_in_stock))
+
+
+class OffersDiffer:
+    '''
+    Keeps previous snapshot per product and returns only differences.
+
+    emit_initial - first list of a product is reported as ADDED offers, otherwise just remembered
+    '''
+    def __init__(self, emit_initial: bool = True):
+        self.emit_initial = emit_initial
+        self._snapshots: Dict[str, Dict[int, int]] = {}  # product ID -> {offer UUID as int: offer_hash}
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def __contains__(self, product_id: str) -> bool:
+        return str(product_id) in self._snapshots
+
+    def diff(self, product_id: str, offers: Iterable[Offer]) -> List[OfferChange]:
+        product_id = str(product_id)
+        offers = list(offers)
+        previous = self._snapshots.get(product_id)
+        current = {offer.id.int: offer_hash(offer) for offer in offers}
+        self._snapshots[product_id] = current
+        if previous is None and not self.emit_initial:
+            return []
+        previous = previous or {}
+
+        changes = []
+        for offer in offers:
+            old = previous.get(offer.id.int)
+            if old is None:
+                changes.append(OfferChange(product_id, ADDED, offer.id, offer))
+            elif old != current[offer.id.int]:
+                changes.append(OfferChange(product_id, CHANGED, offer.id, offer))
+        for offer_id in previous.keys() - current.keys():
+            changes.append(OfferChange(product_id, REMOVED, UUID(int=offer_id), None))
+        return changes
+
+    def forget(self, product_id: str) -> List[OfferChange]:
+        '''Drop product (e.g. it is no longer registered), its known offers are returned as REMOVED.'''
+        previous = self._snapshots.pop(str(product_id), {})
+        return [OfferChange(str(product_id), REMOVED, UUID(int=offer_id), None) for offer_id in previous]
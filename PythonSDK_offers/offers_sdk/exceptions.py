@@ -9,6 +9,10 @@ class OffersAPIError(Exception):
     def _format_message(self) -> str:
         return f"[{self.status_code}] Offers API Error: {self.detail}"
 
+    def __reduce__(self):
+        # Picklable with original arguments (results sent between processes)
+        return (self.__class__, (self.status_code, self.detail))
+
 
 class AuthenticationError(OffersAPIError):
     """Error code 401, bad authentication."""
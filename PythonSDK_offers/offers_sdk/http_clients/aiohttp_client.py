@@ -1,33 +1,126 @@
 # offers_sdk/http_clients/aiohttp_client.py
+import json
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
 import aiohttp
 from .base import AsyncHTTPClient
+from .. import tracing
+from ..compression import Compression, accept_encoding, with_accept_encoding
+from ..streaming import StreamedResponse
+from typing import AsyncIterator, Optional
+
+
+async def _on_request_headers_sent(session, context, params):
+    context.trace_request_ctx["sent"] = time.perf_counter()
+
+
+async def _on_request_end(session, context, params):
+    context.trace_request_ctx["received"] = time.perf_counter()
+
+
+def _timing_trace_config() -> aiohttp.TraceConfig:
+    '''Records when request was sent and when response headers arrived (per request dict in trace_request_ctx).'''
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_headers_sent.append(_on_request_headers_sent)
+    trace_config.on_request_end.append(_on_request_end)
+    return trace_config
 
 
 class AioHTTPClient(AsyncHTTPClient):
+    def __init__(self, hooks=None, session_config: Optional[dict] = None, compression: Compression = None):
+        super().__init__(hooks)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_config = session_config or {}
+        # Accept-Encoding by compression.accept_encoding, None = aiohttp default
+        self._accept_encoding = accept_encoding(compression, "aiohttp")
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """One session (connection pool) is reused by all requests"""
+        if self._session is None or self._session.closed:
+            config = dict(self._session_config)
+            config["trace_configs"] = list(config.get("trace_configs", [])) + [_timing_trace_config()]
+            self._session = aiohttp.ClientSession(**config)
+        return self._session
+
+    async def aclose(self):
+        if self._session is not None:
+            await self._session.close()
+
+    def pool_stats(self) -> dict:
+        connector = self._session.connector if self._session is not None and not self._session.closed else None
+        if connector is None:
+            return {}
+        # Private connector attributes, stable across aiohttp 3.x
+        waiters = getattr(connector, "_waiters", {})
+        return {"in_use": len(getattr(connector, "_acquired", ())),
+                "idle": sum(len(conns) for conns in getattr(connector, "_conns", {}).values()),
+                "waiting": sum(len(waiting) for waiting in waiters.values()),
+                "limit": connector.limit or None}  # 0 = unlimited
+
     async def get(self, url: str, headers: dict) -> aiohttp.ClientResponse:
-        method = "GET"
-        await self.hooks.run_request_hooks(method, url, headers, {})
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as resp:
-                    resp.json_data = await resp.json()
-                    await self.hooks.run_response_hooks(method, url, resp)
-                    return resp
-        except Exception as e:
-            await self.hooks.run_error_hooks(method, url, e)
-            raise
+        return await self._request("GET", url, headers, None)
 
     async def post(self, url: str, headers: dict, json: dict) -> aiohttp.ClientResponse:
-        method = "POST"
-        await self.hooks.run_request_hooks(method, url, headers, json)
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=json) as resp:
-                    resp.json_data = await resp.json()
-                    await self.hooks.run_response_hooks(method, url, resp)
+        return await self._request("POST", url, headers, json)
+
+    async def post_without_hooks(self, url: str, headers: dict, json: dict) -> aiohttp.ClientResponse:
+        return await self._request("POST", url, headers, json, run_hooks=False)
+
+    @asynccontextmanager
+    async def stream_get(self, url: str, headers: dict) -> AsyncIterator[StreamedResponse]:
+        with tracing.span("HTTP GET", {"http.request.method": "GET", "url.full": url,
+                                       "offers_sdk.attempt": tracing.current_attempt()}) as span:
+            headers = with_accept_encoding(tracing.inject_headers(headers), self._accept_encoding)
+            if getattr(self.hooks, "request_active", True):
+                await self.hooks.run_request_hooks("GET", url, headers, {})
+            async with AsyncExitStack() as stack:
+                try:
+                    session = await self._ensure_session()
+                    resp = await stack.enter_async_context(session.get(url, headers=headers, trace_request_ctx={}))
+                    span.set_attribute("http.response.status_code", resp.status)
+                    if getattr(self.hooks, "response_active", True):
+                        await self.hooks.run_response_hooks("GET", url, resp)
+                except Exception as e:
+                    if getattr(self.hooks, "error_active", True):
+                        await self.hooks.run_error_hooks("GET", url, e)
+                    raise
+                # Outside the try - errors of the consumer (parsing, validation) are not failures of the request
+                yield StreamedResponse(resp.status, resp.content.iter_any(), headers=dict(resp.headers))
+
+    async def _request(self, method: str, url: str, headers: dict, payload: Optional[dict],
+                       run_hooks: bool = True) -> aiohttp.ClientResponse:
+        with tracing.span(f"HTTP {method}", {"http.request.method": method, "url.full": url,
+                                              "offers_sdk.attempt": tracing.current_attempt()}) as span:
+            headers = with_accept_encoding(tracing.inject_headers(headers), self._accept_encoding)
+            if run_hooks and getattr(self.hooks, "request_active", True):
+                await self.hooks.run_request_hooks(method, url, headers, payload if payload is not None else {})
+
+            try:
+                session = await self._ensure_session()
+                data = None
+                if payload is not None:
+                    # Serialized here (as aiohttp would do) to know the request size
+                    data = json.dumps(payload).encode()
+                    if not any(key.lower() == "content-type" for key in headers):
+                        headers = {**headers, "Content-Type": "application/json"}
+                marks = {}
+                start = time.perf_counter()
+                async with session.request(method, url, headers=headers, data=data, trace_request_ctx=marks) as resp:
+                    body = await resp.read()
+                    parse_start = time.perf_counter()
+                    resp.json_data = await resp.json() if resp.status != 304 else None  # 304 has no body
+                    sent = marks.get("sent", start)
+                    resp.timings = {"connect": sent - start,
+                                    "server": marks.get("received", parse_start) - sent,
+                                    "parse": time.perf_counter() - parse_start}
+                    # body is already decoded, Content-Length is the size on the wire (when not chunked)
+                    resp.bytes_in = int(resp.headers.get("Content-Length", len(body)))
+                    resp.bytes_out = len(data) if data is not None else 0
+                    span.set_attribute("http.response.status_code", resp.status)
+                    if run_hooks and getattr(self.hooks, "response_active", True):
+                        await self.hooks.run_response_hooks(method, url, resp)
                     return resp
-        except Exception as e:
-            await self.hooks.run_error_hooks(method, url, e)
-            raise
+            except Exception as e:
+                if run_hooks and getattr(self.hooks, "error_active", True):
+                    await self.hooks.run_error_hooks(method, url, e)
+                raise
@@ -1,7 +1,9 @@
 # offers_sdk/http_clients/base.py
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
 from hooks.hooks import HookManager
+from ..streaming import StreamedResponse
 
 
 class AsyncHTTPClient(ABC):
@@ -15,3 +17,18 @@ class AsyncHTTPClient(ABC):
     @abstractmethod
     async def post(self, url: str, headers: Dict[str, str], json: Dict) -> Any:
         ...
+
+    async def post_without_hooks(self, url: str, headers: Dict[str, str], json: Dict) -> Any:
+        '''POST not passed to user hooks, used for auth (refresh token in headers). Built-in backends override it.'''
+        return await self.post(url, headers, json)
+
+    @asynccontextmanager
+    async def stream_get(self, url: str, headers: Dict[str, str]) -> AsyncIterator[StreamedResponse]:
+        '''GET with body read in chunks while consumed. Fallback for backends without streaming reads it whole.'''
+        response = await self.get(url, headers)
+        status = response.status if hasattr(response, "status") else response.status_code
+        yield StreamedResponse(status, json_data=response.json_data)
+
+    def pool_stats(self) -> Dict[str, Optional[int]]:
+        '''Connection pool usage {"in_use", "idle", "waiting", "limit"}, empty if the backend cannot tell.'''
+        return {}
@@ -1,14 +1,21 @@
 # offers_sdk/http_clients/httpx_client.py
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
 import httpx
 from .base import AsyncHTTPClient
-from typing import Optional
+from .. import tracing
+from ..compression import Compression, accept_encoding, with_accept_encoding
+from ..streaming import StreamedResponse
+from typing import AsyncIterator, Optional
 
 
 class HTTPXClient(AsyncHTTPClient):
-    def __init__(self, hooks=None, client_config: Optional[dict] = None):
+    def __init__(self, hooks=None, client_config: Optional[dict] = None, compression: Compression = None):
         super().__init__(hooks)
         self._client: Optional[httpx.AsyncClient] = None
         self._client_config = client_config or {}
+        # Accept-Encoding by compression.accept_encoding, None = httpx default (gzip, deflate + installed br/zstd)
+        self._accept_encoding = accept_encoding(compression, "httpx")
 
     async def _ensure_client(self):
         """Ensure client is initialized"""
@@ -20,29 +27,84 @@ class HTTPXClient(AsyncHTTPClient):
         if self._client is not None:
             # Maybe could be used also __aexit__
             await self._client.aclose()
+            self._client = None
+
+    def pool_stats(self) -> dict:
+        # Reads httpcore pool internals, empty if client is not created yet or transport is custom
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        if pool is None:
+            return {}
+        connections = list(getattr(pool, "_connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {"in_use": len(connections) - idle,
+                "idle": idle,
+                "waiting": sum(1 for request in list(getattr(pool, "_requests", [])) if request.is_queued()),
+                "limit": getattr(pool, "_max_connections", None)}
 
     async def get(self, url: str, headers: dict) -> httpx.Response:
-        method = "GET"
-        await self.hooks.run_request_hooks(method, url, headers, {})
-        try:
-            await self._ensure_client()
-            response = await self._client.get(url, headers=headers)
-            response.json_data = response.json()
-            await self.hooks.run_response_hooks(method, url, response)
-            return response
-        except Exception as e:
-            await self.hooks.run_error_hooks(method, url, e)
-            raise
+        return await self._request("GET", url, headers, None)
 
     async def post(self, url: str, headers: dict, json: dict) -> httpx.Response:
-        method = "POST"
-        await self.hooks.run_request_hooks(method, url, headers, json)
-        try:
-            await self._ensure_client()
-            response = await self._client.post(url, headers=headers, json=json)
-            response.json_data = response.json()
-            await self.hooks.run_response_hooks(method, url, response)
-            return response
-        except Exception as e:
-            await self.hooks.run_error_hooks(method, url, e)
-            raise
+        return await self._request("POST", url, headers, json)
+
+    async def post_without_hooks(self, url: str, headers: dict, json: dict) -> httpx.Response:
+        return await self._request("POST", url, headers, json, run_hooks=False)
+
+    @asynccontextmanager
+    async def stream_get(self, url: str, headers: dict) -> AsyncIterator[StreamedResponse]:
+        with tracing.span("HTTP GET", {"http.request.method": "GET", "url.full": url,
+                                       "offers_sdk.attempt": tracing.current_attempt()}) as span:
+            headers = with_accept_encoding(tracing.inject_headers(headers), self._accept_encoding)
+            if getattr(self.hooks, "request_active", True):
+                await self.hooks.run_request_hooks("GET", url, headers, {})
+            async with AsyncExitStack() as stack:
+                try:
+                    await self._ensure_client()
+                    response = await stack.enter_async_context(self._client.stream("GET", url, headers=headers))
+                    span.set_attribute("http.response.status_code", response.status_code)
+                    if getattr(self.hooks, "response_active", True):
+                        await self.hooks.run_response_hooks("GET", url, response)
+                except Exception as e:
+                    if getattr(self.hooks, "error_active", True):
+                        await self.hooks.run_error_hooks("GET", url, e)
+                    raise
+                # Outside the try - errors of the consumer (parsing, validation) are not failures of the request
+                yield StreamedResponse(response.status_code, response.aiter_bytes(), headers=dict(response.headers))
+
+    async def _request(self, method: str, url: str, headers: dict, payload: Optional[dict],
+                       run_hooks: bool = True) -> httpx.Response:
+        with tracing.span(f"HTTP {method}", {"http.request.method": method, "url.full": url,
+                                              "offers_sdk.attempt": tracing.current_attempt()}) as span:
+            headers = with_accept_encoding(tracing.inject_headers(headers), self._accept_encoding)
+            if run_hooks and getattr(self.hooks, "request_active", True):
+                await self.hooks.run_request_hooks(method, url, headers, payload if payload is not None else {})
+            try:
+                await self._ensure_client()
+                marks = {}
+
+                async def trace(event: str, info: dict):
+                    # httpcore trace events, e.g. "http11.send_request_headers.started"
+                    if event.endswith("send_request_headers.started"):
+                        marks["sent"] = time.perf_counter()
+                    elif event.endswith("receive_response_headers.complete"):
+                        marks["received"] = time.perf_counter()
+
+                start = time.perf_counter()
+                response = await self._client.request(method, url, headers=headers, json=payload, extensions={"trace": trace})
+                parse_start = time.perf_counter()
+                response.json_data = response.json() if response.status_code != 304 else None  # 304 has no body
+                sent = marks.get("sent", start)
+                response.timings = {"connect": sent - start,
+                                    "server": marks.get("received", parse_start) - sent,
+                                    "parse": time.perf_counter() - parse_start}
+                # bytes on the wire (compressed), transports giving preloaded content report 0
+                response.bytes_in = response.num_bytes_downloaded or len(response.content)
+                response.bytes_out = len(response.request.content)
+                span.set_attribute("http.response.status_code", response.status_code)
+                if run_hooks and getattr(self.hooks, "response_active", True):
+                    await self.hooks.run_response_hooks(method, url, response)
+                return response
+            except Exception as e:
+                if run_hooks and getattr(self.hooks, "error_active", True):
+                    await self.hooks.run_error_hooks(method, url, e)
+                raise
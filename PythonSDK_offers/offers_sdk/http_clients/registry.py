@@ -0,0 +1,61 @@
+# offers_sdk/http_clients/registry.py
+import importlib
+from importlib.metadata import entry_points
+from typing import Dict, List, Type, Union
+from .base import AsyncHTTPClient
+
+# Third party backends can be added via entry points in this group, e.g. in pyproject.toml:
+# [tool.poetry.plugins."offers_sdk.http_clients"]
+# mybackend = "my_package.client:MyClient"
+ENTRY_POINT_GROUP = "offers_sdk.http_clients"
+
+# Built-in backends are referenced by import path, module is imported only when backend is used
+_BUILTIN_BACKENDS: Dict[str, str] = {
+    "httpx": "offers_sdk.http_clients.httpx_client:HTTPXClient",
+    "aiohttp": "offers_sdk.http_clients.aiohttp_client:AioHTTPClient",
+    "requests": "offers_sdk.http_clients.requests_client:RequestsClient",
+}
+
+_backends: Dict[str, Union[str, Type[AsyncHTTPClient]]] = dict(_BUILTIN_BACKENDS)
+_entry_points_loaded = False
+
+
+def _load_entry_points():
+    '''Entry points are scanned only once and only if unknown backend is requested.'''
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        _backends.setdefault(ep.name, ep.value)
+
+
+def register_backend(name: str, backend: Union[str, Type[AsyncHTTPClient]]):
+    '''Register backend class or its import path in form "package.module:ClassName".'''
+    _backends[name] = backend
+
+
+def available_backends() -> List[str]:
+    _load_entry_points()
+    return sorted(_backends)
+
+
+def get_backend(name: str) -> Type[AsyncHTTPClient]:
+    '''Resolve backend class by name, importing its module on first use.'''
+    if name not in _backends:
+        _load_entry_points()
+    try:
+        backend = _backends[name]
+    except KeyError:
+        raise ValueError(f"Unknown HTTP client backend '{name}', available: {', '.join(available_backends())}") from None
+
+    if isinstance(backend, str):
+        module_name, _, attr = backend.partition(":")
+        backend = getattr(importlib.import_module(module_name), attr)
+        _backends[name] = backend  # resolved only once
+    return backend
+
+
+def create_http_client(name: str = "httpx", **kwargs) -> AsyncHTTPClient:
+    '''Create instance of backend registered under given name.'''
+    return get_backend(name)(**kwargs)
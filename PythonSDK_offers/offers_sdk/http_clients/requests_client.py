@@ -1,35 +1,84 @@
 # offers_sdk/http_clients/requests_client.py
 import requests
 import asyncio
-from typing import Dict
+import time
+from typing import Dict, Optional
 from .base import AsyncHTTPClient
+from .. import tracing
+from ..compression import Compression, accept_encoding, with_accept_encoding
 
 
 class RequestsClient(AsyncHTTPClient):
+    def __init__(self, hooks=None, pool_maxsize: int = 32, session: Optional[requests.Session] = None,
+                 compression: Compression = None):
+        super().__init__(hooks)
+        # Accept-Encoding by compression.accept_encoding, None = requests default
+        self._accept_encoding = accept_encoding(compression, "requests")
+        # Session keeps connections alive, pool is sized for threads of asyncio.to_thread
+        self._session = session or requests.Session()
+        self._pool_maxsize = pool_maxsize
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    async def aclose(self):
+        self._session.close()
+
+    def pool_stats(self) -> Dict[str, Optional[int]]:
+        '''Sum over urllib3 pools (one per host), free slots are kept in pool queue.'''
+        in_use = idle = limit = 0
+        for adapter in set(self._session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None or pool.pool is None:
+                    continue
+                free = pool.pool.qsize()
+                in_use += pool.pool.maxsize - free
+                idle += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+                limit += pool.pool.maxsize
+        # Calls waiting for a worker thread are visible as executor queue depth, not here
+        return {"in_use": in_use, "idle": idle, "waiting": 0, "limit": limit or self._pool_maxsize}
+
     async def get(self, url: str, headers: Dict[str, str]) -> requests.Response:
-        method = "GET"
-        await self.hooks.run_request_hooks(method, url, headers, {})
-
-        try:
-            # Command asyncio.to_thread allows to run sync code in separate thread
-            resp = await asyncio.to_thread(requests.get, url, headers=headers)
-            resp.json_data = resp.json()
-            await self.hooks.run_response_hooks(method, url, resp)
-            return resp
-        except Exception as e:
-            await self.hooks.run_error_hooks(method, url, e)
-            raise
+        return await self._request("GET", url, headers, None)
 
     async def post(self, url: str, headers: Dict[str, str], json: Dict) -> requests.Response:
-        method = "POST"
-        await self.hooks.run_request_hooks(method, url, headers, json)
-
-        try:
-            # Command asyncio.to_thread allows to run sync code in separate thread
-            resp = await asyncio.to_thread(requests.post, url, headers=headers, json=json)
-            resp.json_data = resp.json()
-            await self.hooks.run_response_hooks(method, url, resp)
-            return resp
-        except Exception as e:
-            await self.hooks.run_error_hooks(method, url, e)
-            raise
+        return await self._request("POST", url, headers, json)
+
+    async def post_without_hooks(self, url: str, headers: Dict[str, str], json: Dict) -> requests.Response:
+        return await self._request("POST", url, headers, json, run_hooks=False)
+
+    def _send(self, method: str, url: str, headers: Dict[str, str], payload: Optional[Dict]):
+        '''Runs in worker thread, returns also time when the thread picked the call up.'''
+        picked_up = time.perf_counter()
+        return picked_up, self._session.request(method, url, headers=headers, json=payload)
+
+    async def _request(self, method: str, url: str, headers: Dict[str, str], payload: Optional[Dict],
+                       run_hooks: bool = True) -> requests.Response:
+        with tracing.span(f"HTTP {method}", {"http.request.method": method, "url.full": url,
+                                              "offers_sdk.attempt": tracing.current_attempt()}) as span:
+            headers = with_accept_encoding(tracing.inject_headers(headers), self._accept_encoding)
+            if run_hooks and getattr(self.hooks, "request_active", True):
+                await self.hooks.run_request_hooks(method, url, headers, payload if payload is not None else {})
+
+            try:
+                start = time.perf_counter()
+                # Command asyncio.to_thread allows to run sync code in separate thread
+                picked_up, resp = await asyncio.to_thread(self._send, method, url, headers, payload)
+                parse_start = time.perf_counter()
+                resp.json_data = resp.json() if resp.status_code != 304 else None  # 304 has no body
+                # requests measures time from sending request until response headers are parsed
+                resp.timings = {"connect": picked_up - start,
+                                "server": resp.elapsed.total_seconds(),
+                                "parse": time.perf_counter() - parse_start}
+                resp.bytes_in = resp.raw.tell() or len(resp.content)  # urllib3 counts bytes before decoding
+                resp.bytes_out = len(resp.request.body or b"")
+                span.set_attribute("http.response.status_code", resp.status_code)
+                if run_hooks and getattr(self.hooks, "response_active", True):
+                    await self.hooks.run_response_hooks(method, url, resp)
+                return resp
+            except Exception as e:
+                if run_hooks and getattr(self.hooks, "error_active", True):
+                    await self.hooks.run_error_hooks(method, url, e)
+                raise
@@ -1,6 +1,7 @@
 from .base import AsyncHTTPClient
+from .. import tracing
 from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type
-from typing import Dict, Any
+from typing import Dict, Any, AsyncContextManager
 
 
 class RetryingHTTPClient(AsyncHTTPClient):
@@ -14,24 +15,38 @@ class RetryingHTTPClient(AsyncHTTPClient):
             reraise=True
         )
 
+    async def aclose(self):
+        aclose = getattr(self._wrapped, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    def pool_stats(self) -> dict:
+        return getattr(self._wrapped, "pool_stats", dict)()  # wrapped client need not derive from AsyncHTTPClient
+
+    # Hooks are not run in here - wrapped client shares the same HookManager and runs them for every attempt
+
+    async def _call(self, method, *args) -> Any:
+        attempt = 0
+
+        async def attempt_call():
+            nonlocal attempt
+            attempt += 1
+            with tracing.attempt(attempt):  # attempt number is put to the HTTP span by wrapped client
+                return await method(*args)
+
+        return await self._retry_decorator(attempt_call)()
+
     async def get(self, url: str, headers: Dict[str, str]) -> Any:
-        method = "GET"
-        await self.hooks.run_request_hooks(method, url, headers, {})
-        try:
-            resp = await self._retry_decorator(self._wrapped.get)(url, headers)
-            await self.hooks.run_response_hooks(method, url, resp)
-            return resp
-        except Exception as e:
-            await self.hooks.run_error_hooks(method, url, e)
-            raise
+        return await self._call(self._wrapped.get, url, headers)
 
     async def post(self, url: str, headers: Dict[str, str], json: Dict) -> Any:
-        method = "POST"
-        await self.hooks.run_request_hooks(method, url, headers, json)
-        try:
-            resp = await self._retry_decorator(self._wrapped.post)(url, headers, json)
-            await self.hooks.run_response_hooks(method, url, resp)
-            return resp
-        except Exception as e:
-            await self.hooks.run_error_hooks(method, url, e)
-            raise
+        return await self._call(self._wrapped.post, url, headers, json)
+
+    async def post_without_hooks(self, url: str, headers: Dict[str, str], json: Dict) -> Any:
+        # Auth - straight to the wrapped backend, refresh is repeated by the next call anyway
+        post = getattr(self._wrapped, "post_without_hooks", self._wrapped.post)
+        return await post(url, headers, json)
+
+    def stream_get(self, url: str, headers: Dict[str, str]) -> AsyncContextManager:
+        # Not retried - partly consumed body cannot be replayed to the caller
+        return self._wrapped.stream_get(url, headers)
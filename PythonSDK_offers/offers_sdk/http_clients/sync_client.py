@@ -1,26 +1,101 @@
 import asyncio
+import threading
+from concurrent.futures import Future
 from typing import List, Optional, Union
 from offers_sdk.client import OffersClient
 from offers_sdk.models import Product, Offer, UUID
 from offers_sdk.exceptions import OffersAPIError
+from offers_sdk import runtime
 
 class SyncOffersClient:
-    def __init__(self, base_url: str, refresh_token: str, http_client=None, hooks_usage: bool = False):
-        self._loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self._loop)
-        self._client = OffersClient(base_url=base_url, 
-                                    refresh_token=refresh_token, 
-                                    http_client=http_client, 
+    '''
+    Synchronous wrapper of OffersClient.
+
+    All calls run on one event loop owned by a background thread, so the client can be shared by many threads
+    (one connection pool, one access token) and used where another event loop is already running (Jupyter, FastAPI).
+    '''
+    def __init__(self, base_url: Optional[str] = None, refresh_token: Optional[str] = None, http_client=None, hooks_usage: bool = False,
+                 use_uvloop: Optional[bool] = None):
+        # Client first - if its constructor raises, no loop or thread is left behind
+        self._client = OffersClient(base_url=base_url,
+                                    refresh_token=refresh_token,
+                                    http_client=http_client,
                                     hooks_usage=hooks_usage)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        # uvloop if installed, unless switched off (argument, runtime.configure or OFFERS_SDK_UVLOOP=0)
+        self._loop = runtime.new_event_loop(use_uvloop)
+        self._thread = threading.Thread(target=self._run_loop, name="offers-sdk-loop", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _submit(self, coro) -> Future:
+        '''Schedule coroutine on background loop, thread-safe.'''
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("SyncOffersClient cannot be called from its own event loop (e.g. inside hooks), use OffersClient")
+        with self._close_lock:  # nothing is scheduled once close() started
+            if self._closed:
+                coro.close()
+                raise RuntimeError("SyncOffersClient is closed")
+            return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _run(self, coro):
+        return self._submit(coro).result()
 
     def register_products_batch(self, products: List[Product]) -> List[Union[Product, OffersAPIError]]:
-        return self._loop.run_until_complete(self._client.register_products_batch(products))
+        return self._run(self._client.register_products_batch(products))
 
     def register_product(self, name: str, description: str, id: Optional[UUID] = None) -> Product:
-        return self._loop.run_until_complete(self._client.register_product(name=name, description=description, id=id))
+        return self._run(self._client.register_product(name=name, description=description, id=id))
 
     def get_offers(self, product_id: str) -> List[Offer]:
-        return self._loop.run_until_complete(self._client.get_offers(product_id))
+        return self._run(self._client.get_offers(product_id))
+
+    def submit_register_product(self, name: str, description: str, id: Optional[UUID] = None) -> Future:
+        '''Non-blocking variant of register_product, returns concurrent.futures.Future.'''
+        return self._submit(self._client.register_product(name=name, description=description, id=id))
+
+    def submit_get_offers(self, product_id: str) -> Future:
+        '''Non-blocking variant of get_offers, returns concurrent.futures.Future.'''
+        return self._submit(self._client.get_offers(product_id))
+
+    def submit_register_products_batch(self, products: List[Product]) -> List[Future]:
+        '''One future per product (in input order), all registrations run concurrently.'''
+        return [self.submit_register_product(name=p.name, description=p.description, id=p.id) for p in products]
+
+    def submit_get_offers_batch(self, product_ids: List[str]) -> List[Future]:
+        '''One future per product ID (in input order), all requests run concurrently.'''
+        return [self.submit_get_offers(product_id) for product_id in product_ids]
+
+    async def _shutdown(self):
+        '''Cancel calls which are still running, then close HTTP client they used.'''
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._client.aclose()
 
     def close(self):
-        self._loop.close()
+        '''Close underlying HTTP client, stop background loop and its thread.'''
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("SyncOffersClient cannot be closed from its own event loop")
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,133 @@
+'''
+Append-only journal of batch registration, so a crashed run resumes where it stopped.
+
+    async with BatchJournal("register.journal") as journal:
+        async for index, result in client.register_products_stream(products, journal=journal):
+            ...
+
+Every finished product is appended as "<product ID> <status>" line. Lines are buffered and written with
+one fsync per flush_every entries (or flush_interval seconds) in a thread, so the event loop never waits
+for disk. On restart completed products are skipped without request - registered ones are returned as
+registered, 409 / 422 are raised again, so a rerun reports the same outcome as the first run. Crash loses
+at most the unflushed tail - those products are sent again and come back as 409, recorded as completed as well.
+'''
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Union
+from uuid import UUID
+
+# Statuses which will not change by sending the product again
+COMPLETED_STATUSES = frozenset({201, 409, 422})
+
+
+class BatchJournal:
+    def __init__(self, path: Union[str, Path], flush_every: int = 1000, flush_interval: float = 1.0):
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._completed: Set[int] = set()  # UUID as int, less memory than UUID objects or strings
+        self._failed: Dict[int, int] = {}  # completed with other status than 201 (few) -> status
+        self._buffer: List[str] = []
+        self._file = None
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._last_flush = time.monotonic()
+        self.recorded = self.skipped = self.flushes = 0
+
+    def open(self) -> "BatchJournal":
+        '''Load completed products of previous runs and open journal for appending.'''
+        if self._file is not None:
+            return self
+        if self.path.exists():
+            with open(self.path, "r", encoding="ascii", errors="replace") as file:
+                for line in file:
+                    parts = line.split()
+                    try:
+                        if len(parts) == 2:
+                            self._complete(UUID(parts[0]).int, int(parts[1]))
+                    except ValueError:
+                        continue  # torn last line after crash
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="ascii")
+        if self._file.tell() and not self._ends_with_newline():
+            self._file.write("\n")  # do not glue first new entry to a torn line
+        return self
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as file:
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b"\n"
+
+    def __len__(self) -> int:
+        return len(self._completed)
+
+    def _complete(self, key: int, status: int):
+        if status not in COMPLETED_STATUSES:
+            return
+        self._completed.add(key)
+        if status == 201:
+            self._failed.pop(key, None)
+        else:
+            self._failed[key] = status
+
+    def is_completed(self, product_id: Union[UUID, str]) -> bool:
+        return self.completed_status(product_id) is not None
+
+    def completed_status(self, product_id: Union[UUID, str]) -> Optional[int]:
+        '''Status recorded for completed product (counted as skipped), None = not completed yet.'''
+        key = _as_int(product_id)
+        if key not in self._completed:
+            return None
+        self.skipped += 1
+        return self._failed.get(key, 201)
+
+    def record(self, product_id: Union[UUID, str], status: int):
+        '''Append outcome of one product (HTTP status), written by the next flush.'''
+        if self._file is None:
+            raise RuntimeError("Journal is not open")
+        self._buffer.append(f"{product_id} {status}\n")
+        self._complete(_as_int(product_id), status)
+        self.recorded += 1
+        if len(self._buffer) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+
+    def _write(self, data: str):
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    async def flush(self):
+        '''Write buffered entries and fsync them (in a thread).'''
+        async with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._buffer:
+                return
+            data, self._buffer = "".join(self._buffer), []
+            await asyncio.to_thread(self._write, data)
+            self.flushes += 1
+
+    async def close(self):
+        if self._file is None:
+            return
+        if self._flush_task is not None:
+            await self._flush_task
+        await self.flush()
+        self._file.close()
+        self._file = None
+
+    async def __aenter__(self) -> "BatchJournal":
+        return self.open()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {"completed": len(self._completed), "recorded": self.recorded, "skipped": self.skipped,
+                "flushes": self.flushes}
+
+
+def _as_int(product_id: Union[UUID, str]) -> int:
+    return product_id.int if isinstance(product_id, UUID) else UUID(str(product_id)).int
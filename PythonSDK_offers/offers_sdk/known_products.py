@@ -0,0 +1,157 @@
+'''
+Local index of registered product IDs, so registering a known product does not cost a round-trip for 409.
+
+    index = KnownProductsIndex("known_products.bin")
+    client = OffersClient(known_products=index)
+    await client.register_product(name, description, id=known_id)   # ProductDuplicityError without request
+    index.save()                                                     # owned by the caller, not saved by the client
+
+IDs are kept as one sorted bytearray of 16-byte UUIDs (binary search), about 16 bytes per product
+instead of ~100 for a set of UUIDs (plus first ID of every 64 as bisect fences). New IDs go to a small set first and are merged into the array in bulk.
+Merging copies runs of the old array between insertion points into a new one, no per-ID objects are created.
+OffersClient runs large merges in a thread (merge_in_thread), lookups meanwhile use the old array and the set.
+The file is the raw array, loaded at once.
+'''
+import asyncio
+import os
+from bisect import bisect_right
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, Tuple, Union
+from uuid import UUID
+
+_SIZE = 16
+_BLOCK = 64  # entries per fence
+
+
+class KnownProductsIndex:
+    '''
+    merge_threshold - new IDs kept in a set before merging them into the sorted array
+    (grows with the array, so merging stays amortized O(1) per added ID)
+    '''
+    def __init__(self, path: Optional[Union[str, Path]] = None, merge_threshold: int = 10_000):
+        self.path = Path(path) if path is not None else None
+        self.merge_threshold = merge_threshold
+        self._sorted = bytearray()
+        self._recent: Set[bytes] = set()
+        self._fences: List[bytes] = []  # first key of every _BLOCK entries
+        self._dirty = False
+        self._merging = False
+        self.skipped = 0  # registrations answered locally
+        if self.path is not None and self.path.exists():
+            data = self.path.read_bytes()
+            self._sorted = bytearray(data[:len(data) - len(data) % _SIZE])  # ignore torn tail
+            self._build_fences()
+
+    def __len__(self) -> int:
+        return len(self._sorted) // _SIZE + len(self._recent)
+
+    def __contains__(self, product_id: Union[UUID, str]) -> bool:
+        return self._contains_key(_key(product_id))
+
+    def _contains_key(self, key: bytes) -> bool:
+        if key in self._recent:
+            return True
+        data, fences = self._sorted, self._fences  # both replaced together by a merge
+        index = _position(data, fences, key)
+        return data[index * _SIZE:(index + 1) * _SIZE] == key
+
+    def add(self, product_id: Union[UUID, str], merge: bool = True):
+        '''Remember ID, merge=False leaves a due merge to the caller (see needs_merge, merge_in_thread).'''
+        key = _key(product_id)
+        if self._contains_key(key):
+            return
+        self._recent.add(key)
+        self._dirty = True
+        if merge and self.needs_merge:
+            self._merge()
+
+    def update(self, product_ids: Iterable[Union[UUID, str]]):
+        for product_id in product_ids:
+            self.add(product_id)
+
+    @property
+    def needs_merge(self) -> bool:
+        return not self._merging and len(self._recent) >= max(self.merge_threshold, len(self._sorted) // _SIZE // 8)
+
+    def _merge(self):
+        if self._recent and not self._merging:
+            self._apply(*_merged(self._sorted, self._fences, sorted(self._recent)))
+
+    async def merge_in_thread(self):
+        '''Merge in a worker thread, the event loop keeps answering lookups from the old array and the set.'''
+        if self._merging or not self._recent:
+            return
+        self._merging = True
+        try:
+            keys = sorted(self._recent)  # IDs added meanwhile stay in the set for the next merge
+            self._apply(*await asyncio.to_thread(_merged, self._sorted, self._fences, keys))
+        finally:
+            self._merging = False
+
+    def _apply(self, data: bytearray, fences: List[bytes], keys: List[bytes]):
+        self._sorted, self._fences = data, fences
+        self._recent.difference_update(keys)
+
+    def _build_fences(self):
+        self._fences = _fences(self._sorted)
+
+    def save(self):
+        '''Write index to its file (temporary file + rename, readers never see a half written one).'''
+        if self.path is None or not self._dirty:
+            return
+        data = self._sorted
+        if self._recent:
+            data, fences, keys = _merged(self._sorted, self._fences, sorted(self._recent))
+            if not self._merging:  # otherwise the running merge replaces the array when it finishes
+                self._apply(data, fences, keys)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, self.path)
+        self._dirty = False
+
+    def close(self):
+        self.save()
+
+
+def _fences(data: bytearray) -> List[bytes]:
+    step = _BLOCK * _SIZE
+    return [bytes(data[i:i + _SIZE]) for i in range(0, len(data), step)]
+
+
+def _position(data: bytearray, fences: List[bytes], key: bytes) -> int:
+    '''Index of the first entry >= key.'''
+    # Fences find the block in C (bisect), only up to _BLOCK entries are searched here
+    block = bisect_right(fences, key) - 1
+    if block < 0:
+        return 0
+    low = block * _BLOCK
+    high = min(low + _BLOCK, len(data) // _SIZE)
+    while low < high:
+        middle = (low + high) // 2
+        if data[middle * _SIZE:(middle + 1) * _SIZE] < key:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _merged(data: bytearray, fences: List[bytes], keys: List[bytes]) -> Tuple[bytearray, List[bytes], List[bytes]]:
+    '''New sorted array with sorted keys inserted (old one is not modified), its fences and the inserted keys.'''
+    merged = bytearray(len(data) + len(keys) * _SIZE)
+    previous = offset = 0
+    with memoryview(data) as view:
+        for key in keys:
+            position = _position(data, fences, key)
+            run = view[previous * _SIZE:position * _SIZE]
+            merged[offset:offset + len(run)] = run
+            offset += len(run)
+            merged[offset:offset + _SIZE] = key
+            offset += _SIZE
+            previous = position
+        merged[offset:] = view[previous * _SIZE:]
+    return merged, _fences(merged), keys
+
+
+def _key(product_id: Union[UUID, str]) -> bytes:
+    return (product_id if isinstance(product_id, UUID) else UUID(str(product_id))).bytes
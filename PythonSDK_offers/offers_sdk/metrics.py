@@ -0,0 +1,216 @@
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+# Fixed logarithmic latency buckets (upper bounds in seconds): 0.1 ms, 0.2 ms, 0.4 ms ... ~52 s, then +Inf
+LATENCY_BUCKETS = tuple(0.0001 * 2 ** i for i in range(20))
+
+# Phases of one API call:
+# total   - whole SDK call
+# token   - getting access token (memory, file cache or refresh)
+# connect - waiting for connection (pool wait, TCP/TLS, thread pool wait for requests backend)
+# server  - request sent until response headers received
+# parse   - JSON decoding and model construction
+PHASES = ("total", "token", "connect", "server", "parse")
+
+
+class Histogram:
+    '''Latency histogram with fixed log buckets, mutated only on the event loop (no locks).'''
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        '''Upper bound of bucket containing q-quantile (None if empty).'''
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        counts = list(self.counts)  # copy first, may be read from other thread (exporter)
+        return {"count": self.count,
+                "sum": self.sum,
+                "counts": counts,
+                "p50": self.quantile(0.5),
+                "p90": self.quantile(0.9),
+                "p99": self.quantile(0.99)}
+
+
+class EndpointMetrics:
+    __slots__ = ("requests", "errors", "statuses", "bytes_in", "bytes_out", "latency")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors: Dict[str, int] = {}    # exceptions without HTTP response, by type
+        self.statuses: Dict[int, int] = {}
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.latency = {phase: Histogram() for phase in PHASES}
+
+    def snapshot(self) -> dict:
+        return {"requests": self.requests,
+                "errors": dict(self.errors),
+                "statuses": dict(self.statuses),
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "latency": {phase: histogram.snapshot() for phase, histogram in self.latency.items()}}
+
+
+class MetricsRegistry:
+    '''
+    Per-endpoint request counts, status codes, bytes in/out and latency histograms per phase.
+
+    Recording is plain attribute arithmetic on the event loop thread, snapshot() may be called from any thread.
+    '''
+    def __init__(self):
+        self._endpoints: Dict[str, EndpointMetrics] = {}
+        self.gauges: Dict[str, float] = {}  # e.g. loop_lag_seconds set by monitoring.LoopWatchdog
+
+    def endpoint(self, name: str) -> EndpointMetrics:
+        metrics = self._endpoints.get(name)
+        if metrics is None:
+            metrics = self._endpoints[name] = EndpointMetrics()
+        return metrics
+
+    def record_response(self, endpoint: str, response: Any, total: float, token: Optional[float] = None, parse: float = 0.0):
+        '''Record finished HTTP call, phase timings and sizes are read from response attributes set by backends.'''
+        metrics = self.endpoint(endpoint)
+        metrics.requests += 1
+        status = response.status if hasattr(response, "status") else response.status_code
+        if isinstance(status, int):
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+        latency = metrics.latency
+        latency["total"].observe(total)
+        if token is not None:
+            latency["token"].observe(token)
+        timings = getattr(response, "timings", None)
+        if isinstance(timings, dict):
+            for phase in ("connect", "server"):
+                if phase in timings:
+                    latency[phase].observe(timings[phase])
+            parse += timings.get("parse", 0.0)
+        latency["parse"].observe(parse)
+
+        bytes_in, bytes_out = getattr(response, "bytes_in", None), getattr(response, "bytes_out", None)
+        if isinstance(bytes_in, int):
+            metrics.bytes_in += bytes_in
+        if isinstance(bytes_out, int):
+            metrics.bytes_out += bytes_out
+
+    def set_gauge(self, name: str, value: float):
+        self.gauges[name] = value
+
+    def record_error(self, endpoint: str, error: Exception, total: float):
+        '''Record call which failed without HTTP response (network error, timeout...).'''
+        metrics = self.endpoint(endpoint)
+        metrics.requests += 1
+        name = type(error).__name__
+        metrics.errors[name] = metrics.errors.get(name, 0) + 1
+        metrics.latency["total"].observe(total)
+
+    def snapshot(self) -> dict:
+        return {"buckets": list(LATENCY_BUCKETS),
+                "endpoints": {name: metrics.snapshot() for name, metrics in list(self._endpoints.items())},
+                "gauges": dict(self.gauges)}
+
+    def to_prometheus(self) -> str:
+        '''Render snapshot in Prometheus text exposition format.'''
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP offers_sdk_requests_total SDK API calls.",
+            "# TYPE offers_sdk_requests_total counter",
+        ]
+        endpoints = snapshot["endpoints"]
+        for name, data in endpoints.items():
+            lines.append(f'offers_sdk_requests_total{{endpoint="{name}"}} {data["requests"]}')
+        lines += ["# HELP offers_sdk_responses_total Responses by HTTP status code.",
+                  "# TYPE offers_sdk_responses_total counter"]
+        for name, data in endpoints.items():
+            for status, count in data["statuses"].items():
+                lines.append(f'offers_sdk_responses_total{{endpoint="{name}",status="{status}"}} {count}')
+        lines += ["# HELP offers_sdk_errors_total Calls failed without HTTP response.",
+                  "# TYPE offers_sdk_errors_total counter"]
+        for name, data in endpoints.items():
+            for error, count in data["errors"].items():
+                lines.append(f'offers_sdk_errors_total{{endpoint="{name}",error="{error}"}} {count}')
+        for direction in ("in", "out"):
+            metric = f"offers_sdk_bytes_{direction}_total"
+            lines += [f"# HELP {metric} Body bytes {'received' if direction == 'in' else 'sent'}.",
+                      f"# TYPE {metric} counter"]
+            for name, data in endpoints.items():
+                lines.append(f'{metric}{{endpoint="{name}"}} {data["bytes_" + direction]}')
+        lines += ["# HELP offers_sdk_latency_seconds Latency of SDK call phases.",
+                  "# TYPE offers_sdk_latency_seconds histogram"]
+        bounds = [f"{bound:g}" for bound in snapshot["buckets"]] + ["+Inf"]
+        for name, data in endpoints.items():
+            for phase, histogram in data["latency"].items():
+                labels = f'endpoint="{name}",phase="{phase}"'
+                cumulative = 0
+                for bound, count in zip(bounds, histogram["counts"]):
+                    cumulative += count
+                    lines.append(f'offers_sdk_latency_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"offers_sdk_latency_seconds_sum{{{labels}}} {histogram['sum']}")
+                lines.append(f"offers_sdk_latency_seconds_count{{{labels}}} {histogram['count']}")
+        for name, value in snapshot["gauges"].items():
+            lines += [f"# TYPE offers_sdk_{name} gauge", f"offers_sdk_{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def serve_prometheus(self, port: int = 9464, host: str = "127.0.0.1") -> "PrometheusExporter":
+        '''Start exporter serving /metrics from a background thread.'''
+        exporter = PrometheusExporter(self, port=port, host=host)
+        exporter.start()
+        return exporter
+
+
+class PrometheusExporter:
+    '''Minimal HTTP server exposing MetricsRegistry in Prometheus text format on /metrics.'''
+    def __init__(self, registry: MetricsRegistry, port: int = 9464, host: str = "127.0.0.1"):
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry_ref.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # no access log to stderr
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="offers-sdk-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
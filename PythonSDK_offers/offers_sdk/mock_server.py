@@ -0,0 +1,358 @@
+'''
+Deterministic local mock of the Offers API (endpoints of openapi.json) for offline tests and benchmarks.
+
+    async with MockOffersServer(latency={"offers": lognormal(0.02, 0.5)}, errors={"*": {500: 0.01}}) as server:
+        client = OffersClient(base_url=server.url, refresh_token=server.refresh_token)
+
+    with MockOffersServer(seed=1).run_in_thread() as server:   # from sync code, pytest fixtures...
+        ...
+
+Standalone process (e.g. for benchmarks or CLI):
+    python -m offers_sdk.mock_server --port 8000 --latency-ms 20 --error-rate 0.01
+    python -m offers_sdk.mock_server --compress zstd,br,gzip   # compressed responses by client's Accept-Encoding
+
+Offers responses carry ETag and Last-Modified, If-None-Match / If-Modified-Since get 304 while offers
+of the product are unchanged (api.update_offers changes them).
+
+Latency, injected errors and generated offers come from one seeded random generator,
+so the same seed and the same sequence of requests give the same responses.
+'''
+import argparse
+import asyncio
+import base64
+import email.utils
+import hashlib
+import hmac
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Sequence, Union
+from uuid import UUID, uuid4
+from aiohttp import web
+from . import compression as codecs
+
+ENDPOINTS = ("auth", "register", "offers")
+DEFAULT_REFRESH_TOKEN = "mock-refresh-token"
+
+Latency = Callable[[random.Random], float]  # returns seconds
+
+
+def fixed(seconds: float) -> Latency:
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> Latency:
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float = 0.5) -> Latency:
+    '''Long tailed latency as seen on real APIs, median in seconds.'''
+    return lambda rng: median * rng.lognormvariate(0.0, sigma)
+
+
+def _b64(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+class MockOffersAPI:
+    '''
+    State and request handling of the mock API.
+
+    latency - Latency for all endpoints or dict {endpoint: Latency}, endpoints are "auth", "register", "offers"
+    errors - {endpoint or "*": {status: probability}}, injected before normal handling (401, 409, 429, 5xx...)
+    token_ttl - lifetime of issued access tokens (JWT-like, "exp" claim), expired tokens get 401
+    max_in_flight - capacity, requests above it get 429 with Retry-After
+    compression - codecs the server may use ("gzip", "deflate", "br", "zstd"), picked by client's Accept-Encoding,
+        bodies smaller than compress_min_size are sent as they are
+    '''
+    def __init__(self, refresh_token: str = DEFAULT_REFRESH_TOKEN, seed: int = 0,
+                 latency: Union[Latency, Dict[str, Latency], None] = None,
+                 errors: Optional[Dict[str, Dict[int, float]]] = None,
+                 token_ttl: float = 300.0, max_in_flight: Optional[int] = None, offers_per_product: int = 3,
+                 compression: Sequence[str] = (), compression_level: Optional[int] = None, compress_min_size: int = 256):
+        self.refresh_token = refresh_token
+        self.token_ttl = token_ttl
+        self.max_in_flight = max_in_flight
+        self.offers_per_product = offers_per_product
+        unavailable = [codec for codec in compression if not codecs.codec_available(codec)]
+        if unavailable:
+            raise ValueError(f"Codecs not available: {', '.join(unavailable)}")
+        self.compression = tuple(compression)
+        self.compression_level = compression_level
+        self.compress_min_size = compress_min_size
+        self._rng = random.Random(seed)
+        if latency is None or callable(latency):
+            latency = {endpoint: latency or fixed(0.0) for endpoint in ENDPOINTS}
+        self._latency = latency
+        self._errors = errors or {}
+        self._secret = hashlib.sha256(f"offers-mock:{refresh_token}".encode()).digest()  # same in every server process
+        self._products: Dict[str, list] = {}       # product ID -> offers
+        self._validators: Dict[str, tuple] = {}    # product ID -> (ETag, Last-Modified), computed on first request
+        self._modified: Dict[str, float] = {}      # product ID -> time of last change of offers
+        self._in_flight = 0
+        self.requests: Dict[str, int] = {endpoint: 0 for endpoint in ENDPOINTS}
+        self.statuses: Dict[int, int] = {}
+        self.encodings: Dict[str, int] = {}       # Content-Encoding of responses ("identity" = not compressed)
+        self.bytes_sent = 0                       # response bodies as sent (after compression)
+
+    def _sign(self, message: str) -> str:
+        return base64.urlsafe_b64encode(hmac.new(self._secret, message.encode(), hashlib.sha256).digest()).rstrip(b"=").decode()
+
+    def issue_token(self) -> str:
+        '''JWT-like HS256 token, SDK reads expiry from "exp" claim. Validation is stateless (works across processes).'''
+        message = f'{_b64({"alg": "HS256", "typ": "JWT"})}.{_b64({"exp": time.time() + self.token_ttl, "jti": uuid4().hex})}'
+        return f"{message}.{self._sign(message)}"
+
+    def _generate_offers(self) -> list:
+        return [{"id": str(UUID(int=self._rng.getrandbits(128), version=4)),
+                 "price": self._rng.randint(100, 100_000),
+                 "items_in_stock": self._rng.randint(0, 500)} for _ in range(self.offers_per_product)]
+
+    def add_product(self, product_id: str) -> list:
+        '''Register product directly (test setup), returns its offers.'''
+        return self.update_offers(product_id, self._generate_offers())
+
+    def update_offers(self, product_id: str, offers: Optional[list] = None) -> list:
+        '''Replace offers of registered product (new ones generated if not given), its ETag changes.'''
+        offers = offers if offers is not None else self._generate_offers()
+        self._products[product_id] = offers
+        self._validators.pop(product_id, None)
+        self._modified[product_id] = time.time()
+        return offers
+
+    def _offers_validators(self, product_id: str) -> tuple:
+        validators = self._validators.get(product_id)
+        if validators is None:
+            digest = hashlib.blake2b(json.dumps(self._products[product_id]).encode(), digest_size=12).hexdigest()
+            validators = self._validators[product_id] = (
+                f'"{digest}"', email.utils.formatdate(self._modified[product_id], usegmt=True))
+        return validators
+
+    @staticmethod
+    def _not_modified(request: web.Request, etag: str, last_modified: str) -> bool:
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            # Weak comparison, as servers do for GET
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if_modified_since = request.headers.get("If-Modified-Since")
+        if if_modified_since is None:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return email.utils.parsedate_to_datetime(last_modified).timestamp() <= since
+
+    def _injected_error(self, endpoint: str) -> Optional[int]:
+        for key in (endpoint, "*"):
+            for status, probability in self._errors.get(key, {}).items():
+                if self._rng.random() < probability:
+                    return status
+        return None
+
+    def _token_valid(self, request: web.Request) -> bool:
+        message, _, signature = request.headers.get("Bearer", "").rpartition(".")
+        if not message or not hmac.compare_digest(signature, self._sign(message)):
+            return False
+        payload = message.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return time.time() < claims["exp"]
+
+    def _response(self, status: int, body, headers: Optional[dict] = None) -> web.Response:
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        return web.json_response(body, status=status, headers=headers)
+
+    async def _handle(self, endpoint: str, request: web.Request, handler) -> web.Response:
+        self.requests[endpoint] += 1
+        if self.max_in_flight is not None and self._in_flight >= self.max_in_flight:
+            return self._response(429, {"detail": "Too many requests"}, headers={"Retry-After": "1"})
+
+        self._in_flight += 1
+        try:
+            delay = self._latency.get(endpoint, fixed(0.0))(self._rng)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            status = self._injected_error(endpoint)
+            if status is not None:
+                headers = {"Retry-After": "1"} if status in (429, 503) else None
+                return self._response(status, {"detail": f"Injected error {status}"}, headers=headers)
+            return self._compressed(request, await handler(request))
+        finally:
+            self._in_flight -= 1
+
+    def _compressed(self, request: web.Request, response: web.Response) -> web.Response:
+        '''Body compressed with the first codec of client's Accept-Encoding the server has enabled.'''
+        body = response.body or b""
+        accepted = codecs.parse_accept_encoding(request.headers.get("Accept-Encoding", ""))
+        codec = next((codec for codec in accepted if codec in self.compression), None)
+        if codec is None or len(body) < self.compress_min_size:
+            self.encodings["identity"] = self.encodings.get("identity", 0) + 1
+            self.bytes_sent += len(body)
+            return response
+        compressed = codecs.compress(body, codec, self.compression_level)
+        self.encodings[codec] = self.encodings.get(codec, 0) + 1
+        self.bytes_sent += len(compressed)
+        headers = {**response.headers, "Content-Encoding": codec, "Vary": "Accept-Encoding"}
+        headers.pop("Content-Length", None)
+        return web.Response(body=compressed, status=response.status, headers=headers)
+
+    async def auth(self, request: web.Request) -> web.Response:
+        if request.headers.get("Bearer") != self.refresh_token:
+            return self._response(401, {"detail": "Bad authentication"})
+        return self._response(201, {"access_token": self.issue_token()})
+
+    async def register(self, request: web.Request) -> web.Response:
+        if not self._token_valid(request):
+            return self._response(401, {"detail": "Bad authentication"})
+        try:
+            body = await request.json()
+            product_id = str(UUID(body["id"]))
+            if not isinstance(body["name"], str) or not isinstance(body["description"], str):
+                raise ValueError
+        except (ValueError, KeyError, TypeError):
+            return self._response(422, {"detail": "Bad request data"})
+        if product_id in self._products:
+            return self._response(409, {"detail": "Product ID already registered"})
+        self.add_product(product_id)
+        return self._response(201, {"id": product_id})
+
+    async def offers(self, request: web.Request) -> web.Response:
+        if not self._token_valid(request):
+            return self._response(401, {"detail": "Bad authentication"})
+        try:
+            product_id = str(UUID(request.match_info["product_id"]))
+        except ValueError:
+            return self._response(422, {"detail": "Bad request data"})
+        offers = self._products.get(product_id)
+        if offers is None:
+            return self._response(404, {"detail": "Product ID has not been registered"})
+        etag, last_modified = self._offers_validators(product_id)
+        headers = {"ETag": etag, "Last-Modified": last_modified}
+        if self._not_modified(request, etag, last_modified):
+            self.statuses[304] = self.statuses.get(304, 0) + 1
+            return web.Response(status=304, headers=headers)
+        return self._response(200, offers, headers=headers)
+
+    def make_app(self) -> web.Application:
+        def route(endpoint: str, handler):
+            async def handle(request: web.Request) -> web.Response:
+                return await self._handle(endpoint, request, handler)
+            return handle
+
+        app = web.Application()
+        app.router.add_post("/api/v1/auth", route("auth", self.auth))
+        app.router.add_post("/api/v1/products/register", route("register", self.register))
+        app.router.add_get("/api/v1/products/{product_id}/offers", route("offers", self.offers))
+        return app
+
+
+class MockOffersServer:
+    '''Runs MockOffersAPI on localhost, on the current event loop or in a background thread.'''
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, api: Optional[MockOffersAPI] = None,
+                 reuse_port: bool = False, **api_kwargs):
+        self.host = host
+        self.port = port  # 0 = any free port, real one is known after start
+        self.reuse_port = reuse_port  # several server processes on one port (Linux/BSD)
+        self.api = api or MockOffersAPI(**api_kwargs)
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def refresh_token(self) -> str:
+        return self.api.refresh_token
+
+    async def start(self):
+        self._runner = web.AppRunner(self.api.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port, reuse_port=self.reuse_port or None)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "MockOffersServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    @contextmanager
+    def run_in_thread(self) -> Iterator["MockOffersServer"]:
+        '''Serve from own event loop in a daemon thread, for sync callers and other event loops.'''
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, name="offers-mock-server", daemon=True)
+        thread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(self.start(), loop).result()
+            yield self
+        finally:
+            asyncio.run_coroutine_threadsafe(self.stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+def _serve(args: argparse.Namespace, worker: int = 0):
+    '''Run one server process until interrupted, worker > 0 are extra processes sharing the port.'''
+    median = args.latency_ms / 1000
+    latency = lognormal(median, args.sigma) if args.sigma else fixed(median)
+    server = MockOffersServer(args.host, args.port, reuse_port=args.workers > 1, refresh_token=args.refresh_token,
+                              seed=args.seed + worker, latency=latency,
+                              errors={"*": {500: args.error_rate}} if args.error_rate else None,
+                              token_ttl=args.token_ttl, max_in_flight=args.max_in_flight,
+                              offers_per_product=args.offers_per_product,
+                              compression=[codec for codec in args.compress.split(",") if codec],
+                              compression_level=args.compression_level)
+
+    async def serve():
+        async with server:
+            if worker == 0:
+                print(f"Mock Offers API on {server.url} (refresh token: {server.refresh_token}, "
+                      f"{args.workers} process(es))", flush=True)
+            await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the Offers API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--refresh-token", default=DEFAULT_REFRESH_TOKEN)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="median latency of every endpoint")
+    parser.add_argument("--sigma", type=float, default=0.0, help="lognormal spread of latency, 0 = fixed")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of injected 500 on every endpoint")
+    parser.add_argument("--token-ttl", type=float, default=300.0)
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    parser.add_argument("--offers-per-product", type=int, default=3)
+    parser.add_argument("--compress", default="", help="comma separated codecs for responses (gzip,deflate,br,zstd)")
+    parser.add_argument("--compression-level", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="server processes sharing the port (tokens are valid in all of them, "
+                             "registered products only in the process which registered them)")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        import multiprocessing
+        extra = [multiprocessing.Process(target=_serve, args=(args, worker), daemon=True) for worker in range(1, args.workers)]
+        for process in extra:
+            process.start()
+    _serve(args)
+
+
+if __name__ == "__main__":
+    main()
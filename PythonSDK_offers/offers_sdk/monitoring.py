@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+from .metrics import MetricsRegistry
+
+logger = logging.getLogger("offers_sdk.monitoring")
+
+
+class LoopWatchdog:
+    '''
+    Background task measuring event loop lag, default executor queue depth (asyncio.to_thread, RequestsClient)
+    and HTTP connection pool usage of the backend (its pool_stats()).
+
+    Values are kept in `last` and set as gauges of MetricsRegistry (if given). A warning is logged
+    when a threshold is crossed - once per crossing, not on every sample while it stays over.
+    '''
+    def __init__(self, http_client: Any = None, metrics: Optional[MetricsRegistry] = None, interval: float = 0.5,
+                 lag_threshold: float = 0.1, executor_queue_threshold: int = 8, pool_threshold: float = 0.9):
+        self.http_client = http_client
+        self.metrics = metrics
+        self.interval = interval
+        self.lag_threshold = lag_threshold
+        self.executor_queue_threshold = executor_queue_threshold
+        self.pool_threshold = pool_threshold
+        self.samples = 0
+        self.max_lag = 0.0
+        self.last: Dict[str, Any] = {}
+        self.warnings: Dict[str, int] = {}
+        self._alerting: set = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> "LoopWatchdog":
+        '''Start on the running loop.'''
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="offers-sdk-watchdog")
+        return self
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def __aenter__(self) -> "LoopWatchdog":
+        return self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            # Sleep ends late by the time the loop was busy running other callbacks
+            self.sample(loop, max(0.0, loop.time() - start - self.interval))
+
+    @staticmethod
+    def executor_queue_depth(loop: asyncio.AbstractEventLoop) -> int:
+        '''Calls waiting for a free thread of the loop default executor.'''
+        executor = getattr(loop, "_default_executor", None)
+        work_queue = getattr(executor, "_work_queue", None)
+        return work_queue.qsize() if work_queue is not None else 0
+
+    def sample(self, loop: asyncio.AbstractEventLoop, lag: float):
+        self.samples += 1
+        self.max_lag = max(self.max_lag, lag)
+        depth = self.executor_queue_depth(loop)
+        values = {"loop_lag_seconds": lag, "executor_queue_depth": depth}
+
+        pool = {}
+        pool_stats = getattr(self.http_client, "pool_stats", None)
+        if pool_stats is not None:
+            pool = pool_stats()
+        if pool:
+            values["pool_in_use"] = pool["in_use"]
+            values["pool_waiting"] = pool["waiting"]
+            if pool.get("limit"):
+                values["pool_utilization"] = pool["in_use"] / pool["limit"]
+
+        self.last = values
+        if self.metrics is not None:
+            for name, value in values.items():
+                self.metrics.set_gauge(name, value)
+
+        self._check("loop_lag", lag > self.lag_threshold,
+                    "Event loop lag %.3f s (threshold %.3f s) - blocking code on the loop?", lag, self.lag_threshold)
+        self._check("executor_queue", depth > self.executor_queue_threshold,
+                    "%d calls waiting for executor threads (threshold %d)", depth, self.executor_queue_threshold)
+        utilization = values.get("pool_utilization", 0.0)
+        self._check("pool", utilization >= self.pool_threshold or values.get("pool_waiting", 0) > 0,
+                    "HTTP connection pool saturated: %d in use of %s, %d waiting",
+                    pool.get("in_use", 0), pool.get("limit"), pool.get("waiting", 0))
+
+    def _check(self, kind: str, over: bool, message: str, *args):
+        if not over:
+            self._alerting.discard(kind)
+            return
+        if kind in self._alerting:
+            return
+        self._alerting.add(kind)
+        self.warnings[kind] = self.warnings.get(kind, 0) + 1
+        logger.warning(message, *args)
+        if self.metrics is not None:
+            self.metrics.set_gauge(f"watchdog_warnings_{kind}", self.warnings[kind])
+
+    def stats(self) -> dict:
+        return {"samples": self.samples, "max_lag": self.max_lag, "last": dict(self.last), "warnings": dict(self.warnings)}
@@ -0,0 +1,188 @@
+'''
+Very large batch jobs spread over several processes.
+
+One event loop is limited by JSON parsing and model validation (one CPU core) long before the network is.
+ProcessPoolBatchRunner sends chunks of the input to N worker processes, each running its own OffersClient,
+and yields results as (input index, result or exception) in order of completion:
+
+    runner = ProcessPoolBatchRunner(base_url, refresh_token, workers=8)
+    for index, result in runner.register_products(products):    # any iterable, read lazily
+        ...
+    print(runner.stats())
+
+Input and result queues are bounded, so memory stays flat for any input size. Workers share one access
+token through the token cache file, refresh is guarded by a file lock (OffersClient(shared_token=True)).
+'''
+import asyncio
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from .batching import map_unordered
+from .client import OffersClient
+from .exceptions import OffersAPIError
+from .models import Offer, Product
+
+_DONE = "done"
+_FAILED = "failed"
+
+
+def _picklable(error: Exception) -> Exception:
+    '''Exceptions of HTTP libraries often cannot be pickled, send them as OffersAPIError with description.'''
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return OffersAPIError(0, f"{type(error).__name__}: {error}")
+
+
+async def _work(operation: str, options: dict, tasks, results, worker: int) -> Dict[str, Any]:
+    client = OffersClient(base_url=options["base_url"], refresh_token=options["refresh_token"],
+                          http_client=options["http_client"], token_cache_path=options["token_cache_path"],
+                          shared_token=True)
+    stats = {"worker": worker, "items": 0, "failed": 0, "busy": 0.0}
+
+    if operation == "register":
+        async def call(product: Product):
+            return await client.register_product(name=product.name, description=product.description, id=product.id)
+    else:
+        call = client.get_offers
+
+    try:
+        while True:
+            chunk = await asyncio.to_thread(tasks.get)
+            if chunk is None:
+                break
+            start_index, items = chunk
+            start = time.perf_counter()
+            out = []
+            async for offset, result in map_unordered(call, items, options["concurrency"]):
+                if isinstance(result, Exception):
+                    stats["failed"] += 1
+                    result = _picklable(result)
+                out.append((start_index + offset, result))
+            stats["items"] += len(items)
+            stats["busy"] += time.perf_counter() - start
+            await asyncio.to_thread(results.put, out)  # blocks while parent is not consuming
+    finally:
+        await client.aclose()
+    return stats
+
+
+def _worker_main(operation: str, options: dict, tasks, results, worker: int):
+    '''Entry point of worker process.'''
+    from . import runtime
+    try:
+        stats = runtime.run(_work(operation, options, tasks, results, worker))
+        results.put((_DONE, stats))
+    except BaseException as e:
+        results.put((_FAILED, f"worker {worker}: {type(e).__name__}: {e}"))
+
+
+class ProcessPoolBatchRunner:
+    def __init__(self, base_url: Optional[str] = None, refresh_token: Optional[str] = None, workers: Optional[int] = None,
+                 http_client: str = "httpx", concurrency: int = 20, chunk_size: int = 200, queue_chunks: int = 4,
+                 token_cache_path: Optional[Union[str, Path]] = None, start_method: str = "spawn"):
+        if base_url is None or refresh_token is None:
+            from config import load_settings
+            settings = load_settings()
+            base_url = base_url or settings["BASE_URL"]
+            refresh_token = refresh_token or settings["REFRESH_TOKEN"]
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.queue_chunks = queue_chunks  # chunks waiting per worker, bounds memory of both queues
+        if token_cache_path is None:
+            from .auth import TOKEN_CACHE_FILE
+            token_cache_path = TOKEN_CACHE_FILE
+        # http_client is a backend name - instances cannot be sent to other processes
+        self._options = {"base_url": base_url, "refresh_token": refresh_token, "http_client": http_client,
+                         "concurrency": concurrency, "token_cache_path": str(token_cache_path)}
+        # spawn - fork of a process with running threads (feeder, event loops) is not safe
+        self._context = multiprocessing.get_context(start_method)
+        self._stats: Dict[str, Any] = {}
+
+    def register_products(self, products: Iterable[Product]) -> Iterator[Tuple[int, Union[Product, Exception]]]:
+        return self._run("register", products)
+
+    def get_offers(self, product_ids: Iterable[str]) -> Iterator[Tuple[int, Union[List[Offer], Exception]]]:
+        return self._run("offers", product_ids)
+
+    def _run(self, operation: str, items: Iterable) -> Iterator[Tuple[int, Any]]:
+        tasks = self._context.Queue(maxsize=self.workers * self.queue_chunks)
+        results = self._context.Queue(maxsize=self.workers * self.queue_chunks)
+        stop = threading.Event()
+        processes = [self._context.Process(target=_worker_main, args=(operation, self._options, tasks, results, worker),
+                                           name=f"offers-batch-{worker}", daemon=True)
+                     for worker in range(self.workers)]
+
+        def put(task) -> bool:
+            '''Wait for free space in bounded queue, False when consumer stopped (nobody takes tasks anymore).'''
+            while not stop.is_set():
+                try:
+                    tasks.put(task, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def feed():
+            iterator = iter(items)
+            index = 0
+            while not stop.is_set():
+                chunk = list(islice(iterator, self.chunk_size))
+                if not chunk or not put((index, chunk)):
+                    break
+                index += len(chunk)
+            for _ in processes:
+                if not put(None):
+                    break
+
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        feeder = threading.Thread(target=feed, name="offers-batch-feeder", daemon=True)
+        feeder.start()
+
+        worker_stats = []
+        count = failed = 0
+        try:
+            while len(worker_stats) < len(processes):
+                try:
+                    message = results.get(timeout=1.0)
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes):
+                        raise RuntimeError("Batch worker processes exited unexpectedly")
+                    continue
+                if isinstance(message, tuple):
+                    kind, payload = message
+                    if kind == _FAILED:
+                        raise RuntimeError(f"Batch worker failed: {payload}")
+                    worker_stats.append(payload)
+                    continue
+                for index, result in message:
+                    count += 1
+                    failed += isinstance(result, Exception)
+                    yield index, result
+        finally:
+            stop.set()
+            feeder.join()
+            for process in processes:
+                process.join(timeout=5 if len(worker_stats) == len(processes) else 0.1)
+                if process.is_alive():
+                    process.terminate()
+            tasks.cancel_join_thread()
+            results.cancel_join_thread()
+            elapsed = time.perf_counter() - start
+            self._stats = {"items": count, "failed": failed, "elapsed": elapsed,
+                           "items_per_s": count / elapsed if elapsed else 0.0,
+                           "workers": sorted(worker_stats, key=lambda stats: stats["worker"])}
+
+    def stats(self) -> Dict[str, Any]:
+        '''Aggregate throughput of the last run, per-worker item counts and busy time.'''
+        return dict(self._stats)
+
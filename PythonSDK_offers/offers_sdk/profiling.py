@@ -0,0 +1,141 @@
+'''
+Opt-in profiling of SDK calls in place.
+
+    profiler = CallProfiler(sample_every=100, mode="cprofile", report_path="offers-profile.txt")
+    client = OffersClient(..., profiler=profiler)
+    ...
+    profiler.write_report()
+
+Every N-th call of register_product/get_offers is captured for its whole duration (token, HTTP, parsing)
+and aggregated. cProfile and tracemalloc are process wide - while a sampled call runs, work of other
+coroutines on the same thread is captured too, and only one call is captured at a time. Calls starting
+while a capture runs are counted as overlapped, the 1 in N rate applies to the other calls.
+'''
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Literal, Optional, Union
+
+MODES = ("cprofile", "tracemalloc")
+
+
+class CallProfiler:
+    def __init__(self, sample_every: int = 100, mode: Literal["cprofile", "tracemalloc"] = "cprofile",
+                 report_path: Optional[Union[str, Path]] = None, top: int = 20, frames: int = 1):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode {mode!r}, use one of {MODES}")
+        self.sample_every = max(1, sample_every)
+        self.mode = mode
+        self.report_path = Path(report_path) if report_path else None
+        self.top = top
+        self.frames = frames  # traceback depth kept by tracemalloc
+        self.calls = 0       # calls eligible for sampling (started while nothing was captured)
+        self.overlapped = 0  # calls started during a capture, never sampled
+        self.sampled: Dict[str, int] = {}  # operation -> captured calls
+        self.sampled_time = 0.0
+        self._active = False
+        self._stats: Optional[pstats.Stats] = None
+        self._allocations: Dict[str, list] = {}  # "file:line" -> [size diff, count diff]
+        self._started_tracemalloc = False
+
+    def should_sample(self) -> bool:
+        if self._active:
+            self.overlapped += 1
+            return False
+        self.calls += 1
+        return self.calls % self.sample_every == 0
+
+    @contextmanager
+    def capture(self, operation: str):
+        self._active = True
+        start = time.perf_counter()
+        try:
+            if self.mode == "cprofile":
+                with self._capture_cprofile():
+                    yield
+            else:
+                with self._capture_tracemalloc():
+                    yield
+        finally:
+            self._active = False
+            self.sampled_time += time.perf_counter() - start
+            self.sampled[operation] = self.sampled.get(operation, 0) + 1
+
+    @contextmanager
+    def _capture_cprofile(self):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            yield  # other profiler (e.g. debugger) is active
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+
+    @contextmanager
+    def _capture_tracemalloc(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracemalloc = True
+        before = tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            after = tracemalloc.take_snapshot()
+            for diff in after.compare_to(before, "lineno"):
+                frame = diff.traceback[0]
+                entry = self._allocations.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+                entry[0] += diff.size_diff
+                entry[1] += diff.count_diff
+
+    def report(self, top: Optional[int] = None) -> str:
+        top = top or self.top
+        out = io.StringIO()
+        sampled = sum(self.sampled.values())
+        overlapped = f", {self.overlapped} more overlapped a capture and were skipped" if self.overlapped else ""
+        out.write(f"Offers SDK profile ({self.mode}): {sampled} of {self.calls} calls sampled "
+                  f"(1 in {self.sample_every}{overlapped}) {dict(self.sampled)}, "
+                  f"{self.sampled_time * 1000:.1f} ms captured\n\n")
+        if self.mode == "cprofile":
+            if self._stats is None:
+                out.write("No calls captured.\n")
+            else:
+                self._stats.stream = out
+                self._stats.sort_stats("cumulative").print_stats(top)
+                self._stats.sort_stats("tottime").print_stats(top)
+        else:
+            rows = sorted(self._allocations.items(), key=lambda item: abs(item[1][0]), reverse=True)[:top]
+            if not rows:
+                out.write("No calls captured.\n")
+            for location, (size, count) in rows:
+                out.write(f"{size / 1024:10.1f} KiB {count:8d} blocks  {location}\n")
+        return out.getvalue()
+
+    def write_report(self, path: Optional[Union[str, Path]] = None) -> Path:
+        path = Path(path) if path else self.report_path
+        if path is None:
+            raise ValueError("No report path given")
+        path.write_text(self.report())
+        return path
+
+    def dump_stats(self, path: Union[str, Path]):
+        '''Raw cProfile stats (e.g. for snakeviz).'''
+        if self._stats is not None:
+            self._stats.dump_stats(str(path))
+
+    def close(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if self.report_path is not None:
+            self.write_report()
@@ -0,0 +1,74 @@
+'''
+Event loop selection - uvloop is used when installed (pip install python_offers_sdk[uvloop]), asyncio loop otherwise.
+
+Switch uvloop off by OFFERS_SDK_UVLOOP=0 environment variable, runtime.configure(use_uvloop=False)
+or per call (use_uvloop=False). Only loops created by the SDK are affected (CLI, daemon, SyncOffersClient),
+the global event loop policy is never changed.
+'''
+import asyncio
+import os
+import sys
+from typing import Any, Callable, Coroutine, Optional
+
+ENV_VAR = "OFFERS_SDK_UVLOOP"
+_FALSE_VALUES = ("0", "false", "no", "off")
+
+_use_uvloop: Optional[bool] = None  # set by configure(), None = environment variable / default on
+
+
+def configure(use_uvloop: Optional[bool] = None):
+    global _use_uvloop
+    _use_uvloop = use_uvloop
+
+
+def uvloop_enabled(use_uvloop: Optional[bool] = None) -> bool:
+    '''Explicit argument, then configure(), then environment variable (default on).'''
+    for value in (use_uvloop, _use_uvloop):
+        if value is not None:
+            return value
+    return os.environ.get(ENV_VAR, "1").strip().lower() not in _FALSE_VALUES
+
+
+def loop_factory(use_uvloop: Optional[bool] = None) -> Callable[[], asyncio.AbstractEventLoop]:
+    if uvloop_enabled(use_uvloop):
+        try:
+            import uvloop
+            return uvloop.new_event_loop
+        except ImportError:
+            pass  # not installed (or Windows), default loop
+    return asyncio.new_event_loop
+
+
+def new_event_loop(use_uvloop: Optional[bool] = None) -> asyncio.AbstractEventLoop:
+    return loop_factory(use_uvloop)()
+
+
+def loop_name(loop: asyncio.AbstractEventLoop) -> str:
+    return "uvloop" if type(loop).__module__.startswith("uvloop") else "asyncio"
+
+
+def run(coro: Coroutine[Any, Any, Any], use_uvloop: Optional[bool] = None) -> Any:
+    '''asyncio.run() on the selected loop implementation.'''
+    factory = loop_factory(use_uvloop)
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=factory) as runner:
+            return runner.run(coro)
+
+    if factory is asyncio.new_event_loop:
+        return asyncio.run(coro)
+    # Python 3.10 - asyncio.run() has no loop factory, mirror what it does
+    loop = factory()
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(coro)
+    finally:
+        try:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
@@ -0,0 +1,234 @@
+'''
+Keeping offers of a large product set fresh within a request budget.
+
+    scheduler = AdaptivePollingScheduler(client, requests_per_second=50, min_interval=10, max_interval=3600)
+    scheduler.add_many(product_ids)
+    async for change in scheduler.run():      # OfferChange of diffing.OffersDiffer
+        ...
+    scheduler.stats()                         # freshness / lag
+
+Next poll times are kept in a heap. Interval of a product shrinks when its offers changed since last poll
+and grows when they did not, so budget goes to hot products. All requests share one token bucket,
+every next poll time is jittered, so products added together do not stay synchronized.
+'''
+import asyncio
+import heapq
+import random
+import time
+from itertools import count
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+from .diffing import OfferChange, OffersDiffer
+from .exceptions import ProductNotFoundError
+
+
+class TokenBucket:
+    '''Global request budget - rate per second, bursts up to burst requests.'''
+    def __init__(self, rate: float, burst: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+
+    async def acquire(self):
+        while True:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class _ProductState:
+    __slots__ = ("interval", "due", "version", "polling", "last_fetched", "polls", "changes", "errors")
+
+    def __init__(self, interval: float, due: float):
+        self.interval = interval
+        self.due = due
+        self.version = 0            # heap entries with older version are outdated
+        self.polling = False        # poll in flight, due time passed on purpose
+        self.last_fetched: Optional[float] = None
+        self.polls = self.changes = self.errors = 0
+
+
+class AdaptivePollingScheduler:
+    '''
+    Polls get_offers of registered products, each on its own adaptive interval.
+
+    speedup / slowdown - interval multipliers after poll with / without change
+    jitter - next poll time is interval * uniform(1 - jitter, 1 + jitter) from now
+    error_interval - retry delay after failed poll (capped by interval of the product)
+    '''
+    def __init__(self, client, requests_per_second: float = 50.0, burst: Optional[float] = None,
+                 concurrency: int = 20, min_interval: float = 10.0, max_interval: float = 3600.0,
+                 initial_interval: Optional[float] = None, speedup: float = 0.5, slowdown: float = 1.5,
+                 jitter: float = 0.1, error_interval: float = 30.0, differ: Optional[OffersDiffer] = None,
+                 seed: Optional[int] = None):
+        self.client = client
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval or min(max_interval, max(min_interval, 60.0))
+        self.speedup = speedup
+        self.slowdown = slowdown
+        self.jitter = jitter
+        self.error_interval = error_interval
+        self.differ = differ or OffersDiffer(emit_initial=False)
+        self._rng = random.Random(seed)
+        self._products: Dict[str, _ProductState] = {}
+        self._heap: List[Tuple[float, int, str, int]] = []  # (due, tie breaker, product ID, version)
+        self._counter = count()
+        self._wakeup = asyncio.Event()
+        self.polls = self.errors = self.changes = 0
+        self.max_lag = 0.0
+        self._lag_total = 0.0
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def __contains__(self, product_id: str) -> bool:
+        return str(product_id) in self._products
+
+    def _schedule(self, product_id: str, state: _ProductState, delay: float):
+        state.version += 1
+        state.due = time.monotonic() + delay
+        heapq.heappush(self._heap, (state.due, next(self._counter), product_id, state.version))
+        self._wakeup.set()
+
+    def _jittered(self, interval: float) -> float:
+        return interval * self._rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def add(self, product_id: str, interval: Optional[float] = None):
+        '''Start watching product, first poll is spread over its interval (no herd after adding many at once).'''
+        product_id = str(product_id)
+        if product_id in self._products:
+            return
+        interval = interval or self.initial_interval
+        state = self._products[product_id] = _ProductState(interval, 0.0)
+        self._schedule(product_id, state, self._rng.uniform(0, interval))
+
+    def add_many(self, product_ids: Iterable[str]):
+        for product_id in product_ids:
+            self.add(product_id)
+
+    def remove(self, product_id: str):
+        '''Stop watching product, its heap entry is dropped lazily.'''
+        self._products.pop(str(product_id), None)
+        self.differ.forget(product_id)
+
+    async def _next_due(self) -> Tuple[str, _ProductState]:
+        while True:
+            while self._heap:
+                due, _, product_id, version = self._heap[0]
+                state = self._products.get(product_id)
+                if state is None or state.version != version:
+                    heapq.heappop(self._heap)  # removed or rescheduled
+                    continue
+                break
+            else:
+                due = None
+            delay = None if due is None else due - time.monotonic()
+            if delay is not None and delay <= 0:
+                heapq.heappop(self._heap)
+                state.version += 1  # in flight, not in heap
+                state.polling = True
+                return product_id, state
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, product_id: str, state: _ProductState) -> List[OfferChange]:
+        try:
+            return await self._fetch(product_id, state)
+        finally:
+            state.polling = False
+
+    async def _fetch(self, product_id: str, state: _ProductState) -> List[OfferChange]:
+        await self.bucket.acquire()
+        lag = time.monotonic() - state.due  # how late the poll starts (budget or concurrency exhausted)
+        self._lag_total += lag
+        self.max_lag = max(self.max_lag, lag)
+        self.polls += 1
+        state.polls += 1
+        try:
+            offers = await self.client.get_offers(product_id)
+        except ProductNotFoundError:
+            if self._products.get(product_id) is not state:
+                return []  # removed meanwhile, remove() already forgot its offers
+            del self._products[product_id]
+            return self.differ.forget(product_id)
+        except Exception:
+            self.errors += 1
+            state.errors += 1
+            if self._products.get(product_id) is state:
+                self._schedule(product_id, state, self._jittered(min(self.error_interval, state.interval)))
+            return []
+
+        if self._products.get(product_id) is not state:
+            return []  # removed meanwhile - diff would bring back the snapshot remove() dropped
+        changes = self.differ.diff(product_id, offers)
+        state.last_fetched = time.monotonic()
+        if changes:
+            state.changes += 1
+            self.changes += len(changes)
+            state.interval = max(self.min_interval, state.interval * self.speedup)
+        else:
+            state.interval = min(self.max_interval, state.interval * self.slowdown)
+        self._schedule(product_id, state, self._jittered(state.interval))
+        return changes
+
+    async def run(self) -> AsyncIterator[OfferChange]:
+        '''Poll forever (until the consumer stops iterating), yields changed offers.'''
+        output: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 16)
+
+        async def worker():
+            while True:
+                product_id, state = await self._next_due()
+                for change in await self._poll(product_id, state):
+                    await output.put(change)
+
+        workers = [asyncio.create_task(worker(), name=f"offers-poller-{i}") for i in range(self.concurrency)]
+        getter = None
+        try:
+            while True:
+                getter = asyncio.ensure_future(output.get())
+                done, _ = await asyncio.wait([getter, *workers], return_when=asyncio.FIRST_COMPLETED)
+                if getter not in done:
+                    getter.cancel()
+                    for task in done:
+                        task.result()  # worker crashed, raise its exception
+                yield getter.result()
+        finally:
+            if getter is not None:
+                getter.cancel()  # pending when the consumer was cancelled while waiting
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def stats(self) -> Dict[str, float]:
+        '''Freshness (seconds since last successful poll), poll lag and counters, also set as gauges of client metrics.'''
+        now = time.monotonic()
+        ages = sorted(now - state.last_fetched for state in self._products.values() if state.last_fetched is not None)
+        stats = {
+            "products": len(self._products),
+            "never_fetched": len(self._products) - len(ages),
+            "overdue": sum(1 for state in self._products.values() if state.due < now and not state.polling),
+            "polls": self.polls,
+            "errors": self.errors,
+            "changes": self.changes,
+            "staleness_mean": sum(ages) / len(ages) if ages else 0.0,
+            "staleness_p95": ages[int(0.95 * (len(ages) - 1))] if ages else 0.0,
+            "staleness_max": ages[-1] if ages else 0.0,
+            "lag_mean": self._lag_total / self.polls if self.polls else 0.0,
+            "lag_max": self.max_lag,
+        }
+        metrics = getattr(self.client, "metrics", None)
+        if metrics is not None:
+            for name, value in stats.items():
+                metrics.set_gauge(f"scheduler_{name}", value)
+        return stats
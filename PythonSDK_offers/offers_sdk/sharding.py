@@ -0,0 +1,245 @@
+'''
+Splitting polled products between worker processes or hosts, so each product is polled by one worker.
+
+    membership = DirectoryMembership("/shared/offers-workers", worker_id="host-a-1")
+    scheduler = AdaptivePollingScheduler(client)
+    async with ShardCoordinator(scheduler, membership) as coordinator:   # heartbeat + rebalancing
+        coordinator.add_many(all_product_ids)     # only own share gets to the scheduler
+        async for change in scheduler.run():
+            ...
+
+Products are assigned by rendezvous (highest random weight) hashing: a product belongs to the worker
+with highest hash(worker, product). When a worker leaves only its products move, when one joins it takes
+about 1/N of products from the others, nothing else moves.
+'''
+import asyncio
+import hashlib
+import logging
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger("offers_sdk.sharding")
+
+
+def _score(worker: str, key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(f"{worker}\0{key}".encode(), digest_size=8).digest(), "big")
+
+
+def owner(key: str, workers: Sequence[str]) -> str:
+    '''Worker owning the key (rendezvous hashing), same answer in every process with the same worker list.'''
+    if not workers:
+        raise ValueError("No workers to assign to")
+    key = str(key)
+    return max(workers, key=lambda worker: _score(worker, key))
+
+
+def _reassigned(owners: List[Tuple[str, Tuple[int, str]]], joined: Sequence[str],
+                members: Sequence[str]) -> Dict[str, Tuple[int, str]]:
+    '''
+    New (score, owner) of products whose owner changed with the member list.
+
+    Only scores of joined workers are computed, products of a worker which left are hashed against all
+    remaining members - about 1/N of products. Pure function, runs in a thread.
+    '''
+    remaining = set(members)
+    updates = {}
+    for product_id, (score, current) in owners:
+        if current not in remaining:
+            updates[product_id] = max((_score(worker, product_id), worker) for worker in members)
+            continue
+        best = (score, current)
+        for worker in joined:
+            candidate = (_score(worker, product_id), worker)
+            if candidate > best:
+                best = candidate
+        if best[1] != current:
+            updates[product_id] = best
+    return updates
+
+
+class StaticMembership:
+    '''Fixed worker list from a coordination file (one worker ID per line, # comments), re-read on every refresh.'''
+    def __init__(self, path: Union[str, Path], worker_id: str):
+        self.path = Path(path)
+        self.worker_id = worker_id
+
+    def join(self):
+        pass
+
+    def heartbeat(self):
+        pass
+
+    def leave(self):
+        pass
+
+    def members(self) -> List[str]:
+        lines = (line.split("#", 1)[0].strip() for line in self.path.read_text(encoding="utf-8").splitlines())
+        return sorted({line for line in lines if line})
+
+
+class DirectoryMembership:
+    '''
+    Dynamic membership in a shared directory - every worker keeps file <worker_id>.member touched.
+
+    Worker is a member while its file was touched in last ttl seconds, so crashed workers drop out
+    without cleanup. Clocks of hosts sharing the directory must be roughly in sync (well below ttl).
+    '''
+    SUFFIX = ".member"
+
+    def __init__(self, directory: Union[str, Path], worker_id: Optional[str] = None, ttl: float = 15.0):
+        self.directory = Path(directory)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.ttl = ttl
+
+    @property
+    def _file(self) -> Path:
+        return self.directory / f"{self.worker_id}{self.SUFFIX}"
+
+    def join(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.heartbeat()
+
+    def heartbeat(self):
+        self._file.touch()
+
+    def leave(self):
+        self._file.unlink(missing_ok=True)
+
+    def members(self) -> List[str]:
+        now = time.time()
+        members = []
+        for path in self.directory.glob(f"*{self.SUFFIX}"):
+            try:
+                if now - path.stat().st_mtime < self.ttl:
+                    members.append(path.name[:-len(self.SUFFIX)])
+            except FileNotFoundError:
+                continue  # left meanwhile
+        return sorted(members)
+
+
+class ShardCoordinator:
+    '''
+    Keeps the scheduler polling only products owned by this worker.
+
+    All product IDs are kept here, the scheduler gets own share. Membership is checked every refresh_interval
+    seconds (with heartbeat), products are moved only when the member list changed.
+    '''
+    def __init__(self, scheduler, membership: Union[StaticMembership, DirectoryMembership],
+                 refresh_interval: float = 5.0):
+        self.scheduler = scheduler
+        self.membership = membership
+        self.worker_id = membership.worker_id
+        self.refresh_interval = refresh_interval
+        self.members: List[str] = [self.worker_id]
+        self.rebalances = 0
+        self._owners: Dict[str, Tuple[int, str]] = {}  # product ID -> (rendezvous score, owner), all products
+        self._task: Optional[asyncio.Task] = None
+        self._file_op: Optional[asyncio.Future] = None  # membership file operation running in a thread
+
+    def owns(self, product_id: str) -> bool:
+        known = self._owners.get(str(product_id))
+        if known is not None:
+            return known[1] == self.worker_id
+        return owner(product_id, self.members) == self.worker_id
+
+    def add_many(self, product_ids: Iterable[str]):
+        for product_id in product_ids:
+            product_id = str(product_id)
+            self._owners[product_id] = assigned = max((_score(worker, product_id), worker) for worker in self.members)
+            if assigned[1] == self.worker_id:
+                self.scheduler.add(product_id)
+
+    def remove(self, product_id: str):
+        self._owners.pop(str(product_id), None)
+        self.scheduler.remove(product_id)
+
+    def rebalance(self, members: Sequence[str]) -> Tuple[int, int]:
+        '''Apply new member list, returns (products taken over, products handed off).'''
+        change = self._member_change(members)
+        if change is None:
+            return 0, 0
+        return self._apply(_reassigned(list(self._owners.items()), *change))
+
+    async def rebalance_in_thread(self, members: Sequence[str]) -> Tuple[int, int]:
+        '''Same as rebalance, hashing of products runs in a thread so polling goes on meanwhile.'''
+        change = self._member_change(members)
+        if change is None:
+            return 0, 0
+        return self._apply(await asyncio.to_thread(_reassigned, list(self._owners.items()), *change))
+
+    def _member_change(self, members: Sequence[str]) -> Optional[Tuple[List[str], List[str]]]:
+        '''(joined workers, new member list) or None when nothing changed.'''
+        members = sorted(set(members) | {self.worker_id})  # own products are never dropped while running
+        if members == self.members:
+            return None
+        joined = [worker for worker in members if worker not in self.members]
+        self.members = members  # products added from now on are assigned by the new list
+        return joined, members
+
+    def _apply(self, updates: Dict[str, Tuple[int, str]]) -> Tuple[int, int]:
+        taken = handed = 0
+        for product_id, assigned in updates.items():
+            if product_id not in self._owners:
+                continue  # removed meanwhile
+            self._owners[product_id] = assigned
+            owned = assigned[1] == self.worker_id
+            if owned and product_id not in self.scheduler:
+                self.scheduler.add(product_id)
+                taken += 1
+            elif not owned and product_id in self.scheduler:
+                self.scheduler.remove(product_id)
+                handed += 1
+        self.rebalances += 1
+        logger.info("Rebalanced %s: %d workers, took %d products, handed off %d",
+                    self.worker_id, len(self.members), taken, handed)
+        return taken, handed
+
+    async def _in_thread(self, func):
+        # Thread cannot be cancelled, stop() waits for it - a late heartbeat would re-create the file after leave
+        self._file_op = asyncio.ensure_future(asyncio.to_thread(func))
+        return await asyncio.shield(self._file_op)
+
+    async def refresh(self):
+        '''Heartbeat and rebalance by current membership (file operations run in a thread).'''
+        await self._in_thread(self.membership.heartbeat)
+        await self.rebalance_in_thread(await self._in_thread(self.membership.members))
+
+    async def _run(self):
+        await self._in_thread(self.membership.join)
+        while True:
+            try:
+                await self.refresh()
+            except OSError:
+                logger.exception("Reading membership failed, keeping %d workers", len(self.members))
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> "ShardCoordinator":
+        '''Join membership and keep it refreshed on the running loop.'''
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="offers-sdk-sharding")
+        return self
+
+    async def stop(self):
+        '''Leave membership, other workers take over products at their next refresh.'''
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            if self._file_op is not None:
+                await asyncio.gather(self._file_op, return_exceptions=True)
+            await asyncio.to_thread(self.membership.leave)
+
+    async def __aenter__(self) -> "ShardCoordinator":
+        # Join and see other workers first, products added then go to the right worker immediately
+        await asyncio.to_thread(self.membership.join)
+        await self.refresh()
+        return self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
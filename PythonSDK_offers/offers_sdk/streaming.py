@@ -0,0 +1,125 @@
+'''
+Incremental parsing of a JSON array from a byte stream - items are available before the whole body arrives.
+
+    parser = JSONArrayParser()
+    async for chunk in response_chunks:
+        for item in parser.feed(chunk):
+            ...
+    parser.close()   # raises ValueError if the array is not complete
+
+Used by OffersClient.iter_offers with backends supporting stream_get (httpx, aiohttp). Only the not yet
+decoded tail of the body is kept in memory, never the whole body or the whole list.
+'''
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONArrayParser:
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._state = "start"  # start -> item -> separator -> item ... -> end
+        self.items = 0
+
+    def _skip_whitespace(self):
+        buffer, position = self._buffer, self._position
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        self._position = position
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        '''Add next part of the body, returns items completed by it.'''
+        self._buffer = self._buffer[self._position:] + self._utf8.decode(chunk)
+        self._position = 0
+        return self._parse(final=False)
+
+    def _parse(self, final: bool) -> List[Any]:
+        items = []
+        while True:
+            self._skip_whitespace()
+            if self._position >= len(self._buffer):
+                return items
+            char = self._buffer[self._position]
+            if self._state == "start":
+                if char != "[":
+                    raise ValueError(f"Expected JSON array, got {char!r}")
+                self._position += 1
+                self._state = "first"
+            elif self._state in ("first", "separator") and char == "]":
+                self._position += 1
+                self._state = "end"
+            elif self._state == "separator":
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+                self._position += 1
+                self._state = "item"
+            elif self._state in ("first", "item"):
+                try:
+                    item, end = self._decoder.raw_decode(self._buffer, self._position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise ValueError("Incomplete item at the end of JSON array") from None
+                    return items  # item continues in next chunk
+                if end == len(self._buffer) and not final and not isinstance(item, (dict, list)):
+                    return items  # number or literal may continue in next chunk
+                self._position = end
+                self._state = "separator"
+                self.items += 1
+                items.append(item)
+            else:
+                raise ValueError(f"Unexpected data after JSON array: {char!r}")
+
+    def close(self) -> List[Any]:
+        '''End of body, returns the last items (if any) and checks the array was complete.'''
+        self._buffer = self._buffer[self._position:] + self._utf8.decode(b"", final=True)
+        self._position = 0
+        items = self._parse(final=True)
+        if self._state != "end":
+            raise ValueError("JSON array is not complete")
+        return items
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    '''Items of JSON array streamed as byte chunks.'''
+    parser = JSONArrayParser()
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
+
+
+class StreamedResponse:
+    '''
+    Response of AsyncHTTPClient.stream_get with unread body.
+
+    chunks - async iterator of body bytes, or None when the backend could not stream and body is already
+    decoded in json_data (fallback of backends without streaming)
+    '''
+    def __init__(self, status: int, chunks: Optional[AsyncIterator[bytes]] = None, json_data: Any = None,
+                 headers: Optional[Dict[str, str]] = None):
+        self.status = status
+        self.chunks = self._count(chunks) if chunks is not None else None
+        self.json_data = json_data
+        self.headers = headers or {}
+        self.bytes_in = 0  # body bytes read so far
+
+    async def _count(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        async for chunk in chunks:
+            self.bytes_in += len(chunk)
+            yield chunk
+
+    async def read_json(self) -> Any:
+        '''Whole body decoded (used for error responses).'''
+        if self.chunks is None:
+            return self.json_data
+        body = b"".join([chunk async for chunk in self.chunks])
+        try:
+            return json.loads(body) if body else None
+        except ValueError:
+            return body.decode(errors="replace")
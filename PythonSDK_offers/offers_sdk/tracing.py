@@ -0,0 +1,123 @@
+'''
+Optional OpenTelemetry tracing.
+
+OpenTelemetry is not a dependency - if `opentelemetry-api` is installed, spans are created by tracer "offers_sdk"
+(exported wherever the application configured its TracerProvider) and trace context is injected to outgoing headers.
+Without it every function here returns a shared no-op span, so the cost is one check per call.
+'''
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+TRACER_NAME = "offers_sdk"
+
+# Attempt number of the HTTP call in progress, set by RetryingHTTPClient
+_attempt: ContextVar[int] = ContextVar("offers_sdk_attempt", default=1)
+
+
+class _NoOpSpan:
+    '''Stands in for both span and span context manager.'''
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def record_exception(self, exception: BaseException):
+        pass
+
+    def end(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NOOP_SPAN = _NoOpSpan()
+
+_tracer = None
+_inject: Optional[Callable[[dict], None]] = None
+_use_span: Optional[Callable] = None
+_resolved = False
+
+
+def _resolve():
+    '''Look for OpenTelemetry only once, on the first traced call.'''
+    global _tracer, _inject, _use_span, _resolved
+    _resolved = True
+    try:
+        from opentelemetry import propagate, trace
+    except ImportError:
+        return
+    _tracer = trace.get_tracer(TRACER_NAME)
+    _inject = propagate.inject
+    _use_span = trace.use_span
+
+
+def configure(tracer: Any = None, inject: Optional[Callable[[dict], None]] = None, enabled: bool = True):
+    '''
+    Use given tracer (any object with OpenTelemetry Tracer interface) and propagator inject function
+    instead of the global ones, or switch tracing off with enabled=False.
+    '''
+    global _tracer, _inject, _resolved
+    _resolve()
+    if not enabled:
+        _tracer = _inject = None
+        return
+    if tracer is not None:
+        _tracer = tracer
+    if inject is not None:
+        _inject = inject
+
+
+def enabled() -> bool:
+    if not _resolved:
+        _resolve()
+    return _tracer is not None
+
+
+def span(name: str, attributes: Optional[dict] = None):
+    '''Context manager with a new current span, exceptions are recorded on it.'''
+    if not _resolved:
+        _resolve()
+    if _tracer is None:
+        return NOOP_SPAN
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def start_span(name: str, attributes: Optional[dict] = None):
+    '''Span which is not made current - for async generators, must be ended by caller.'''
+    if not _resolved:
+        _resolve()
+    if _tracer is None:
+        return NOOP_SPAN
+    return _tracer.start_span(name, attributes=attributes)
+
+
+def use_span(current):
+    '''Make span (from start_span) current in a task, e.g. parent of calls made for a stream.'''
+    if current is NOOP_SPAN or _use_span is None:
+        return NOOP_SPAN
+    return _use_span(current, end_on_exit=False)
+
+
+def inject_headers(headers: dict) -> dict:
+    '''Copy of headers with trace context (traceparent...) of the current span.'''
+    if _inject is None or _tracer is None:
+        return headers
+    headers = dict(headers)
+    _inject(headers)
+    return headers
+
+
+def current_attempt() -> int:
+    return _attempt.get()
+
+
+@contextmanager
+def attempt(number: int):
+    token = _attempt.set(number)
+    try:
+        yield
+    finally:
+        _attempt.reset(token)
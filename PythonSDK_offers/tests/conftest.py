@@ -1,4 +1,5 @@
 import pytest
+from offers_sdk.mock_server import MockOffersServer
 from config import BASE_URL, REFRESH_TOKEN, TOKEN_CACHE_PATH
 
 
@@ -16,4 +17,10 @@ def valid_refresh_token() -> str:
 
 @pytest.fixture
 def temp_token_file(tmp_path):
-    return tmp_path / TOKEN_CACHE_PATH
\ No newline at end of file
+    return tmp_path / TOKEN_CACHE_PATH
+
+@pytest.fixture
+def mock_api():
+    '''Local mock Offers API running in background thread (fresh state for every test).'''
+    with MockOffersServer(seed=0).run_in_thread() as server:
+        yield server
@@ -1,8 +1,14 @@
 import pytest
+import asyncio
 import json
+import os
+import time
+import base64
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock
+from config import TOKEN_VALIDITY_SECONDS
 from offers_sdk.auth import AuthManager
+from offers_sdk.client import OffersClient
 from offers_sdk.exceptions import AuthenticationError, BadRequestError, ValidationError, OffersAPIError
 from offers_sdk.http_clients.base import AsyncHTTPClient
 
@@ -35,7 +41,7 @@ async def test_refresh_access_token_success(temp_token_file):
     '''Testing refreshing token'''
     mock_client = AsyncMock(spec=AsyncHTTPClient)
     mock_response = MockResponse(201, {"access_token": "new_token"})
-    mock_client.post.return_value = mock_response
+    mock_client.post_without_hooks.return_value = mock_response
 
     auth = AuthManager("https://fake-auth", "refresh_token", http_client=mock_client, token_cache_path=temp_token_file)
 
@@ -52,7 +58,7 @@ async def test_refresh_token_raises_authentication_error(temp_token_file):
     '''Test refreshing with wrong token'''
     mock_client = AsyncMock(spec=AsyncHTTPClient)
     mock_response = MockResponse(401, {"detail": "Access token invalid"})
-    mock_client.post.return_value = mock_response
+    mock_client.post_without_hooks.return_value = mock_response
 
     auth = AuthManager("https://fake-auth", "refresh_token", http_client=mock_client, token_cache_path=temp_token_file)
 
@@ -60,3 +66,119 @@ async def test_refresh_token_raises_authentication_error(temp_token_file):
         await auth.refresh_access_token()
 
     assert "Access token invalid" in str(exc_info.value)
+
+
+def make_jwt(claims: dict) -> str:
+    '''Unsigned JWT-like token with given claims'''
+    encode = lambda data: base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+    return f"{encode({'typ': 'JWT', 'alg': 'HS256'})}.{encode(claims)}.signature"
+
+@pytest.mark.asyncio
+async def test_token_expiry_from_jwt_claim(temp_token_file):
+    '''Expiry is taken from token "expires" claim instead of fixed five minutes'''
+    mock_client = AsyncMock(spec=AsyncHTTPClient)
+    token = make_jwt({"token": "refresh", "expires": time.time() + 3600})
+    mock_client.post_without_hooks.return_value = MockResponse(201, {"access_token": token})
+
+    auth = AuthManager("https://fake-auth", "refresh_token", http_client=mock_client, token_cache_path=temp_token_file)
+    assert await auth.get_access_token() == token
+    assert auth._expires_monotonic - time.monotonic() > 3000
+
+    # Second call is served from memory, no file read and no refresh
+    temp_token_file.unlink()
+    assert await auth.get_access_token() == token
+    mock_client.post_without_hooks.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_expired_cached_jwt_is_refreshed(temp_token_file):
+    '''Cached token which expires inside of safety margin is not used'''
+    old_token = make_jwt({"exp": time.time() + 5})
+    temp_token_file.write_text(json.dumps({"access_token": old_token, "created": datetime.now().isoformat()}))
+    mock_client = AsyncMock(spec=AsyncHTTPClient)
+    mock_client.post_without_hooks.return_value = MockResponse(201, {"access_token": "new_token", "expires_in": 600})
+
+    auth = AuthManager("https://fake-auth", "refresh_token", http_client=mock_client,
+                       token_cache_path=temp_token_file, expiry_margin=30)
+    assert await auth.get_access_token() == "new_token"
+
+    saved = json.loads(temp_token_file.read_text())
+    assert saved["expires"] == pytest.approx(time.time() + 600, abs=5)
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_refresh(temp_token_file):
+    '''Only one refresh request is sent when many calls need a token at once'''
+    mock_client = AsyncMock(spec=AsyncHTTPClient)
+
+    async def post(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return MockResponse(201, {"access_token": "new_token"})
+
+    mock_client.post_without_hooks.side_effect = post
+    auth = AuthManager("https://fake-auth", "refresh_token", http_client=mock_client, token_cache_path=temp_token_file)
+
+    tokens = await asyncio.gather(*(auth.get_access_token() for _ in range(10)))
+    assert tokens == ["new_token"] * 10
+    mock_client.post_without_hooks.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_not_passed_to_user_hooks(mock_api, tmp_path):
+    seen = []
+
+    async def hook(method, url, headers, payload):
+        seen.append(headers.get("Bearer"))
+
+    client = OffersClient(base_url=mock_api.url, refresh_token=mock_api.refresh_token, hooks_usage=True)
+    client._http.hooks.add_request_hook(hook)
+    client._auth.set_token_cache_path(tmp_path / "token.json")
+    await client.register_product(name="Hooked", description="Product")
+    await client.aclose()
+
+    assert mock_api.api.requests["auth"] == 1
+    assert len(seen) == 1 and seen[0] != mock_api.refresh_token  # only the API call, with access token
+
+
+@pytest.mark.asyncio
+async def test_cancelled_lock_wait_releases_lock(tmp_path):
+    fcntl = pytest.importorskip("fcntl")  # cross-process lock is POSIX only
+    auth = AuthManager("https://fake-auth", "refresh_token", token_cache_path=tmp_path / "token.json", shared=True)
+    lock_path = tmp_path / "token.json.lock"
+    holder = os.open(lock_path, os.O_RDWR | os.O_CREAT)
+    fcntl.flock(holder, fcntl.LOCK_EX)  # as another process refreshing
+
+    async def wait_for_lock():
+        async with auth._cross_process_lock():
+            pass
+
+    waiting = asyncio.create_task(wait_for_lock())
+    await asyncio.sleep(0.05)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    fcntl.flock(holder, fcntl.LOCK_UN)  # waiting thread gets the lock now and must give it back
+    os.close(holder)
+
+    other = os.open(lock_path, os.O_RDWR)
+    try:
+        for _ in range(100):
+            try:
+                fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                await asyncio.sleep(0.01)
+        else:
+            pytest.fail("lock was not released after cancellation")
+    finally:
+        os.close(other)
+
+
+@pytest.mark.asyncio
+async def test_unparsable_response_expiry_falls_back(temp_token_file):
+    mock_client = AsyncMock(spec=AsyncHTTPClient)
+    mock_client.post_without_hooks.return_value = MockResponse(
+        201, {"access_token": "new_token", "expires_at": "2030-01-01T00:00:00Z"})
+    auth = AuthManager("https://fake-auth", "refresh_token", http_client=mock_client, token_cache_path=temp_token_file)
+    await auth.refresh_access_token()
+
+    expires = json.loads(temp_token_file.read_text())["expires"]
+    assert abs(expires - (time.time() + TOKEN_VALIDITY_SECONDS)) < 5  # default validity
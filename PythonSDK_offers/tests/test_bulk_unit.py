@@ -0,0 +1,93 @@
+import asyncio
+import io
+import json
+import pytest
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from offers_sdk.batching import map_unordered
+from offers_sdk.models import Product, Offer
+from offers_sdk.exceptions import ProductDuplicityError
+from offers_cli_tool.bulk import run_bulk
+
+# Unit tests
+
+
+@pytest.mark.asyncio
+async def test_map_unordered_bounded_concurrency():
+    '''No more than `concurrency` calls in flight, exceptions yielded as results'''
+    in_flight = 0
+    max_in_flight = 0
+
+    async def work(x):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.001 * (x % 3))
+        in_flight -= 1
+        if x == 5:
+            raise ValueError("bad item")
+        return x * 2
+
+    results = dict([item async for item in map_unordered(work, range(20), concurrency=4)])
+
+    assert max_in_flight <= 4
+    assert len(results) == 20
+    assert isinstance(results[5], ValueError)
+    assert results[7] == 14
+
+
+@pytest.mark.asyncio
+async def test_map_unordered_slow_input_does_not_hold_results():
+    '''Result of a finished call is yielded while the next input item is still awaited'''
+    second_item = asyncio.Event()
+
+    async def slow_source():
+        yield 1
+        await second_item.wait()
+        yield 2
+
+    async def work(x):
+        return x * 2
+
+    results = map_unordered(work, slow_source(), concurrency=4)
+    assert await asyncio.wait_for(results.__anext__(), timeout=1) == (0, 2)
+    second_item.set()
+    assert [item async for item in results] == [(1, 4)]
+
+
+@pytest.mark.asyncio
+async def test_register_bulk_jsonl_streams_results():
+    '''Every input line produces one JSON output line with its input index'''
+    product_id = uuid4()
+    client = AsyncMock()
+    client.register_product.side_effect = [
+        Product(id=product_id, name="A", description="a"),
+        ProductDuplicityError(409, "Product already registered"),
+    ]
+    source = io.StringIO(json.dumps({"name": "A", "description": "a", "id": str(product_id)}) + "\n\n"
+                         + json.dumps({"name": "B"}) + "\n")
+    out, err = io.StringIO(), io.StringIO()
+
+    outcomes = await run_bulk(client, "register", source, concurrency=1, out=out, err=err)
+
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert lines[0] == {"index": 0, "ok": True, "product": {"id": str(product_id), "name": "A", "description": "a"}}
+    assert lines[1]["index"] == 1 and not lines[1]["ok"]
+    assert lines[1]["error"]["type"] == "ProductDuplicityError"
+    assert outcomes == {"ok": 1, "ProductDuplicityError": 1}
+    assert "2 records" in err.getvalue() and "1 errors" in err.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_offers_bulk_csv():
+    offer = Offer(id=uuid4(), price=10, items_in_stock=1)
+    client = AsyncMock()
+    client.get_offers.return_value = [offer]
+    source = io.StringIO("product_id\nabc\ndef\n")
+    out = io.StringIO()
+
+    await run_bulk(client, "offers", source, fmt="csv", out=out, err=io.StringIO())
+
+    lines = sorted((json.loads(line) for line in out.getvalue().splitlines()), key=lambda line: line["index"])
+    assert [line["product_id"] for line in lines] == ["abc", "def"]
+    assert lines[0]["offers"][0]["price"] == 10
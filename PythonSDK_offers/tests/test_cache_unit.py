@@ -0,0 +1,154 @@
+import httpx
+import time
+import pytest
+from uuid import uuid4
+from offers_sdk.cache import SQLiteOffersCache
+from offers_sdk.client import OffersClient
+from offers_sdk.exceptions import OffersAPIError, ProductNotFoundError
+from offers_sdk.models import Offer
+
+# Unit tests (offline, local mock API)
+
+
+def make_offers(count: int = 2):
+    return [Offer(id=uuid4(), price=100 * (i + 1), items_in_stock=i) for i in range(count)]
+
+
+def make_client(server, tmp_path, cache) -> OffersClient:
+    client = OffersClient(base_url=server.url, refresh_token=server.refresh_token, cache=cache)
+    client._auth.set_token_cache_path(tmp_path / "token.json")
+    return client
+
+
+def test_entries_survive_restart(tmp_path):
+    path = tmp_path / "offers.db"
+    offers = make_offers()
+    cache = SQLiteOffersCache(path)
+    cache.put("p1", offers)
+    assert cache.get("p1").offers == offers  # visible before commit
+    cache.close()
+
+    reopened = SQLiteOffersCache(path)
+    entry = reopened.get("p1")
+    reopened.close()
+    assert entry.offers == offers
+    assert entry.age < 5
+
+
+def test_shared_between_instances(tmp_path):
+    writer = SQLiteOffersCache(tmp_path / "offers.db")
+    reader = SQLiteOffersCache(tmp_path / "offers.db")  # as another process would open it
+    try:
+        for i in range(100):
+            writer.put(f"p{i}", make_offers(1))
+        writer.delete("p0")
+        writer.flush()
+        assert writer.writes == 100  # delete of p0 replaced its queued put
+        assert reader.get("p0") is None
+        assert len(reader.get("p99").offers) == 1
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_stale_rules(tmp_path):
+    cache = SQLiteOffersCache(tmp_path / "offers.db", ttl=10, max_stale=100)
+    cache.put("old", make_offers(), fetched_at=time.time() - 50)
+    cache.put("ancient", make_offers(), fetched_at=time.time() - 500)
+    old, ancient = cache.get("old"), cache.get("ancient")
+    cache.close()
+
+    assert not cache.is_fresh(old)
+    assert cache.can_serve_stale(old, OffersAPIError(503, "unavailable"))
+    assert cache.can_serve_stale(old, ConnectionError("refused"))
+    assert not cache.can_serve_stale(old, ProductNotFoundError(404, "not found"))
+    assert not cache.can_serve_stale(ancient, OffersAPIError(503, "unavailable"))
+    assert cache.can_serve_stale(old, httpx.ConnectTimeout("timeout"))
+    assert not cache.can_serve_stale(old, ValueError("bad response"))  # bug or validation, not outage
+    assert not cache.can_serve_stale(old, KeyError("id"))
+
+
+@pytest.mark.asyncio
+async def test_ids_normalised_and_read_in_thread(tmp_path):
+    cache = SQLiteOffersCache(tmp_path / "offers.db")
+    product_id, offers = uuid4(), make_offers()
+    cache.put(str(product_id).upper(), offers)
+    cache.flush()
+    try:
+        assert (await cache.aget("{%s}" % product_id)).offers == offers  # committed, read from database
+        cache.delete(product_id)
+        assert await cache.aget(str(product_id)) is None  # pending delete, answered from memory
+    finally:
+        cache.close()
+
+
+@pytest.mark.asyncio
+async def test_client_uses_cache(mock_api, tmp_path):
+    cache = SQLiteOffersCache(tmp_path / "offers.db", ttl=60)
+    client = make_client(mock_api, tmp_path, cache)
+    product = await client.register_product(name="Cached", description="Product")
+
+    first = await client.get_offers(str(product.id))
+    second = await client.get_offers(str(product.id))
+    await client.aclose()
+    cache.close()
+
+    assert first == second
+    assert mock_api.api.requests["offers"] == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    # Warm restart - new client and cache, no request needed
+    cache = SQLiteOffersCache(tmp_path / "offers.db", ttl=60)
+    client = make_client(mock_api, tmp_path, cache)
+    assert await client.get_offers(str(product.id)) == first
+    await client.aclose()
+    cache.close()
+    assert mock_api.api.requests["offers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_serve_stale_when_api_unavailable(tmp_path):
+    cache = SQLiteOffersCache(tmp_path / "offers.db", ttl=0)
+    offers = make_offers()
+    cache.put("p1", offers, fetched_at=time.time() - 3600)
+    client = OffersClient(base_url="http://127.0.0.1:9", refresh_token="dummy", cache=cache)  # nothing listens there
+    client._auth._set_token("token", time.time() + 3600)
+
+    assert await client.get_offers("p1") == offers
+    assert cache.stale_hits == 1
+
+    cache.serve_stale = False
+    with pytest.raises(Exception):
+        await client.get_offers("p1")
+    await client.aclose()
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_not_found_removes_entry(mock_api, tmp_path):
+    cache = SQLiteOffersCache(tmp_path / "offers.db", ttl=0)
+    product_id = str(uuid4())
+    cache.put(product_id, make_offers())
+    client = make_client(mock_api, tmp_path, cache)
+
+    with pytest.raises(ProductNotFoundError):
+        await client.get_offers(product_id)
+    assert cache.get(product_id) is None
+    await client.aclose()
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_shared_by_clients(mock_api, tmp_path):
+    cache = SQLiteOffersCache(tmp_path / "offers.db", ttl=60)
+    first = make_client(mock_api, tmp_path, cache)
+    second = make_client(mock_api, tmp_path, cache)
+    product = await first.register_product(name="Shared", description="Cache")
+    await first.get_offers(str(product.id))
+    await first.aclose()  # cache stays open for the other client
+
+    cache.delete(str(product.id))
+    await second.get_offers(str(product.id))
+    await second.aclose()
+    cache.close()
+    assert mock_api.api.requests["offers"] == 2
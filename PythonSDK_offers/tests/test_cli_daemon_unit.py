@@ -0,0 +1,87 @@
+import asyncio
+import os
+import select
+import socket
+import sys
+import threading
+import pytest
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from offers_sdk.models import Offer
+from offers_sdk.exceptions import ProductNotFoundError
+from offers_cli_tool.daemon import OffersDaemon, daemon_request
+
+# Unit tests
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Unix domain sockets required")
+
+
+@pytest.mark.asyncio
+async def test_daemon_serves_requests_with_warm_client(tmp_path):
+    '''Daemon answers CLI requests using one kept client, errors are returned in response'''
+    socket_path = tmp_path / "offers.sock"
+    daemon = OffersDaemon(base_url="https://fake-url", refresh_token="refresh", socket_path=socket_path)
+    offer = Offer(id=uuid4(), price=100, items_in_stock=3)
+    mock_client = AsyncMock()
+    mock_client.get_offers.side_effect = [[offer], ProductNotFoundError(404, "Product not found")]
+    daemon._clients["httpx"] = mock_client
+
+    server_task = asyncio.create_task(daemon.serve())
+    while not socket_path.exists():
+        await asyncio.sleep(0.01)
+
+    # Client side of the daemon is blocking (used by CLI), run it in thread
+    response = await asyncio.to_thread(daemon_request, {"op": "offers", "product_id": "abc", "client": "httpx"}, socket_path)
+    assert response["ok"]
+    assert response["lines"] == [f"Received offer: {offer}"]
+
+    response = await asyncio.to_thread(daemon_request, {"op": "offers", "product_id": "abc", "client": "httpx"}, socket_path)
+    assert not response["ok"]
+    assert response["error"]["type"] == "ProductNotFoundError"
+    assert response["error"]["status_code"] == 404
+
+    assert await asyncio.to_thread(daemon_request, {"op": "shutdown"}, socket_path) == {"ok": True}
+    await asyncio.wait_for(server_task, timeout=5)
+    assert not socket_path.exists()
+    mock_client.aclose.assert_awaited_once()
+
+
+def test_daemon_request_without_daemon(tmp_path):
+    '''CLI falls back to local run when no daemon is listening'''
+    assert daemon_request({"op": "ping"}, tmp_path / "missing.sock") is None
+
+
+def test_daemon_request_broken_daemon(tmp_path):
+    '''Truncated response, reset or timeout of a half-dead daemon fall back to local run as well'''
+    socket_path = tmp_path / "broken.sock"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    os.chmod(socket_path, 0o600)
+    server.listen()
+
+    def truncated():
+        conn, _ = server.accept()
+        conn.recv(65536)
+        conn.sendall(b'{"ok": tr')
+        conn.close()
+
+    thread = threading.Thread(target=truncated)
+    thread.start()
+    assert daemon_request({"op": "ping"}, socket_path) is None
+    thread.join()
+    assert daemon_request({"op": "ping"}, socket_path, timeout=0.1) is None  # accepted by backlog, never answered
+    server.close()
+
+
+def test_daemon_request_foreign_socket(tmp_path):
+    '''Socket others can connect to (or spoof) is not used'''
+    socket_path = tmp_path / "open.sock"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen()
+    os.chmod(socket_path, 0o666)
+    try:
+        assert daemon_request({"op": "ping"}, socket_path, timeout=0.1) is None
+        assert select.select([server], [], [], 0)[0] == []  # not even connected
+    finally:
+        server.close()
@@ -0,0 +1,57 @@
+import json
+import pytest
+from uuid import uuid4
+from offers_sdk import compression
+from offers_sdk.client import OffersClient
+from offers_sdk.http_clients.registry import create_http_client
+from offers_sdk.mock_server import MockOffersServer
+
+# Unit tests
+
+CODECS = ["gzip", "deflate", "br", "zstd"]
+
+
+def test_accept_encoding_header():
+    assert compression.accept_encoding(None, "httpx") is None
+    assert compression.accept_encoding([], "aiohttp") == "identity"
+    assert compression.accept_encoding(["deflate", "gzip"], "requests") == "deflate, gzip;q=0.9"
+    auto = compression.accept_encoding("auto", "httpx")
+    assert compression.parse_accept_encoding(auto) == compression.decodable("httpx")
+    with pytest.raises(ValueError):
+        compression.accept_encoding(["lzma"], "httpx")
+
+
+def test_parse_accept_encoding():
+    assert compression.parse_accept_encoding("gzip;q=0.5, br, zstd;q=0, deflate;q=0.8") == ["br", "deflate", "gzip"]
+    assert compression.parse_accept_encoding("") == []
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_streaming_decompression(codec):
+    if not compression.codec_available(codec):
+        pytest.skip(f"{codec} package is not installed")
+    data = json.dumps([{"id": str(uuid4()), "price": i} for i in range(500)]).encode()
+    compressed = compression.compress(data, codec)
+    assert len(compressed) < len(data)
+    decompress = compression.decompressor(codec)
+    chunks = [decompress(compressed[i:i + 100]) for i in range(0, len(compressed), 100)]
+    assert b"".join(chunks) == data
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("http_client", ["httpx", "aiohttp", "requests"])
+async def test_compressed_offers(tmp_path, http_client):
+    with MockOffersServer(offers_per_product=200, compression=["gzip", "deflate"]).run_in_thread() as server:
+        client = OffersClient(base_url=server.url, refresh_token=server.refresh_token,
+                              http_client=create_http_client(http_client, compression=["deflate", "gzip"]))
+        client._auth.set_token_cache_path(tmp_path / "token.json")
+        product_id = str(uuid4())
+        expected = server.api.add_product(product_id)
+        try:
+            offers = await client.get_offers(product_id)
+            streamed = [offer async for offer in client.iter_offers(product_id)]
+        finally:
+            await client.aclose()
+    assert [str(offer.id) for offer in offers] == [offer["id"] for offer in expected]
+    assert streamed == offers
+    assert server.api.encodings["deflate"] == 2  # preferred by the client
@@ -0,0 +1,66 @@
+import pytest
+from uuid import uuid4
+from offers_sdk.cache import ConditionalCache
+from offers_sdk.client import OffersClient
+from offers_sdk.exceptions import ProductNotFoundError
+from offers_sdk.mock_server import MockOffersServer
+
+# Unit tests
+
+
+def test_bounded_and_validators():
+    cache = ConditionalCache(max_size=2)
+    cache.put("a", '"1"', None, [])
+    cache.put("b", None, "Mon, 19 Oct 2026 10:00:00 GMT", [])
+    cache.put("none", None, None, [])  # nothing to validate with, not stored
+    cache.get("a")
+    cache.put("c", '"3"', None, [])  # evicts "b", "a" was used recently
+    assert cache.get("b") is None and cache.get("none") is None
+    assert cache.request_headers(cache.get("a")) == {"If-None-Match": '"1"'}
+    assert cache.stats() == {"size": 2, "not_modified": 0, "modified": 0, "evictions": 1}
+
+    cache.put("b", None, "Mon, 19 Oct 2026 10:00:00 GMT", [])
+    assert cache.request_headers(cache.get("b")) == {"If-Modified-Since": "Mon, 19 Oct 2026 10:00:00 GMT"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("http_client", ["httpx", "aiohttp", "requests"])
+async def test_not_modified_answered_from_memory(tmp_path, http_client):
+    with MockOffersServer(offers_per_product=50).run_in_thread() as server:
+        client = OffersClient(base_url=server.url, refresh_token=server.refresh_token, http_client=http_client,
+                              conditional_cache=ConditionalCache())
+        client._auth.set_token_cache_path(tmp_path / "token.json")
+        product_id = str(uuid4())
+        server.api.add_product(product_id)
+        try:
+            first = await client.get_offers(product_id)
+            assert await client.get_offers(product_id) == first
+            assert server.api.statuses[304] == 1
+
+            changed = server.api.update_offers(product_id)
+            offers = await client.get_offers(product_id)
+            assert [str(offer.id) for offer in offers] == [offer["id"] for offer in changed]
+            assert await client.get_offers(product_id) == offers
+
+            del server.api._products[product_id]
+            with pytest.raises(ProductNotFoundError):
+                await client.get_offers(product_id)
+        finally:
+            await client.aclose()
+    assert client.conditional_cache.stats() == {"size": 0, "not_modified": 2, "modified": 1, "evictions": 0}
+
+
+@pytest.mark.asyncio
+async def test_if_modified_since(mock_api, tmp_path):
+    client = OffersClient(base_url=mock_api.url, refresh_token=mock_api.refresh_token,
+                          conditional_cache=ConditionalCache())
+    client._auth.set_token_cache_path(tmp_path / "token.json")
+    product = await client.register_product(name="Dated", description="Only Last-Modified")
+    offers = await client.get_offers(str(product.id))
+
+    # As from a server without ETags
+    entry = client.conditional_cache.get(str(product.id))
+    client.conditional_cache.put(str(product.id), None, entry.last_modified, entry.offers)
+    assert await client.get_offers(str(product.id)) == offers
+    await client.aclose()
+    assert mock_api.api.statuses[304] == 1
@@ -0,0 +1,54 @@
+import pytest
+from uuid import uuid4
+from offers_sdk.client import OffersClient
+from offers_sdk.diffing import ADDED, CHANGED, REMOVED, OffersDiffer
+from offers_sdk.models import Offer
+
+# Unit tests
+
+
+def test_diff_between_snapshots():
+    kept, repriced, dropped = (Offer(id=uuid4(), price=100, items_in_stock=5) for _ in range(3))
+    differ = OffersDiffer()
+    assert {change.kind for change in differ.diff("p1", [kept, repriced, dropped])} == {ADDED}
+
+    new = Offer(id=uuid4(), price=50, items_in_stock=1)
+    changes = differ.diff("p1", [kept, repriced.model_copy(update={"price": 90}), new])
+
+    by_kind = {change.kind: change for change in changes}
+    assert len(changes) == 3
+    assert by_kind[CHANGED].offer.price == 90
+    assert by_kind[ADDED].offer_id == new.id
+    assert by_kind[REMOVED].offer_id == dropped.id and by_kind[REMOVED].offer is None
+    assert differ.diff("p1", [kept, repriced.model_copy(update={"price": 90}), new]) == []
+
+
+def test_initial_snapshot_and_forget():
+    offer = Offer(id=uuid4(), price=100, items_in_stock=5)
+    differ = OffersDiffer(emit_initial=False)
+    assert differ.diff("p1", [offer]) == []
+    assert "p1" in differ
+
+    removed = differ.forget("p1")
+    assert [(change.kind, change.offer_id) for change in removed] == [(REMOVED, offer.id)]
+    assert len(differ) == 0
+
+
+@pytest.mark.asyncio
+async def test_watch_offers_yields_deltas(mock_api, tmp_path):
+    client = OffersClient(base_url=mock_api.url, refresh_token=mock_api.refresh_token)
+    client._auth.set_token_cache_path(tmp_path / "token.json")
+    product = await client.register_product(name="Watched", description="Product")
+    missing = str(uuid4())
+    stored = mock_api.api._products[str(product.id)]
+
+    changes = []
+    async for change in client.watch_offers([str(product.id), missing], interval=0, rounds=2):
+        changes.append(change)
+        if len(changes) == len(stored):
+            stored[0]["price"] += 1  # server side change before second round
+    await client.aclose()
+
+    assert [change.kind for change in changes] == [ADDED] * len(stored) + [CHANGED]
+    assert changes[-1].offer.price == stored[0]["price"]
+    assert mock_api.api.requests["offers"] == 4
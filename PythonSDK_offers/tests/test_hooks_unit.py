@@ -0,0 +1,144 @@
+import asyncio
+import httpx
+import pytest
+from hooks.hooks import HookManager
+from offers_sdk.http_clients.httpx_client import HTTPXClient
+from offers_sdk.http_clients.retry_client import RetryingHTTPClient
+
+# Unit tests
+
+
+def test_fast_path_flags():
+    '''No hooks or usage off means nothing runs'''
+    hooks = HookManager()
+    assert not hooks.request_active
+
+    async def hook(*args):
+        pass
+
+    hooks.add_request_hook(hook)
+    assert not hooks.request_active  # usage is still off
+    hooks.usage = True
+    assert hooks.request_active and not hooks.response_active
+
+
+@pytest.mark.asyncio
+async def test_hooks_appended_to_lists_run():
+    calls = []
+
+    async def hook(method, url, headers, payload):
+        calls.append(url)
+
+    hooks = HookManager(hooks_usage=True)
+    hooks.on_request.append(hook)  # public list, without add_request_hook
+    assert hooks.request_active
+    await hooks.run_request_hooks("GET", "https://fake-url", {}, {})
+    assert calls == ["https://fake-url"]
+
+
+@pytest.mark.asyncio
+async def test_duck_typed_hooks_object():
+    '''Backends accept any object with run_*_hooks methods'''
+    calls = []
+
+    class Hooks:
+        async def run_request_hooks(self, method, url, headers, payload):
+            calls.append("request")
+
+        async def run_response_hooks(self, method, url, response):
+            calls.append("response")
+
+        async def run_error_hooks(self, method, url, error):
+            calls.append("error")
+
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=[]))
+    client = HTTPXClient(hooks=Hooks(), client_config={"transport": transport})
+    await client.get("https://fake-url", headers={})
+    await client.aclose()
+    assert calls == ["request", "response"]
+
+
+@pytest.mark.asyncio
+async def test_replace_hook_keeps_list():
+    calls = []
+
+    async def first(*args):
+        calls.append("first")
+
+    async def second(*args):
+        calls.append("second")
+
+    hooks = HookManager(hooks_usage=True)
+    hooks.add_request_hook(first)
+    hooks.add_request_hook(second, update_option="replace")
+    await hooks.run_request_hooks("GET", "https://fake-url", {}, {})
+
+    assert hooks.on_request == [second]
+    assert calls == ["second"]
+
+
+@pytest.mark.asyncio
+async def test_background_hook_does_not_delay_request():
+    done = asyncio.Event()
+
+    async def slow_hook(method, url, response):
+        await asyncio.sleep(0.05)
+        done.set()
+
+    hooks = HookManager(hooks_usage=True)
+    hooks.add_response_hook(slow_hook, background=True)
+
+    await asyncio.wait_for(hooks.run_response_hooks("GET", "https://fake-url", None), timeout=0.01)
+    assert not done.is_set()
+    await hooks.aclose()  # drains queue
+    assert done.is_set()
+
+
+@pytest.mark.asyncio
+async def test_background_queue_full_drops_calls():
+    async def hook(*args):
+        await asyncio.sleep(0)
+
+    hooks = HookManager(hooks_usage=True, queue_size=2)
+    hooks.add_request_hook(hook, background=True)
+    for _ in range(5):
+        await hooks.run_request_hooks("GET", "https://fake-url", {}, {})
+
+    assert hooks.dropped == 3
+    await hooks.aclose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_inline_hooks():
+    async def slow_hook(*args):
+        await asyncio.sleep(0.05)
+
+    hooks = HookManager(hooks_usage=True, concurrent=True)
+    for _ in range(5):
+        hooks.add_error_hook(slow_hook)
+
+    start = asyncio.get_running_loop().time()
+    await hooks.run_error_hooks("GET", "https://fake-url", RuntimeError())
+    assert asyncio.get_running_loop().time() - start < 0.2
+
+
+@pytest.mark.asyncio
+async def test_retry_client_does_not_run_hooks_twice():
+    '''Hooks run once per attempt in wrapped client, not again in retrying client'''
+    calls = []
+
+    async def hook(method, url, headers, payload):
+        calls.append(url)
+
+    class Wrapped:
+        def __init__(self):
+            self.hooks = HookManager(hooks_usage=True)
+            self.hooks.add_request_hook(hook)
+
+        async def get(self, url, headers):
+            await self.hooks.run_request_hooks("GET", url, headers, {})
+            return "GET_OK"
+
+    client = RetryingHTTPClient(Wrapped())
+    assert await client.get("https://fake-url", headers={}) == "GET_OK"
+    assert calls == ["https://fake-url"]
@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from uuid import uuid4
+from offers_sdk.client import OffersClient
+from offers_sdk.exceptions import ProductDuplicityError
+from offers_sdk.journal import BatchJournal
+from offers_sdk.models import Product
+
+# Unit tests (offline, local mock API)
+
+
+def make_products(count: int):
+    return [Product(id=uuid4(), name=f"Product {i}", description="Journaled") for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_journal_survives_torn_tail(tmp_path):
+    path = tmp_path / "register.journal"
+    done, failed, torn = uuid4(), uuid4(), uuid4()
+    async with BatchJournal(path, flush_every=1) as journal:
+        journal.record(done, 201)
+        journal.record(failed, 503)
+    with open(path, "a") as file:
+        file.write(f"{torn} 2")  # crash in the middle of a write
+
+    async with BatchJournal(path) as journal:
+        assert journal.is_completed(done)
+        assert not journal.is_completed(failed)  # temporary error, try again
+        assert not journal.is_completed(torn)
+        journal.record(torn, 409)
+    assert path.read_text().splitlines()[-1] == f"{torn} 409"
+
+
+@pytest.mark.asyncio
+async def test_reopened_journal_keeps_statuses(tmp_path):
+    path = tmp_path / "register.journal"
+    registered, duplicate, invalid = uuid4(), uuid4(), uuid4()
+    async with BatchJournal(path) as journal:
+        journal.record(registered, 201)
+        journal.record(duplicate, 409)
+        journal.record(invalid, 422)
+    async with BatchJournal(path) as journal:
+        assert [journal.completed_status(p) for p in (registered, duplicate, invalid, uuid4())] == [201, 409, 422, None]
+        assert journal.skipped == 3
+
+
+async def drained(server) -> int:
+    '''Register requests seen by the server once calls cancelled by the crash stopped arriving.'''
+    seen = -1
+    while seen != server.api.requests["register"] or server.api._in_flight:
+        seen = server.api.requests["register"]
+        await asyncio.sleep(0.1)
+    return seen
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_completed(mock_api, tmp_path):
+    client = OffersClient(base_url=mock_api.url, refresh_token=mock_api.refresh_token)
+    client._auth.set_token_cache_path(tmp_path / "token.json")
+    path = tmp_path / "register.journal"
+    products = make_products(50)
+
+    # First run "crashes" after 20 products
+    async with BatchJournal(path, flush_every=5) as journal:
+        stream = client.register_products_stream(products, concurrency=5, journal=journal)
+        async for index, result in stream:
+            if journal.recorded >= 20:
+                break
+        await stream.aclose()  # cancels calls in flight
+    await asyncio.gather(*asyncio.all_tasks() - {asyncio.current_task()}, return_exceptions=True)
+    sent_before = await drained(mock_api)
+
+    async with BatchJournal(path) as journal:
+        first_run = len(journal)
+        assert first_run >= 20
+        results = dict([item async for item in client.register_products_stream(products, concurrency=5, journal=journal)])
+        assert journal.stats()["skipped"] == first_run
+        assert len(journal) == 50
+    await client.aclose()
+
+    assert sorted(results) == list(range(50))
+    # Only products not journaled before were sent again
+    assert mock_api.api.requests["register"] - sent_before == 50 - first_run
+    # Requests in flight at the crash were not journaled, sending them again gives 409
+    assert all(not isinstance(result, Exception) or isinstance(result, ProductDuplicityError) for result in results.values())
+
+
+@pytest.mark.asyncio
+async def test_batch_with_journal(mock_api, tmp_path):
+    client = OffersClient(base_url=mock_api.url, refresh_token=mock_api.refresh_token)
+    client._auth.set_token_cache_path(tmp_path / "token.json")
+    products = make_products(10)
+    await client.register_product(name="Registered", description="Before", id=products[0].id)
+
+    async with BatchJournal(tmp_path / "batch.journal") as journal:
+        results = await client.register_products_batch(products, journal=journal)
+        assert isinstance(results[0], ProductDuplicityError)
+        assert len(journal) == 10  # duplicity is completed as well
+        again = await client.register_products_batch(products, journal=journal)
+    await client.aclose()
+
+    assert again[1:] == products[1:]
+    assert isinstance(again[0], ProductDuplicityError)  # replayed from journal, not turned into success
+    assert mock_api.api.requests["register"] == 11
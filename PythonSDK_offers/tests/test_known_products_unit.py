@@ -0,0 +1,93 @@
+import pytest
+from uuid import uuid4
+from offers_sdk.client import OffersClient
+from offers_sdk.exceptions import ProductDuplicityError
+from offers_sdk.known_products import KnownProductsIndex
+from offers_sdk.mock_server import MockOffersServer
+from offers_sdk.models import Product
+
+# Unit tests
+
+
+def test_lookup_after_merges_and_reload(tmp_path):
+    path = tmp_path / "known.bin"
+    ids = [uuid4() for _ in range(2500)]
+    index = KnownProductsIndex(path, merge_threshold=100)
+    index.update(ids)
+    index.update(ids[:10])  # already known
+    assert len(index) == 2500
+    assert all(product_id in index for product_id in ids)
+    assert str(ids[0]) in index and uuid4() not in index
+    index.save()
+
+    assert path.stat().st_size == 2500 * 16
+    reloaded = KnownProductsIndex(path)
+    assert len(reloaded) == 2500
+    assert all(product_id in reloaded for product_id in ids[::7])
+    assert uuid4() not in reloaded
+
+
+@pytest.mark.asyncio
+async def test_merge_in_thread_keeps_lookups():
+    index = KnownProductsIndex(merge_threshold=50)
+    first = [uuid4() for _ in range(300)]
+    index.update(first)
+    later = [uuid4() for _ in range(60)]
+    for product_id in later:
+        index.add(product_id, merge=False)
+    assert index.needs_merge
+    await index.merge_in_thread()
+    assert not index.needs_merge and len(index) == 360
+    assert all(product_id in index for product_id in first + later)
+    assert bytes(index._sorted) == b"".join(sorted(product_id.bytes for product_id in first + later))
+
+
+@pytest.mark.asyncio
+async def test_known_products_skip_requests(mock_api, tmp_path):
+    index = KnownProductsIndex(tmp_path / "known.bin")
+    client = OffersClient(base_url=mock_api.url, refresh_token=mock_api.refresh_token, known_products=index)
+    client._auth.set_token_cache_path(tmp_path / "token.json")
+    registered_elsewhere = uuid4()
+    mock_api.api.add_product(str(registered_elsewhere))
+
+    product = await client.register_product(name="Known", description="Product")
+    with pytest.raises(ProductDuplicityError):
+        await client.register_product(name="Known", description="Product", id=product.id)
+    with pytest.raises(ProductDuplicityError):
+        await client.register_product(name="Other", description="Process", id=registered_elsewhere)  # 409 learned
+    with pytest.raises(ProductDuplicityError):
+        await client.register_product(name="Other", description="Process", id=registered_elsewhere)
+    await client.aclose()
+    index.save()
+
+    assert mock_api.api.requests["register"] == 2
+    assert index.skipped == 2
+    assert len(KnownProductsIndex(tmp_path / "known.bin")) == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_deduplicates_repeated_ids(mock_api, tmp_path):
+    client = OffersClient(base_url=mock_api.url, refresh_token=mock_api.refresh_token)
+    client._auth.set_token_cache_path(tmp_path / "token.json")
+    product = Product(id=uuid4(), name="Repeated", description="Product")
+
+    results = await client.register_products_batch([product, product, product])
+    await client.aclose()
+
+    assert results[0].id == product.id
+    assert all(isinstance(result, ProductDuplicityError) for result in results[1:])
+    assert mock_api.api.requests["register"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_repeated_id_sent_when_first_fails(tmp_path):
+    # Every register attempt fails with 500 - repeated IDs must not claim "already registered"
+    with MockOffersServer(errors={"register": {500: 1.0}}).run_in_thread() as server:
+        client = OffersClient(base_url=server.url, refresh_token=server.refresh_token)
+        client._auth.set_token_cache_path(tmp_path / "token.json")
+        product = Product(id=uuid4(), name="Repeated", description="Product")
+        results = await client.register_products_batch([product, product])
+        await client.aclose()
+
+    assert [result.status_code for result in results] == [500, 500]
+    assert server.api.requests["register"] == 2
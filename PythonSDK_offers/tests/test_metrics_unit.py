@@ -0,0 +1,89 @@
+import urllib.request
+import httpx
+import pytest
+from unittest.mock import AsyncMock
+from offers_sdk.client import OffersClient
+from offers_sdk.exceptions import ProductNotFoundError
+from offers_sdk.http_clients.httpx_client import HTTPXClient
+from offers_sdk.metrics import Histogram, MetricsRegistry, LATENCY_BUCKETS
+
+# Unit tests
+
+
+def make_client(handler, metrics: MetricsRegistry) -> OffersClient:
+    transport = httpx.MockTransport(handler)
+    client = OffersClient(base_url="http://stub", refresh_token="dummy",
+                          http_client=HTTPXClient(client_config={"transport": transport}), metrics=metrics)
+    client._auth.get_access_token = AsyncMock(return_value="token")
+    return client
+
+
+def test_histogram_quantiles():
+    histogram = Histogram()
+    for _ in range(99):
+        histogram.observe(0.00005)
+    histogram.observe(1.0)
+
+    assert histogram.count == 100
+    assert histogram.quantile(0.5) == LATENCY_BUCKETS[0]
+    assert histogram.quantile(1.0) >= 1.0
+    assert Histogram().quantile(0.5) is None
+
+
+@pytest.mark.asyncio
+async def test_offers_call_recorded_per_endpoint():
+    offers = [{"id": "00000000-0000-0000-0000-000000000001", "price": 100, "items_in_stock": 5}]
+
+    def handler(request: httpx.Request):
+        if request.url.path.endswith("/missing/offers"):
+            return httpx.Response(404, json={"detail": "not found"})
+        return httpx.Response(200, json=offers)
+
+    metrics = MetricsRegistry()
+    client = make_client(handler, metrics)
+    await client.get_offers("known")
+    with pytest.raises(ProductNotFoundError):
+        await client.get_offers("missing")
+    await client.aclose()
+
+    data = metrics.snapshot()["endpoints"]["offers"]
+    assert data["requests"] == 2
+    assert data["statuses"] == {200: 1, 404: 1}
+    assert data["bytes_in"] > 0
+    for phase in ("total", "token", "connect", "server", "parse"):
+        assert data["latency"][phase]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_network_error_recorded():
+    def handler(request: httpx.Request):
+        raise httpx.ConnectError("refused")
+
+    metrics = MetricsRegistry()
+    client = make_client(handler, metrics)
+    with pytest.raises(httpx.ConnectError):
+        await client.register_product(name="name", description="description")
+    await client.aclose()
+
+    data = metrics.snapshot()["endpoints"]["register"]
+    assert data["errors"] == {"ConnectError": 1}
+    assert data["statuses"] == {}
+
+
+@pytest.mark.asyncio
+async def test_prometheus_exporter():
+    metrics = MetricsRegistry()
+    client = make_client(lambda request: httpx.Response(201, json={"id": "00000000-0000-0000-0000-000000000002"}), metrics)
+    await client.register_product(name="name", description="description")
+    await client.aclose()
+
+    exporter = metrics.serve_prometheus(port=0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/metrics") as response:
+            text = response.read().decode()
+    finally:
+        exporter.stop()
+
+    assert 'offers_sdk_responses_total{endpoint="register",status="201"} 1' in text
+    assert 'offers_sdk_latency_seconds_count{endpoint="register",phase="total"} 1' in text
+    assert 'le="+Inf"' in text
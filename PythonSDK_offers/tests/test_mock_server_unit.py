@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+from uuid import uuid4
+from offers_sdk.client import OffersClient
+from offers_sdk.exceptions import AuthenticationError, OffersAPIError, ProductDuplicityError, ProductNotFoundError
+from offers_sdk.mock_server import MockOffersServer, fixed
+
+# Offline tests against local mock API (no real BASE_URL needed)
+
+
+def make_client(server: MockOffersServer, tmp_path, http_client: str = "httpx", refresh_token: str = None) -> OffersClient:
+    client = OffersClient(base_url=server.url, refresh_token=refresh_token or server.refresh_token, http_client=http_client)
+    client._auth.set_token_cache_path(tmp_path / "token.json")  # never touch the real token cache
+    return client
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("http_client", ["httpx", "aiohttp", "requests"])
+async def test_register_and_get_offers(mock_api, tmp_path, http_client):
+    client = make_client(mock_api, tmp_path, http_client)
+    try:
+        product = await client.register_product(name="Mock product", description="Offline")
+        offers = await client.get_offers(str(product.id))
+        with pytest.raises(ProductDuplicityError):
+            await client.register_product(name="Mock product", description="Offline", id=product.id)
+        with pytest.raises(ProductNotFoundError):
+            await client.get_offers(str(uuid4()))
+    finally:
+        await client.aclose()
+
+    assert len(offers) == mock_api.api.offers_per_product
+    assert mock_api.api.requests["auth"] == 1  # one token for all calls
+
+
+@pytest.mark.asyncio
+async def test_bad_refresh_token(mock_api, tmp_path):
+    client = make_client(mock_api, tmp_path, refresh_token="wrong")
+    with pytest.raises(AuthenticationError):
+        await client.get_offers(str(uuid4()))
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_refreshed(tmp_path):
+    async with MockOffersServer(token_ttl=0.3) as server:
+        client = make_client(server, tmp_path)
+        client._auth._expiry_margin = 0.1
+        product = await client.register_product(name="name", description="description")
+        await asyncio.sleep(0.3)
+        await client.get_offers(str(product.id))
+        await client.aclose()
+
+    assert server.api.requests["auth"] == 2
+
+
+@pytest.mark.asyncio
+async def test_error_injection_is_deterministic(tmp_path):
+    async def run_once():
+        async with MockOffersServer(seed=42, errors={"offers": {500: 0.5}}) as server:
+            product_id = str(uuid4())
+            server.api.add_product(product_id)
+            client = make_client(server, tmp_path)
+            statuses = []
+            for _ in range(20):
+                try:
+                    await client.get_offers(product_id)
+                    statuses.append(200)
+                except OffersAPIError as e:
+                    statuses.append(e.status_code)
+            await client.aclose()
+            (tmp_path / "token.json").unlink()
+            return statuses
+
+    first = await run_once()
+    assert set(first) == {200, 500}
+    assert first == await run_once()
+
+
+@pytest.mark.asyncio
+async def test_capacity_limit(tmp_path):
+    async with MockOffersServer(latency=fixed(0.05), max_in_flight=2) as server:
+        product_id = str(uuid4())
+        server.api.add_product(product_id)
+        client = make_client(server, tmp_path)
+        await client._auth.get_access_token()
+        results = await asyncio.gather(*(client.get_offers(product_id) for _ in range(5)), return_exceptions=True)
+        await client.aclose()
+
+    rejected = [r for r in results if isinstance(r, OffersAPIError)]
+    assert len(rejected) == 3 and all(r.status_code == 429 for r in rejected)
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import time
+import pytest
+from hooks.hooks import HookManager
+from offers_sdk.client import OffersClient
+from offers_sdk.http_clients.retry_client import RetryingHTTPClient
+from offers_sdk.metrics import MetricsRegistry
+from offers_sdk.monitoring import LoopWatchdog
+from offers_sdk.mock_server import MockOffersServer, fixed
+
+# Unit tests
+
+
+@pytest.mark.asyncio
+async def test_blocked_loop_is_reported(caplog):
+    metrics = MetricsRegistry()
+    with caplog.at_level(logging.WARNING, logger="offers_sdk.monitoring"):
+        async with LoopWatchdog(metrics=metrics, interval=0.01, lag_threshold=0.05) as watchdog:
+            await asyncio.sleep(0.03)
+            time.sleep(0.1)  # blocking call on the loop
+            await asyncio.sleep(0.05)
+
+    assert watchdog.max_lag >= 0.05
+    assert watchdog.warnings == {"loop_lag": 1}
+    assert "Event loop lag" in caplog.text
+    assert "loop_lag_seconds" in metrics.gauges
+
+
+@pytest.mark.asyncio
+async def test_executor_queue_depth():
+    loop = asyncio.get_running_loop()
+    watchdog = LoopWatchdog(executor_queue_threshold=2)
+    workers = getattr(loop._default_executor, "_max_workers", None) or 64  # executor is created on first use
+    calls = [asyncio.to_thread(time.sleep, 0.05) for _ in range(workers + 5)]
+    gathered = asyncio.gather(*calls)
+    await asyncio.sleep(0.01)
+    watchdog.sample(loop, 0.0)
+    await gathered
+
+    assert watchdog.last["executor_queue_depth"] >= 3
+    assert watchdog.warnings == {"executor_queue": 1}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("http_client", ["httpx", "aiohttp", "requests"])
+async def test_pool_stats_of_backends(tmp_path, http_client):
+    async with MockOffersServer(latency=fixed(0.5)) as server:
+        product_id = "00000000-0000-0000-0000-000000000001"
+        server.api.add_product(product_id)
+        client = OffersClient(base_url=server.url, refresh_token=server.refresh_token, http_client=http_client)
+        client._auth.set_token_cache_path(tmp_path / "token.json")
+        await client._auth.get_access_token()
+        watchdog = client.start_watchdog(interval=60)
+
+        calls = asyncio.gather(*(client.get_offers(product_id) for _ in range(4)))
+        for _ in range(40):  # until all requests hold a connection, threads of requests backend may start late
+            await asyncio.sleep(0.01)
+            watchdog.sample(asyncio.get_running_loop(), 0.0)
+            if watchdog.last.get("pool_in_use") == 4:
+                break
+        await calls
+        await client.aclose()
+
+    assert watchdog.last["pool_in_use"] == 4
+    assert 0 < watchdog.last["pool_utilization"] <= 1
+
+
+def test_pool_stats_of_retry_over_duck_typed_client():
+    class Minimal:
+        hooks = HookManager()
+
+    assert RetryingHTTPClient(Minimal()).pool_stats() == {}
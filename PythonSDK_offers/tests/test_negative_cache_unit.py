@@ -0,0 +1,64 @@
+import pytest
+from uuid import uuid4
+from offers_sdk.cache import NegativeCache
+from offers_sdk.client import OffersClient
+from offers_sdk.exceptions import ProductNotFoundError
+from offers_sdk.metrics import MetricsRegistry
+
+# Unit tests
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_and_bound():
+    clock = FakeClock()
+    cache = NegativeCache(ttl=10, max_size=2, clock=clock)
+    cache.add("a")
+    cache.add("b")
+    cache.add("c")  # evicts "a"
+    assert "a" not in cache and "b" in cache and "c" in cache
+
+    clock.now = 11
+    assert "b" not in cache
+    assert len(cache) == 1
+    cache.invalidate("c")
+    assert cache.stats() == {"size": 0, "hits": 2, "misses": 2, "evictions": 1}
+
+
+@pytest.mark.asyncio
+async def test_get_offers_negative_hits(mock_api, tmp_path):
+    metrics = MetricsRegistry()
+    client = OffersClient(base_url=mock_api.url, refresh_token=mock_api.refresh_token, metrics=metrics,
+                          negative_cache=NegativeCache(ttl=60))
+    client._auth.set_token_cache_path(tmp_path / "token.json")
+    product_id = uuid4()
+
+    for _ in range(3):
+        with pytest.raises(ProductNotFoundError):
+            await client.get_offers(str(product_id))
+    assert mock_api.api.requests["offers"] == 1
+    assert metrics.gauges["negative_cache_hits"] == 2
+
+    # Registered by this client - cached 404 is dropped
+    await client.register_product(name="Now", description="Registered", id=product_id)
+    offers = await client.get_offers(str(product_id))
+    await client.aclose()
+
+    assert len(offers) == mock_api.api.offers_per_product
+    assert mock_api.api.requests["offers"] == 2
+
+
+def test_ids_normalised():
+    '''Uppercase or braced ID is the same product - registration must drop its cached 404'''
+    cache = NegativeCache(ttl=60)
+    product_id = uuid4()
+    cache.add(str(product_id).upper())
+    assert "{%s}" % product_id in cache
+    cache.invalidate(product_id)
+    assert str(product_id).upper() not in cache
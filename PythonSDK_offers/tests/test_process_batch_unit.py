@@ -0,0 +1,58 @@
+import pickle
+import threading
+import time
+from uuid import uuid4
+from offers_sdk.exceptions import ProductDuplicityError, ProductNotFoundError
+from offers_sdk.models import Product
+from offers_sdk.process_batch import ProcessPoolBatchRunner
+
+# Unit tests (worker processes against local mock API)
+
+
+def test_api_errors_are_picklable():
+    error = pickle.loads(pickle.dumps(ProductNotFoundError(404, "not found")))
+    assert isinstance(error, ProductNotFoundError)
+    assert (error.status_code, error.detail) == (404, "not found")
+
+
+def test_register_in_worker_processes(mock_api, tmp_path):
+    runner = ProcessPoolBatchRunner(mock_api.url, mock_api.refresh_token, workers=2, chunk_size=10,
+                                    token_cache_path=tmp_path / "token.json")
+    products = [Product(id=uuid4(), name=f"Product {i}", description="Batch") for i in range(60)]
+    products.append(products[0])
+
+    results = dict(runner.register_products(products))
+
+    assert sorted(results) == list(range(61))
+    assert all(results[i].id == products[i].id for i in range(60))
+    assert isinstance(results[60], ProductDuplicityError)
+    assert mock_api.api.requests["auth"] == 1  # token shared by both workers
+    stats = runner.stats()
+    assert stats["items"] == 61 and stats["failed"] == 1
+    assert sum(worker["items"] for worker in stats["workers"]) == 61
+
+
+def test_stop_early(mock_api, tmp_path):
+    runner = ProcessPoolBatchRunner(mock_api.url, mock_api.refresh_token, workers=1, chunk_size=5,
+                                    token_cache_path=tmp_path / "token.json")
+    product_ids = (str(uuid4()) for _ in range(10_000))
+
+    for index, result in runner.get_offers(product_ids):
+        assert isinstance(result, ProductNotFoundError)
+        break
+
+    assert runner.stats()["items"] == 1
+
+
+def test_stop_early_with_full_queues(mock_api, tmp_path):
+    '''Workers blocked on full result queue, tasks queue full with input already read - stop must not wait forever'''
+    runner = ProcessPoolBatchRunner(mock_api.url, mock_api.refresh_token, workers=2, chunk_size=1, queue_chunks=1,
+                                    token_cache_path=tmp_path / "token.json")
+    results = runner.get_offers([str(uuid4()) for _ in range(7)])
+    next(results)
+    time.sleep(1)  # feeder now waits to put end markers
+
+    closing = threading.Thread(target=results.close, daemon=True)
+    closing.start()
+    closing.join(timeout=10)
+    assert not closing.is_alive()
@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from click.testing import CliRunner
+from offers_cli_tool.offers_cli import cli
+from offers_sdk.client import OffersClient
+from offers_sdk.profiling import CallProfiler
+
+# Unit tests
+
+
+def make_client(server, tmp_path, profiler: CallProfiler) -> OffersClient:
+    client = OffersClient(base_url=server.url, refresh_token=server.refresh_token, profiler=profiler)
+    client._auth.set_token_cache_path(tmp_path / "token.json")
+    return client
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        CallProfiler(mode="perf")
+
+
+@pytest.mark.asyncio
+async def test_cprofile_samples_every_nth_call(mock_api, tmp_path):
+    report_path = tmp_path / "profile.txt"
+    profiler = CallProfiler(sample_every=2, report_path=report_path)
+    client = make_client(mock_api, tmp_path, profiler)
+    product = await client.register_product(name="name", description="description")
+    for _ in range(3):
+        await client.get_offers(str(product.id))
+    await client.aclose()
+
+    assert profiler.calls == 4
+    assert profiler.sampled == {"get_offers": 2}
+    report = report_path.read_text()
+    assert "2 of 4 calls sampled" in report
+    assert "get_offers" in report
+
+
+@pytest.mark.asyncio
+async def test_tracemalloc_report(mock_api, tmp_path):
+    profiler = CallProfiler(sample_every=1, mode="tracemalloc")
+    client = make_client(mock_api, tmp_path, profiler)
+    await client.register_product(name="name", description="description")
+    await client.aclose()
+
+    assert profiler.sampled == {"register_product": 1}
+    assert "KiB" in profiler.report()
+
+
+def test_profile_command(tmp_path):
+    report_path = tmp_path / "profile.txt"
+    result = CliRunner().invoke(cli, ["profile", "--calls", "5", "--latency-ms", "0", "--top", "5",
+                                      "--report", str(report_path)])
+
+    assert result.exit_code == 0, result.output
+    assert "calls sampled" in result.output
+    assert report_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_keep_sampling_rate(mock_api, tmp_path):
+    profiler = CallProfiler(sample_every=1)
+    client = make_client(mock_api, tmp_path, profiler)
+    product = await client.register_product(name="name", description="description")
+    await asyncio.gather(*(client.get_offers(str(product.id)) for _ in range(20)))
+    await client.aclose()
+
+    # Every call started outside a capture is sampled, the rest is reported separately
+    assert sum(profiler.sampled.values()) == profiler.calls
+    assert profiler.calls + profiler.overlapped == 21
+    assert f"{profiler.calls} of {profiler.calls} calls sampled (1 in 1" in profiler.report()
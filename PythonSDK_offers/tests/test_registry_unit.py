@@ -0,0 +1,58 @@
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from offers_sdk.client import OffersClient
+from offers_sdk.http_clients import registry
+from offers_sdk.http_clients.base import AsyncHTTPClient
+from offers_sdk.http_clients.registry import register_backend, get_backend, create_http_client, available_backends
+
+# Unit tests
+
+
+PROJECT_DIR = Path(__file__).parent.parent
+
+
+class DummyBackend(AsyncHTTPClient):
+    async def get(self, url, headers):
+        return None
+
+    async def post(self, url, headers, json):
+        return None
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    '''Registrations made by a test must not leak into the global registry.'''
+    monkeypatch.setattr(registry, "_backends", dict(registry._backends))
+
+
+def test_import_does_not_load_backends():
+    '''Importing SDK must not load HTTP backends, dotenv or profilers (import time regression guard)'''
+    code = ("import sys, offers_sdk; print(','.join(m for m in ('httpx', 'aiohttp', 'requests', 'dotenv', "
+            "'cProfile', 'pstats', 'tracemalloc') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_DIR, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_builtin_backends_resolved_by_name():
+    from offers_sdk.http_clients.aiohttp_client import AioHTTPClient
+    assert get_backend("aiohttp") is AioHTTPClient
+    assert {"httpx", "aiohttp", "requests"} <= set(available_backends())
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError, match="Unknown HTTP client backend"):
+        get_backend("not-existing")
+
+
+def test_registered_backend_used_by_client(base_url, refresh_token):
+    register_backend("dummy", DummyBackend)
+    assert isinstance(create_http_client("dummy"), DummyBackend)
+
+    client = OffersClient(base_url=base_url, refresh_token=refresh_token, http_client="dummy")
+    assert isinstance(client._http, DummyBackend)
+
+
+def test_registration_does_not_leak_between_tests():
+    assert "dummy" not in available_backends()
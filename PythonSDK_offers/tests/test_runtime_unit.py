@@ -0,0 +1,62 @@
+import asyncio
+import sys
+import types
+import pytest
+from offers_sdk import runtime
+
+# Unit tests
+
+
+@pytest.fixture(autouse=True)
+def reset_runtime(monkeypatch):
+    monkeypatch.delenv(runtime.ENV_VAR, raising=False)
+    yield
+    runtime.configure(None)
+
+
+@pytest.fixture
+def fake_uvloop(monkeypatch):
+    '''Stand-in uvloop module, selection logic does not depend on the real one being installed.'''
+    class Loop(asyncio.SelectorEventLoop):
+        pass
+
+    module = types.ModuleType("uvloop")
+    module.new_event_loop = Loop
+    monkeypatch.setitem(sys.modules, "uvloop", module)
+    return module
+
+
+def test_precedence(monkeypatch):
+    assert runtime.uvloop_enabled()
+    monkeypatch.setenv(runtime.ENV_VAR, "off")
+    assert not runtime.uvloop_enabled()
+    runtime.configure(True)
+    assert runtime.uvloop_enabled()
+    assert not runtime.uvloop_enabled(False)
+
+
+def test_uvloop_selected_when_installed(fake_uvloop, monkeypatch):
+    assert runtime.loop_factory() is fake_uvloop.new_event_loop
+    monkeypatch.setenv(runtime.ENV_VAR, "0")
+    assert runtime.loop_factory() is asyncio.new_event_loop
+
+
+def test_fallback_without_uvloop(monkeypatch):
+    monkeypatch.setitem(sys.modules, "uvloop", None)  # import fails
+    assert runtime.loop_factory(True) is asyncio.new_event_loop
+
+
+def test_run_uses_selected_loop(fake_uvloop):
+    async def loop_type():
+        return type(asyncio.get_running_loop())
+
+    assert runtime.run(loop_type()) is fake_uvloop.new_event_loop
+    assert runtime.run(loop_type(), use_uvloop=False) is not fake_uvloop.new_event_loop
+
+
+def test_sync_client_loop(fake_uvloop):
+    from offers_sdk.http_clients.sync_client import SyncOffersClient
+    with SyncOffersClient(base_url="http://stub", refresh_token="dummy") as client:
+        assert isinstance(client._loop, fake_uvloop.new_event_loop)
+    with SyncOffersClient(base_url="http://stub", refresh_token="dummy", use_uvloop=False) as client:
+        assert not isinstance(client._loop, fake_uvloop.new_event_loop)
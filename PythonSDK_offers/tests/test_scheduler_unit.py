@@ -0,0 +1,129 @@
+import asyncio
+import time
+import pytest
+from uuid import uuid4
+from offers_sdk.diffing import REMOVED, OffersDiffer
+from offers_sdk.exceptions import OffersAPIError, ProductNotFoundError
+from offers_sdk.metrics import MetricsRegistry
+from offers_sdk.models import Offer
+from offers_sdk.scheduler import AdaptivePollingScheduler, TokenBucket
+
+# Unit tests (fake client, short intervals)
+
+
+class FakeClient:
+    '''Offers of "hot" products change on every poll, "cold" never, "gone" is not registered, "flaky" fails.'''
+    def __init__(self):
+        self.metrics = MetricsRegistry()
+        self.calls = {}
+        self.offer_id = uuid4()
+
+    async def get_offers(self, product_id: str):
+        self.calls[product_id] = self.calls.get(product_id, 0) + 1
+        if product_id == "gone":
+            raise ProductNotFoundError(404, "not found")
+        if product_id == "flaky":
+            raise OffersAPIError(503, "unavailable")
+        price = self.calls[product_id] if product_id.startswith("hot") else 100
+        return [Offer(id=self.offer_id, price=price, items_in_stock=1)]
+
+
+async def run_for(scheduler: AdaptivePollingScheduler, seconds: float) -> list:
+    changes = []
+
+    async def consume():
+        async for change in scheduler.run():
+            changes.append(change)
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(seconds)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    return changes
+
+
+@pytest.mark.asyncio
+async def test_hot_products_polled_more_often():
+    client = FakeClient()
+    scheduler = AdaptivePollingScheduler(client, requests_per_second=10_000, min_interval=0.01, max_interval=0.5,
+                                         initial_interval=0.05, seed=1)
+    scheduler.add_many(["hot", "cold", "flaky"])
+
+    changes = await run_for(scheduler, 0.6)
+
+    assert client.calls["hot"] > 3 * client.calls["cold"]
+    assert scheduler._products["hot"].interval == scheduler.min_interval
+    assert scheduler._products["cold"].interval > scheduler.initial_interval
+    assert changes and all(change.product_id == "hot" for change in changes)
+    stats = scheduler.stats()
+    assert stats["products"] == 3 and stats["never_fetched"] == 1  # flaky
+    assert stats["errors"] == client.calls["flaky"]
+    assert client.metrics.gauges["scheduler_polls"] == stats["polls"]
+
+
+@pytest.mark.asyncio
+async def test_request_budget():
+    client = FakeClient()
+    scheduler = AdaptivePollingScheduler(client, requests_per_second=20, burst=1, min_interval=0.001,
+                                         initial_interval=0.001, seed=1)
+    scheduler.add_many(f"cold-{i}" for i in range(50))
+
+    await run_for(scheduler, 0.5)
+
+    assert 5 <= scheduler.polls <= 12
+    assert scheduler.stats()["lag_max"] > 0.1  # products waited for budget
+
+
+@pytest.mark.asyncio
+async def test_unregistered_product_removed():
+    client = FakeClient()
+    scheduler = AdaptivePollingScheduler(client, requests_per_second=1000, min_interval=0.01, initial_interval=0.01)
+    scheduler.add("gone")
+    scheduler.differ.diff("gone", [Offer(id=client.offer_id, price=1, items_in_stock=1)])  # known before
+
+    changes = await run_for(scheduler, 0.2)
+
+    assert [change.kind for change in changes] == [REMOVED]
+    assert "gone" not in scheduler and client.calls["gone"] == 1
+
+
+@pytest.mark.asyncio
+async def test_remove_during_poll():
+    '''Product removed while its poll is in flight - no changes, no snapshot kept, not overdue meanwhile'''
+    release = asyncio.Event()
+
+    class BlockingClient(FakeClient):
+        async def get_offers(self, product_id: str):
+            await release.wait()
+            return await super().get_offers(product_id)
+
+    scheduler = AdaptivePollingScheduler(BlockingClient(), requests_per_second=1000, initial_interval=0.01,
+                                         differ=OffersDiffer())  # first offers reported as changes
+    scheduler.add("hot")
+    changes = []
+
+    async def consume():
+        async for change in scheduler.run():
+            changes.append(change)
+
+    task = asyncio.create_task(consume())
+    while not scheduler._products["hot"].polling:
+        await asyncio.sleep(0.005)
+    assert scheduler.stats()["overdue"] == 0  # in flight
+    scheduler.remove("hot")
+    release.set()
+    await asyncio.sleep(0.05)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert changes == [] and "hot" not in scheduler.differ
+    assert [t for t in asyncio.all_tasks() if t is not asyncio.current_task()] == []  # getter cancelled as well
+
+
+@pytest.mark.asyncio
+async def test_token_bucket():
+    bucket = TokenBucket(rate=100, burst=5)
+    start = time.monotonic()
+    for _ in range(15):
+        await bucket.acquire()
+    assert time.monotonic() - start >= 0.09
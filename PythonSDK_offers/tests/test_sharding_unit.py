@@ -0,0 +1,83 @@
+import os
+import time
+import pytest
+from uuid import uuid4
+from offers_sdk.scheduler import AdaptivePollingScheduler
+from offers_sdk.sharding import DirectoryMembership, ShardCoordinator, StaticMembership, owner
+
+# Unit tests
+
+PRODUCTS = [str(uuid4()) for _ in range(3000)]
+
+
+def test_rendezvous_moves_only_necessary_products():
+    workers = ["w1", "w2", "w3"]
+    before = {product: owner(product, workers) for product in PRODUCTS}
+    after = {product: owner(product, workers + ["w4"]) for product in PRODUCTS}
+
+    moved = [product for product in PRODUCTS if before[product] != after[product]]
+    assert all(after[product] == "w4" for product in moved)
+    assert 0.15 < len(moved) / len(PRODUCTS) < 0.35  # about 1/4
+
+    without_w2 = {product: owner(product, ["w1", "w3"]) for product in PRODUCTS}
+    assert all(without_w2[product] == before[product] for product in PRODUCTS if before[product] != "w2")
+
+
+def test_static_membership(tmp_path):
+    path = tmp_path / "workers.txt"
+    path.write_text("# poller fleet\nw2\nw1  # first host\n\nw2\n")
+    assert StaticMembership(path, "w1").members() == ["w1", "w2"]
+
+
+def test_directory_membership_expires(tmp_path):
+    first = DirectoryMembership(tmp_path, "w1", ttl=10)
+    second = DirectoryMembership(tmp_path, "w2", ttl=10)
+    first.join()
+    second.join()
+    assert first.members() == ["w1", "w2"]
+
+    old = time.time() - 60
+    os.utime(tmp_path / "w2.member", (old, old))  # crashed, no heartbeat
+    assert first.members() == ["w1"]
+    first.leave()
+    assert second.members() == []
+
+
+def make_coordinator(directory, worker_id: str) -> ShardCoordinator:
+    scheduler = AdaptivePollingScheduler(client=None)
+    return ShardCoordinator(scheduler, DirectoryMembership(directory, worker_id), refresh_interval=60)
+
+
+@pytest.mark.asyncio
+async def test_each_product_polled_by_one_worker(tmp_path):
+    first = make_coordinator(tmp_path, "w1")
+    second = make_coordinator(tmp_path, "w2")
+    async with first:
+        async with second:
+            await first.refresh()
+            first.add_many(PRODUCTS)
+            second.add_many(PRODUCTS)
+            owned_first = set(first.scheduler._products)
+            owned_second = set(second.scheduler._products)
+            assert owned_first.isdisjoint(owned_second)
+            assert owned_first | owned_second == set(PRODUCTS)
+
+        # Second worker left, first one takes over its products
+        await first.refresh()
+        assert len(first.scheduler) == len(PRODUCTS)
+        assert first.members == ["w1"]
+
+
+@pytest.mark.asyncio
+async def test_incremental_rebalance_matches_full_assignment():
+    '''Only joined / left workers are hashed on membership change, result is the same as from scratch'''
+    coordinator = ShardCoordinator(AdaptivePollingScheduler(client=None), StaticMembership("unused", "w1"))
+    coordinator.add_many(PRODUCTS)
+    assert len(coordinator.scheduler) == len(PRODUCTS)
+
+    for members in (["w1", "w2", "w3"], ["w1", "w3", "w4"], ["w1", "w4"], ["w2"]):
+        await coordinator.rebalance_in_thread(members)
+        expected = {product for product in PRODUCTS if owner(product, coordinator.members) == "w1"}
+        assert set(coordinator.scheduler._products) == expected
+    assert coordinator.rebalance(["w2"]) == (0, 0)
+    assert coordinator.rebalances == 4
@@ -0,0 +1,89 @@
+import json
+import random
+import pytest
+from uuid import uuid4
+from offers_sdk.client import OffersClient
+from offers_sdk.exceptions import ProductNotFoundError
+from offers_sdk.mock_server import MockOffersServer
+from offers_sdk.streaming import JSONArrayParser
+
+# Unit tests
+
+DOCUMENT = [{"id": str(uuid4()), "price": i * 1000, "items_in_stock": i, "note": "čeština ✓"} for i in range(50)] \
+    + [12345, -1.5e3, "text, with ] and [", None, True, [], {}]
+
+
+def parse_in_chunks(data: bytes, sizes) -> list:
+    parser = JSONArrayParser()
+    items, position = [], 0
+    for size in sizes:
+        items.extend(parser.feed(data[position:position + size]))
+        position += size
+    items.extend(parser.feed(data[position:]))
+    return items + parser.close()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_chunk_boundaries(seed):
+    rng = random.Random(seed)
+    data = json.dumps(DOCUMENT, ensure_ascii=False, indent=rng.choice([None, 2])).encode()
+    sizes = [rng.randint(1, 40) for _ in range(len(data))]  # splits inside numbers and multi-byte characters
+    assert parse_in_chunks(data, sizes) == DOCUMENT
+
+
+def test_items_available_before_end():
+    parser = JSONArrayParser()
+    assert parser.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+    assert parser.feed(b': 2}, 3') == [{"b": 2}]  # 3 may continue
+    assert parser.feed(b'4]') == [34]
+    assert parser.close() == []
+
+
+@pytest.mark.parametrize("data", [b'{"a": 1}', b'[1, 2', b'[1 2]', b'[1] 2'])
+def test_invalid_documents(data):
+    with pytest.raises(ValueError):
+        parse_in_chunks(data, [])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("http_client", ["httpx", "aiohttp", "requests"])
+async def test_iter_offers(tmp_path, http_client):
+    with MockOffersServer(offers_per_product=2000).run_in_thread() as server:
+        client = OffersClient(base_url=server.url, refresh_token=server.refresh_token, http_client=http_client)
+        client._auth.set_token_cache_path(tmp_path / "token.json")
+        product_id = str(uuid4())
+        server.api.add_product(product_id)
+        try:
+            streamed = [offer async for offer in client.iter_offers(product_id)]
+            assert streamed == await client.get_offers(product_id)
+
+            async for offer in client.iter_offers(product_id):
+                break  # stop early, connection is released
+
+            with pytest.raises(ProductNotFoundError):
+                async for offer in client.iter_offers(str(uuid4())):
+                    pass
+        finally:
+            await client.aclose()
+    assert len(streamed) == 2000
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("http_client", ["httpx", "aiohttp"])
+async def test_consumer_errors_not_reported_as_request_errors(mock_api, tmp_path, http_client):
+    errors = []
+
+    async def on_error(method, url, error):
+        errors.append(error)
+
+    client = OffersClient(base_url=mock_api.url, refresh_token=mock_api.refresh_token, http_client=http_client,
+                          hooks_usage=True)
+    client._http.hooks.add_error_hook(on_error, update_option="replace")
+    client._auth.set_token_cache_path(tmp_path / "token.json")
+    product = await client.register_product(name="Streamed", description="Product")
+    with pytest.raises(RuntimeError):
+        async with client._http.stream_get(f"{mock_api.url}/api/v1/products/{product.id}/offers",
+                                           await client._get_headers()):
+            raise RuntimeError("consumer failed")
+    await client.aclose()
+    assert errors == []
@@ -0,0 +1,91 @@
+import io
+import json
+import logging
+import threading
+import pytest
+from hooks.hooks import HookManager
+from hooks.structured_logging import StructuredLogHooks, redact_headers
+
+# Unit tests
+
+
+class MockResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+
+
+def read_lines(stream: io.StringIO) -> list:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_redact_headers():
+    headers = {"Bearer": "secret-token", "Authorization": "Bearer x", "accept": "application/json"}
+    assert redact_headers(headers) == {"Bearer": "***", "Authorization": "***", "accept": "application/json"}
+
+
+@pytest.mark.asyncio
+async def test_request_log_is_redacted_json_line():
+    stream = io.StringIO()
+    log_hooks = StructuredLogHooks(stream=stream, log_requests=True)
+    await log_hooks.on_request("GET", "https://fake-url", {"Bearer": "secret-token"}, {})
+    log_hooks.stop()
+
+    [line] = read_lines(stream)
+    assert line["event"] == "request"
+    assert line["headers"] == {"Bearer": "***"}
+    assert "secret-token" not in stream.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_sampling_logs_all_errors():
+    '''1 in N successful responses is logged, error responses and exceptions always'''
+    stream = io.StringIO()
+    log_hooks = StructuredLogHooks(stream=stream, sample_rate=10, batch_size=1000, flush_interval=60)
+    for _ in range(100):
+        await log_hooks.on_response("GET", "https://fake-url", MockResponse(200))
+    for _ in range(3):
+        await log_hooks.on_response("GET", "https://fake-url", MockResponse(500))
+    await log_hooks.on_error("GET", "https://fake-url", RuntimeError("boom"))
+    assert stream.getvalue() == ""  # batched, nothing written on the event loop path yet
+    log_hooks.stop()
+
+    lines = read_lines(stream)
+    assert sum(line.get("status") == 200 for line in lines) == 10
+    assert sum(line.get("status") == 500 for line in lines) == 3
+    assert lines[-1]["error_type"] == "RuntimeError"
+    stats = log_hooks.stats()
+    assert stats["emitted"] == 14 and stats["sampled_out"] == 90 and stats["dropped"] == 0
+    assert stats["mean_hook_ns"] > 0
+
+
+@pytest.mark.asyncio
+async def test_dropped_records_not_counted_as_emitted():
+    '''Queue full while the handler is stuck - records are dropped, emitted counts only queued ones'''
+    release = threading.Event()
+
+    class StuckHandler(logging.Handler):
+        def emit(self, record):
+            release.wait()
+
+    log_hooks = StructuredLogHooks(handler=StuckHandler(), queue_size=2)
+    for _ in range(10):
+        await log_hooks.on_response("GET", "https://fake-url", MockResponse(500))
+    release.set()
+    log_hooks.stop()
+
+    stats = log_hooks.stats()
+    assert stats["dropped"] >= 7
+    assert stats["emitted"] + stats["dropped"] == 10
+
+
+@pytest.mark.asyncio
+async def test_install_into_hook_manager():
+    stream = io.StringIO()
+    hooks = HookManager(hooks_usage=True)
+    log_hooks = StructuredLogHooks(stream=stream)
+    log_hooks.install(hooks)
+
+    assert not hooks.request_active  # requests are not logged by default
+    await hooks.run_response_hooks("POST", "https://fake-url", MockResponse(201))
+    log_hooks.stop()
+    assert read_lines(stream)[0]["status"] == 201
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+import pytest
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from offers_sdk.http_clients.sync_client import SyncOffersClient
+from offers_sdk.models import Offer
+
+# Unit tests
+
+
+class MockResponse:
+    def __init__(self, status_code: int, json_data):
+        self.status_code = status_code
+        self.json_data = json_data
+
+
+@pytest.fixture
+def sync_client(base_url, refresh_token):
+    offers_data = [{"id": str(uuid4()), "price": 99, "items_in_stock": 10}]
+    loop_threads = set()
+
+    async def get(url, headers):
+        loop_threads.add(threading.current_thread().name)
+        await asyncio.sleep(0.01)
+        return MockResponse(200, offers_data)
+
+    http_client = AsyncMock()
+    http_client.get.side_effect = get
+    client = SyncOffersClient(base_url=base_url, refresh_token=refresh_token, http_client=http_client)
+    client._client._auth.get_access_token = AsyncMock(return_value="token")
+    client.loop_threads = loop_threads
+    yield client
+    client.close()
+
+
+def test_sync_client_concurrent_threads(sync_client):
+    '''Many caller threads share one background loop'''
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(sync_client.get_offers, [str(uuid4()) for _ in range(32)]))
+
+    assert all(isinstance(offers[0], Offer) for offers in results)
+    assert sync_client.loop_threads == {"offers-sdk-loop"}
+
+
+@pytest.mark.asyncio
+async def test_sync_client_inside_running_loop(sync_client):
+    '''Works even if caller thread already runs an event loop (Jupyter, FastAPI)'''
+    offers = sync_client.get_offers(str(uuid4()))
+    assert offers[0].price == 99
+
+
+def test_sync_client_batch_futures(sync_client):
+    futures = sync_client.submit_get_offers_batch([str(uuid4()) for _ in range(5)])
+    assert all(isinstance(future, Future) for future in futures)
+    assert [len(future.result(timeout=5)) for future in futures] == [1] * 5
+
+
+def test_sync_client_close_closes_http_client(sync_client):
+    http_client = sync_client._client._http
+    sync_client.close()
+
+    http_client.aclose.assert_awaited_once()
+    assert not sync_client._thread.is_alive()
+    with pytest.raises(RuntimeError, match="closed"):
+        sync_client.get_offers(str(uuid4()))
+
+
+def test_sync_client_failed_constructor_leaves_no_thread(base_url, refresh_token):
+    threads = threading.active_count()
+    with pytest.raises(ValueError):
+        SyncOffersClient(base_url=base_url, refresh_token=refresh_token, http_client="no-such-backend")
+    assert threading.active_count() == threads
+
+
+def test_sync_client_close_cancels_calls_before_closing_http_client(base_url, refresh_token):
+    events = []
+
+    async def get(url, headers):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+
+    http_client = AsyncMock()
+    http_client.get.side_effect = get
+    http_client.aclose.side_effect = lambda: events.append("aclose")
+    client = SyncOffersClient(base_url=base_url, refresh_token=refresh_token, http_client=http_client)
+    client._client._auth.get_access_token = AsyncMock(return_value="token")
+    future = client.submit_get_offers(str(uuid4()))
+    while not http_client.get.called:
+        time.sleep(0.001)
+    client.close()
+
+    assert future.cancelled()
+    assert events == ["cancelled", "aclose"]
@@ -0,0 +1,146 @@
+import contextvars
+from contextlib import contextmanager
+import httpx
+import pytest
+from tenacity import retry, stop_after_attempt
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from offers_sdk import tracing
+from offers_sdk.client import OffersClient
+from offers_sdk.exceptions import ProductNotFoundError
+from offers_sdk.models import Product
+from offers_sdk.http_clients.httpx_client import HTTPXClient
+from offers_sdk.http_clients.retry_client import RetryingHTTPClient
+
+# Unit tests
+
+_current = contextvars.ContextVar("fake_span", default=None)
+
+
+class FakeSpan:
+    def __init__(self, name, attributes, parent):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.exceptions = []
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exception):
+        self.exceptions.append(exception)
+
+    def end(self):
+        pass
+
+
+class FakeTracer:
+    '''Tracer with OpenTelemetry interface keeping spans in a list.'''
+    def __init__(self):
+        self.spans = []
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        span = FakeSpan(name, attributes, _current.get())
+        self.spans.append(span)
+        token = _current.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current.reset(token)
+
+    def start_span(self, name, attributes=None):
+        span = FakeSpan(name, attributes, _current.get())
+        self.spans.append(span)
+        return span
+
+    def named(self, name):
+        return [span for span in self.spans if span.name == name]
+
+
+def inject(headers: dict):
+    headers["traceparent"] = _current.get().name
+
+
+@pytest.fixture
+def tracer():
+    tracer = FakeTracer()
+    tracing.configure(tracer=tracer, inject=inject)
+    yield tracer
+    tracing.configure(enabled=False)
+
+
+def make_client(handler, retries: int = 0) -> OffersClient:
+    http = HTTPXClient(client_config={"transport": httpx.MockTransport(handler)})
+    if retries:
+        http = RetryingHTTPClient(http, max_attempts=retries)
+        http._retry_decorator = retry(stop=stop_after_attempt(retries), reraise=True)  # no waiting between attempts
+    client = OffersClient(base_url="http://stub", refresh_token="dummy", http_client=http)
+    client._auth.get_access_token = AsyncMock(return_value="token")
+    return client
+
+
+def test_noop_without_tracer():
+    tracing.configure(enabled=False)
+    assert not tracing.enabled()
+    with tracing.span("anything") as span:
+        span.set_attribute("key", "value")
+    headers = {"accept": "application/json"}
+    assert tracing.inject_headers(headers) is headers
+
+
+@pytest.mark.asyncio
+async def test_get_offers_spans_and_propagation(tracer):
+    seen_headers = []
+
+    def handler(request: httpx.Request):
+        seen_headers.append(request.headers)
+        return httpx.Response(404, json={"detail": "not found"})
+
+    client = make_client(handler)
+    with pytest.raises(ProductNotFoundError):
+        await client.get_offers("product-1")
+    await client.aclose()
+
+    [sdk_span] = tracer.named("offers_sdk.get_offers")
+    [http_span] = tracer.named("HTTP GET")
+    assert sdk_span.attributes["offers_sdk.product_id"] == "product-1"
+    assert sdk_span.attributes["http.response.status_code"] == 404
+    assert isinstance(sdk_span.exceptions[0], ProductNotFoundError)
+    assert http_span.parent is sdk_span
+    assert http_span.attributes["offers_sdk.attempt"] == 1
+    assert seen_headers[0]["traceparent"] == "HTTP GET"
+
+
+@pytest.mark.asyncio
+async def test_retry_attempts_numbered(tracer):
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request)
+        if len(calls) < 3:
+            raise httpx.ConnectError("refused")
+        return httpx.Response(200, json=[])
+
+    client = make_client(handler, retries=3)
+    await client.get_offers("product-1")
+    await client.aclose()
+
+    attempts = [span.attributes["offers_sdk.attempt"] for span in tracer.named("HTTP GET")]
+    assert attempts == [1, 2, 3]
+    assert [type(e) for span in tracer.named("HTTP GET") for e in span.exceptions] == [httpx.ConnectError] * 2
+
+
+@pytest.mark.asyncio
+async def test_batch_span_is_parent(tracer):
+    client = make_client(lambda request: httpx.Response(201, json={"id": "00000000-0000-0000-0000-000000000001"}))
+    await client.register_products_batch([Product(id=uuid4(), name="a", description="a"),
+                                          Product(id=uuid4(), name="b", description="b")])
+    await client.aclose()
+
+    [batch_span] = tracer.named("offers_sdk.register_products_batch")
+    assert batch_span.attributes["offers_sdk.batch_size"] == 2
+    assert all(span.parent is batch_span for span in tracer.named("offers_sdk.register_product"))